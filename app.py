@@ -1,15 +1,30 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+import bisect
 import datetime
 import threading
-import time
-from lecture_manager import add_lecture, get_all_lectures, update_lecture, delete_lecture, get_upcoming_lectures, mark_notification_sent
+# lecture_manager (and with it the storage driver) is imported inside the methods that use it.
+# The first import happens on a worker thread, so the window paints before the data layer loads.
+from lecture_table import display_values
+from task_runner import TkTaskRunner
+
+PAGE_SIZE = 200 # Lectures fetched per page while scrolling
+PREFETCH_THRESHOLD = 0.9 # Fetch the next page once the view is scrolled past this fraction
+CHANGE_POLL_MS = 2000 # How often to tail the change feed for other clients' writes
+
+def load_first_page(**kwargs):
+    """
+    Reads the change feed position, then the first page, so no change made in between is missed.
+    Database errors are raised so the app shows its error row instead of an empty list.
+    """
+    from lecture_manager import get_lectures_page, latest_change_seq
+    return latest_change_seq(raise_errors=True), get_lectures_page(raise_errors=True, **kwargs)
 
 class UniLectureNotifierApp:
     def __init__(self, master):
         self.master = master
         master.title("UniLecture Notifier")
-        master.geometry("800x600") # Set initial window size
+        master.geometry("1000x600") # Set initial window size
         master.resizable(True, True) # Allow resizing
 
         # Configure styles for ttk widgets
@@ -26,6 +41,9 @@ class UniLectureNotifierApp:
         self.input_frame = ttk.Frame(master, padding="15 15 15 15", relief="groove", borderwidth=2)
         self.input_frame.pack(pady=10, padx=10, fill="x", expand=False)
 
+        self.filter_frame = ttk.Frame(master, padding="15 5 15 5")
+        self.filter_frame.pack(padx=10, fill="x", expand=False)
+
         self.list_frame = ttk.Frame(master, padding="15 15 15 15", relief="groove", borderwidth=2)
         self.list_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
@@ -48,18 +66,68 @@ class UniLectureNotifierApp:
         self.time_entry.grid(row=3, column=1, pady=5, padx=5)
         self.time_entry.insert(0, "00:00:00") # Pre-fill with default time
 
+        ttk.Label(self.input_frame, text="Repeat weekly until:").grid(row=4, column=0, sticky="w", pady=5, padx=5)
+        self.repeat_until_entry = ttk.Entry(self.input_frame, width=40) # Empty for a single lecture
+        self.repeat_until_entry.grid(row=4, column=1, pady=5, padx=5)
+
+        # Optional; a room or instructor is checked for double bookings before saving
+        ttk.Label(self.input_frame, text="Duration (minutes):").grid(row=0, column=2, sticky="w", pady=5, padx=5)
+        self.duration_entry = ttk.Entry(self.input_frame, width=25) # Empty for the default duration
+        self.duration_entry.grid(row=0, column=3, pady=5, padx=5)
+
+        ttk.Label(self.input_frame, text="Room:").grid(row=1, column=2, sticky="w", pady=5, padx=5)
+        self.room_entry = ttk.Entry(self.input_frame, width=25)
+        self.room_entry.grid(row=1, column=3, pady=5, padx=5)
+
+        ttk.Label(self.input_frame, text="Instructor:").grid(row=2, column=2, sticky="w", pady=5, padx=5)
+        self.instructor_entry = ttk.Entry(self.input_frame, width=25)
+        self.instructor_entry.grid(row=2, column=3, pady=5, padx=5)
+
         # Buttons for CRUD operations
         self.add_button = ttk.Button(self.input_frame, text="Add Lecture", command=self.add_lecture)
-        self.add_button.grid(row=4, column=0, pady=10, padx=5, sticky="ew")
+        self.add_button.grid(row=5, column=0, pady=10, padx=5, sticky="ew")
 
         self.update_button = ttk.Button(self.input_frame, text="Update Lecture", command=self.update_lecture)
-        self.update_button.grid(row=4, column=1, pady=10, padx=5, sticky="ew")
+        self.update_button.grid(row=5, column=1, pady=10, padx=5, sticky="ew")
 
         self.delete_button = ttk.Button(self.input_frame, text="Delete Lecture", command=self.delete_lecture)
-        self.delete_button.grid(row=5, column=0, pady=10, padx=5, sticky="ew")
+        self.delete_button.grid(row=6, column=0, pady=10, padx=5, sticky="ew")
 
         self.clear_button = ttk.Button(self.input_frame, text="Clear Fields", command=self.clear_fields)
-        self.clear_button.grid(row=5, column=1, pady=10, padx=5, sticky="ew")
+        self.clear_button.grid(row=6, column=1, pady=10, padx=5, sticky="ew")
+
+        # --- Filter Frame Widgets (applied in SQL) ---
+        ttk.Label(self.filter_frame, text="From:").grid(row=0, column=0, sticky="w", padx=5)
+        self.filter_start_entry = ttk.Entry(self.filter_frame, width=12)
+        self.filter_start_entry.grid(row=0, column=1, padx=5)
+
+        ttk.Label(self.filter_frame, text="To:").grid(row=0, column=2, sticky="w", padx=5)
+        self.filter_end_entry = ttk.Entry(self.filter_frame, width=12)
+        self.filter_end_entry.grid(row=0, column=3, padx=5)
+
+        ttk.Label(self.filter_frame, text="Course:").grid(row=0, column=4, sticky="w", padx=5)
+        self.filter_course_entry = ttk.Entry(self.filter_frame, width=20)
+        self.filter_course_entry.grid(row=0, column=5, padx=5)
+
+        self.filter_button = ttk.Button(self.filter_frame, text="Filter", command=self.apply_filter)
+        self.filter_button.grid(row=0, column=6, padx=5)
+
+        # Busy indicator, shown while database work runs in the background
+        self.busy_label = ttk.Label(self.filter_frame, text="")
+        self.busy_label.grid(row=0, column=7, padx=10, sticky="e")
+        self.filter_frame.columnconfigure(7, weight=1)
+
+        self.filters = {}
+        self.last_key = None # Keyset of the last loaded row
+        self.has_more = False
+        self.loading_page = False
+        self.page_pending = False # A load_more_lectures call is already queued
+        self.tree_items = {} # Lecture ID -> sort key of its Treeview row (the row's iid is the ID)
+        self.loaded_keys = [] # Sorted keys of every loaded row, to find insert positions
+        self.change_seq = None # Last change feed entry applied; None until the first page has loaded
+        self.resources_loaded_for = None # Row whose duration, room and instructor are in the input fields
+        self.scheduler = None # Created on the notification thread
+        self.closing = False
 
         # --- Lecture List Frame Widgets (Treeview) ---
         self.lecture_tree = ttk.Treeview(self.list_frame, columns=("ID", "Course", "Topic", "Date", "Time", "Notified"), show="headings")
@@ -81,19 +149,45 @@ class UniLectureNotifierApp:
 
         # Scrollbar for the Treeview
         scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.lecture_tree.yview)
-        self.lecture_tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = scrollbar
+        self.lecture_tree.configure(yscrollcommand=self.on_tree_scroll)
         scrollbar.pack(side="right", fill="y")
         self.lecture_tree.pack(side="left", fill="both", expand=True)
 
         # Bind selection event to populate fields
         self.lecture_tree.bind("<<TreeviewSelect>>", self.load_selected_lecture)
 
+        # All database calls run on worker threads; results come back on the Tk thread
+        self.tasks = TkTaskRunner(master, on_busy_changed=self.on_busy_changed)
+
+        self.notification_thread = None
+
+        # Paint the window first; the first load and the scheduler start once Tk is idle
+        self.show_placeholder("Loading lectures...")
+        master.after_idle(self.start_background_work)
+
+    def start_background_work(self):
+        """Starts the initial load and the notification scheduler, both off the Tk thread."""
         self.load_lectures() # Load existing lectures on startup
 
-        # Start notification checker in a separate thread
+        # Start notification scheduler in a separate thread
         self.notification_thread = threading.Thread(target=self.check_for_notifications, daemon=True)
         self.notification_thread.start()
 
+    def shutdown(self):
+        """Stops the scheduler and the background workers; call after the main loop ends."""
+        self.closing = True
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        self.tasks.shutdown()
+
+    def show_placeholder(self, text):
+        """Shows a single informational row in place of the lecture list until real rows arrive."""
+        self.lecture_tree.delete(*self.lecture_tree.get_children())
+        self.tree_items = {}
+        self.loaded_keys = []
+        self.lecture_tree.insert("", "end", iid="placeholder", values=("", text, "", "", "", ""))
+
     def show_message(self, title, message):
         """Custom message box instead of alert()."""
         top = tk.Toplevel(self.master)
@@ -105,8 +199,9 @@ class UniLectureNotifierApp:
         ttk.Label(top, text=message, padding=10).pack(expand=True)
         ttk.Button(top, text="OK", command=top.destroy).pack(pady=5)
 
-    def validate_input(self, course_name, topic, date_str, time_str):
+    def validate_input(self, course_name, topic, date_str, time_str, duration_str=""):
         """Validates the input fields."""
+        from lecture_manager import CONFLICT_CONFIG
         if not course_name.strip():
             self.show_message("Input Error", "Course Name cannot be empty.")
             return False
@@ -120,78 +215,194 @@ class UniLectureNotifierApp:
         except ValueError:
             self.show_message("Input Error", "Invalid Time format. Use HH:MM:SS.")
             return False
+        max_duration = CONFLICT_CONFIG['max_duration']
+        if duration_str.strip() and not (duration_str.strip().isdigit() and 0 < int(duration_str) <= max_duration):
+            self.show_message("Input Error", f"Duration must be 1 to {max_duration} minutes.")
+            return False
         return True
 
+    def check_conflicts(self, lecture_date, lecture_time, duration_str, room, instructor, lecture_id, on_clear):
+        """
+        Looks for room/instructor double bookings in the background, then calls on_clear() to save,
+        after asking first if the new time would overlap another lecture.
+        """
+        from lecture_manager import check_conflicts, lecture_start
+        if not room.strip() and not instructor.strip():
+            on_clear()
+            return
+
+        def on_checked(conflicts):
+            if not conflicts:
+                on_clear()
+                return
+            lines = [f"{lec['conflict'].capitalize()} booked by {lec['course_name']} at "
+                     f"{lecture_start(lec).strftime('%H:%M')}" for lec in conflicts[:3]]
+            if self.ask_confirmation("Scheduling Conflict", "\n".join(lines) + "\nSave anyway?"):
+                on_clear()
+
+        self.tasks.submit(check_conflicts, lecture_date, lecture_time, duration_str.strip() or None, room, instructor,
+                          lecture_id, on_done=on_checked, on_error=self.on_task_error)
+
     def add_lecture(self):
         """Handles adding a new lecture."""
+        from lecture_manager import add_lecture
         course_name = self.course_name_entry.get()
         topic = self.topic_entry.get()
         date_str = self.date_entry.get()
         time_str = self.time_entry.get()
+        duration_str = self.duration_entry.get()
+        room = self.room_entry.get()
+        instructor = self.instructor_entry.get()
 
-        if not self.validate_input(course_name, topic, date_str, time_str):
+        if not self.validate_input(course_name, topic, date_str, time_str, duration_str):
             return
 
         try:
             lecture_date = datetime.date.fromisoformat(date_str)
             lecture_time = datetime.time.fromisoformat(time_str)
+        except ValueError as e:
+            self.show_message("Input Error", f"Date/Time parsing error: {e}")
+            return
+
+        repeat_str = self.repeat_until_entry.get().strip()
+        if repeat_str:
+            try:
+                repeat_until = datetime.date.fromisoformat(repeat_str)
+            except ValueError:
+                self.show_message("Input Error", "Invalid repeat date. Use YYYY-MM-DD.")
+                return
+            if repeat_until < lecture_date:
+                self.show_message("Input Error", "Repeat date must not be before the first lecture.")
+                return
+            if duration_str.strip() or room.strip() or instructor.strip():
+                self.show_message("Input Error", "Series have no duration, room or instructor.")
+                return
+            self.add_lecture_series(course_name, topic, lecture_date, lecture_time, repeat_until)
+            return
 
-            if add_lecture(course_name, topic, lecture_date, lecture_time):
+        def on_added(lecture_id):
+            if lecture_id:
                 self.show_message("Success", "Lecture added successfully!")
                 self.clear_fields()
-                self.load_lectures()
+                self.refresh_lecture(lecture_id)
             else:
                 self.show_message("Error", "Failed to add lecture.")
-        except ValueError as e:
-            self.show_message("Input Error", f"Date/Time parsing error: {e}")
+
+        def save():
+            self.tasks.submit(add_lecture, course_name, topic, lecture_date, lecture_time, duration_str.strip(),
+                              room, instructor, on_done=on_added, on_error=self.on_task_error)
+
+        self.check_conflicts(lecture_date, lecture_time, duration_str, room, instructor, None, on_clear=save)
+
+    def add_lecture_series(self, course_name, topic, first_date, lecture_time, repeat_until):
+        """Adds a weekly series on the weekday of first_date; its occurrences show up on reload."""
+        from lecture_manager import add_series
+        def on_added(series_id):
+            if series_id:
+                self.show_message("Success", "Weekly lecture series added successfully!")
+                self.clear_fields()
+                self.load_lectures()
+            else:
+                self.show_message("Error", "Failed to add lecture series.")
+
+        self.tasks.submit(add_series, course_name, topic, first_date.weekday(), lecture_time, first_date, repeat_until,
+                          on_done=on_added, on_error=self.on_task_error)
+
+    def selected_lecture_id(self, item):
+        """Returns the lecture ID of a Treeview row: an int, or a string for series occurrences."""
+        from lecture_manager import parse_occurrence_id
+        return item if parse_occurrence_id(item) is not None else int(item)
 
     def update_lecture(self):
         """Handles updating an existing lecture."""
+        from lecture_manager import override_occurrence, parse_occurrence_id, update_lecture
         selected_item = self.lecture_tree.focus()
-        if not selected_item:
+        if not selected_item or selected_item == "placeholder":
             self.show_message("Selection Error", "Please select a lecture to update.")
             return
 
-        lecture_id = self.lecture_tree.item(selected_item, 'values')[0]
+        lecture_id = self.selected_lecture_id(selected_item)
         course_name = self.course_name_entry.get()
         topic = self.topic_entry.get()
         date_str = self.date_entry.get()
         time_str = self.time_entry.get()
+        duration_str = self.duration_entry.get()
+        room = self.room_entry.get()
+        instructor = self.instructor_entry.get()
 
-        if not self.validate_input(course_name, topic, date_str, time_str):
+        if not self.validate_input(course_name, topic, date_str, time_str, duration_str):
             return
 
         try:
             lecture_date = datetime.date.fromisoformat(date_str)
             lecture_time = datetime.time.fromisoformat(time_str)
+        except ValueError as e:
+            self.show_message("Input Error", f"Date/Time parsing error: {e}")
+            return
 
-            if update_lecture(lecture_id, course_name, topic, lecture_date, lecture_time):
+        def on_updated(updated):
+            if updated:
                 self.show_message("Success", f"Lecture ID {lecture_id} updated successfully!")
                 self.clear_fields()
-                self.load_lectures()
+                self.refresh_lecture(lecture_id)
             else:
                 self.show_message("Error", f"Failed to update lecture ID {lecture_id}.")
-        except ValueError as e:
-            self.show_message("Input Error", f"Date/Time parsing error: {e}")
+
+        occurrence = parse_occurrence_id(lecture_id)
+        if occurrence is not None:
+            # A single occurrence keeps its series' course and date; only topic and time can change
+            if lecture_date != occurrence[1]:
+                self.show_message("Input Error", "The date of a series occurrence cannot be changed.")
+                return
+            self.tasks.submit(override_occurrence, lecture_id, topic, lecture_time,
+                              on_done=on_updated, on_error=self.on_task_error)
+            return
+
+        if self.resources_loaded_for != selected_item:
+            # Duration, room and instructor are still loading; leaving them out keeps the stored values
+            self.tasks.submit(update_lecture, lecture_id, course_name, topic, lecture_date, lecture_time,
+                              on_done=on_updated, on_error=self.on_task_error)
+            return
+
+        def save():
+            # Empty fields clear the lecture's duration, room or instructor
+            self.tasks.submit(update_lecture, lecture_id, course_name, topic, lecture_date, lecture_time,
+                              duration_str.strip(), room, instructor, on_done=on_updated, on_error=self.on_task_error)
+
+        self.check_conflicts(lecture_date, lecture_time, duration_str, room, instructor, lecture_id, on_clear=save)
 
     def delete_lecture(self):
         """Handles deleting a lecture."""
+        from lecture_manager import cancel_occurrence, delete_lecture, parse_occurrence_id
         selected_item = self.lecture_tree.focus()
-        if not selected_item:
+        if not selected_item or selected_item == "placeholder":
             self.show_message("Selection Error", "Please select a lecture to delete.")
             return
 
-        lecture_id = self.lecture_tree.item(selected_item, 'values')[0]
+        lecture_id = self.selected_lecture_id(selected_item)
 
-        # Custom confirmation dialog
-        if self.ask_confirmation("Confirm Deletion", f"Are you sure you want to delete lecture ID {lecture_id}?"):
-            if delete_lecture(lecture_id):
+        def on_deleted(deleted):
+            if deleted:
                 self.show_message("Success", f"Lecture ID {lecture_id} deleted successfully!")
                 self.clear_fields()
-                self.load_lectures()
+                self.remove_lecture_row(lecture_id)
             else:
                 self.show_message("Error", f"Failed to delete lecture ID {lecture_id}.")
 
+        # Deleting one occurrence of a series cancels just that date
+        delete = cancel_occurrence if parse_occurrence_id(lecture_id) is not None else delete_lecture
+        # Custom confirmation dialog
+        if self.ask_confirmation("Confirm Deletion", f"Are you sure you want to delete lecture ID {lecture_id}?"):
+            self.tasks.submit(delete, lecture_id, on_done=on_deleted, on_error=self.on_task_error)
+
+    def on_task_error(self, error):
+        """Reports an unexpected exception raised by a background task."""
+        self.show_message("Error", f"Database operation failed: {error}")
+
+    def on_busy_changed(self, busy):
+        """Shows or hides the busy indicator."""
+        self.busy_label.config(text="Working..." if busy else "")
+
     def ask_confirmation(self, title, message):
         """Custom confirmation dialog."""
         result = [False] # Use a list to allow modification from nested function
@@ -221,31 +432,200 @@ class UniLectureNotifierApp:
         self.master.wait_window(top) # Wait for the Toplevel window to close
         return result[0]
 
-    def load_lectures(self):
-        """Loads all lectures from the database into the Treeview."""
-        for item in self.lecture_tree.get_children():
-            self.lecture_tree.delete(item) # Clear existing items
+    def apply_filter(self):
+        """Reads the filter fields and reloads the list with the filters applied in SQL."""
+        filters = {}
+        try:
+            start_str = self.filter_start_entry.get().strip()
+            end_str = self.filter_end_entry.get().strip()
+            if start_str:
+                filters['start_date'] = datetime.date.fromisoformat(start_str)
+            if end_str:
+                filters['end_date'] = datetime.date.fromisoformat(end_str)
+        except ValueError:
+            self.show_message("Input Error", "Invalid filter date. Use YYYY-MM-DD.")
+            return
+        course = self.filter_course_entry.get().strip()
+        if course:
+            filters['course_name'] = course
+        self.filters = filters
+        self.load_lectures()
 
-        lectures = get_all_lectures()
+    def load_lectures(self):
+        """
+        Reloads the Treeview with the first page of lectures; later pages load on scroll.
+        Runs in the background; repeated calls coalesce so only the newest reload is applied.
+        """
+        self.loading_page = True
+        self.tasks.submit(load_first_page, after=None, limit=PAGE_SIZE, **self.filters,
+                          key='lecture-pages', on_done=self.on_first_page_loaded, on_error=self.on_page_error)
+
+    def on_first_page_loaded(self, result):
+        """Shows the first page and, once the feed position is known, starts tailing the change feed."""
+        change_seq, lectures = result
+        self.on_page_loaded(lectures, reset=True)
+        if self.change_seq is None and change_seq is not None:
+            self.change_seq = change_seq
+            self.master.after(CHANGE_POLL_MS, self.poll_changes)
+
+    def load_more_lectures(self):
+        """Fetches the next page of lectures in the background."""
+        from lecture_manager import get_lectures_page
+        self.page_pending = False
+        if self.loading_page or not self.has_more:
+            return
+        self.loading_page = True
+        self.tasks.submit(get_lectures_page, after=self.last_key, limit=PAGE_SIZE, **self.filters,
+                          key='lecture-pages', on_done=self.on_page_loaded, on_error=self.on_page_error)
+
+    def on_page_loaded(self, lectures, reset=False):
+        """Appends a fetched page to the Treeview (replacing its contents for the first page)."""
+        from lecture_manager import lecture_key
+        self.loading_page = False
+        if reset:
+            self.lecture_tree.delete(*self.lecture_tree.get_children()) # Clear existing items
+            self.tree_items = {}
+            self.loaded_keys = []
+            self.last_key = None
         for lec in lectures:
-            # Ensure date and time are formatted correctly for display
-            lec_date_str = lec['lecture_date'].strftime('%Y-%m-%d') if isinstance(lec['lecture_date'], datetime.date) else str(lec['lecture_date'])
-            lec_time_str = lec['lecture_time'].strftime('%H:%M:%S') if isinstance(lec['lecture_time'], datetime.time) else str(lec['lecture_time'])
-            notified_status = "Yes" if lec['notification_sent'] else "No"
-            self.lecture_tree.insert("", "end", values=(
-                lec['id'], lec['course_name'], lec['topic'], lec_date_str, lec_time_str, notified_status
-            ))
+            if lec['id'] in self.tree_items:
+                continue # Already inserted by an incremental refresh
+            key = lecture_key(lec)
+            self.lecture_tree.insert("", "end", iid=str(lec['id']), values=self.lecture_values(lec))
+            self.tree_items[lec['id']] = key
+            self.loaded_keys.append(key)
+        if lectures:
+            self.last_key = lecture_key(lectures[-1])
+        self.has_more = len(lectures) == PAGE_SIZE
+
+    def poll_changes(self):
+        """Fetches changes made since the last poll (by any client) in the background."""
+        from lecture_manager import fetch_changes
+        self.tasks.submit(fetch_changes, self.change_seq, key='change-feed', on_done=self.apply_changes,
+                          on_error=self.on_task_error)
+        self.master.after(CHANGE_POLL_MS, self.poll_changes)
+
+    def apply_changes(self, changes):
+        """Patches the loaded rows for every change in the feed instead of reloading the whole list."""
+        if not changes or changes[-1]['seq'] <= self.change_seq:
+            return
+        reload_all = False
+        for change in changes:
+            if change['seq'] <= self.change_seq:
+                continue # Already applied by an earlier, overlapping poll
+            if change['lecture_id'] is None:
+                reload_all = True
+            elif change['action'] in ('delete', 'occurrence_cancel'):
+                self.remove_lecture_row(change['lecture_id'])
+            else:
+                self.refresh_lecture(change['lecture_id'])
+        self.change_seq = changes[-1]['seq']
+        if reload_all:
+            self.load_lectures()
+        if self.scheduler is not None:
+            self.scheduler.wake() # Other clients' changes may move reminders, too
+
+    def on_page_error(self, error):
+        self.loading_page = False
+        if not self.tree_items:
+            self.show_placeholder("Could not load lectures. Check the database connection.")
+        self.on_task_error(error)
+
+    def matches_filters(self, lec):
+        """Client-side equivalent of the SQL filters, used for incremental updates."""
+        start_date = self.filters.get('start_date')
+        end_date = self.filters.get('end_date')
+        course = self.filters.get('course_name')
+        if start_date and lec['lecture_date'] < start_date:
+            return False
+        if end_date and lec['lecture_date'] > end_date:
+            return False
+        if course and course.lower() not in lec['course_name'].lower():
+            return False
+        return True
+
+    def refresh_lecture(self, lecture_id):
+        """Re-reads one lecture in the background and patches its Treeview row instead of reloading the list."""
+        from lecture_manager import get_lecture
+        def on_fetched(lec):
+            if lec is None:
+                self.remove_lecture_row(lecture_id)
+            else:
+                self.upsert_lecture_row(lec)
+
+        self.tasks.submit(get_lecture, lecture_id, key=f'lecture-{lecture_id}', on_done=on_fetched,
+                          on_error=self.on_task_error)
+
+    def upsert_lecture_row(self, lec):
+        """Inserts, moves or updates the row for a lecture, keeping the list sorted."""
+        from lecture_manager import lecture_key
+        lecture_id = lec['id']
+        key = lecture_key(lec)
+        # With more pages still unloaded, rows past the last loaded key arrive when scrolling.
+        visible = self.matches_filters(lec) and (not self.has_more or self.last_key is None or key <= self.last_key)
+        if lecture_id in self.tree_items:
+            self._forget_key(lecture_id)
+            if not visible:
+                self.lecture_tree.delete(str(lecture_id))
+                return
+            index = bisect.bisect(self.loaded_keys, key)
+            self.lecture_tree.move(str(lecture_id), "", index)
+            self.lecture_tree.item(str(lecture_id), values=self.lecture_values(lec))
+        else:
+            if not visible:
+                return
+            index = bisect.bisect(self.loaded_keys, key)
+            self.lecture_tree.insert("", index, iid=str(lecture_id), values=self.lecture_values(lec))
+        self.loaded_keys.insert(index, key)
+        self.tree_items[lecture_id] = key
+
+    def remove_lecture_row(self, lecture_id):
+        """Removes a lecture's row from the Treeview if it is loaded."""
+        if lecture_id in self.tree_items:
+            self._forget_key(lecture_id)
+            self.lecture_tree.delete(str(lecture_id))
+
+    def _forget_key(self, lecture_id):
+        key = self.tree_items.pop(lecture_id)
+        index = bisect.bisect_left(self.loaded_keys, key)
+        del self.loaded_keys[index]
+
+    def lecture_values(self, lec):
+        """Formats a lecture row for display in the Treeview."""
+        return display_values(lec)
+
+    def on_tree_scroll(self, first, last):
+        """Keeps the scrollbar in sync and fetches the next page when the view nears the end."""
+        self.scrollbar.set(first, last)
+        if float(last) >= PREFETCH_THRESHOLD and self.has_more and not self.loading_page and not self.page_pending:
+            self.page_pending = True
+            self.master.after_idle(self.load_more_lectures)
 
     def load_selected_lecture(self, event):
         """Loads the details of the selected lecture into the input fields."""
+        from lecture_manager import get_lecture, parse_occurrence_id
         selected_item = self.lecture_tree.focus()
-        if selected_item:
+        if selected_item and selected_item != "placeholder":
             values = self.lecture_tree.item(selected_item, 'values')
             self.clear_fields() # Clear first to avoid issues
             self.course_name_entry.insert(0, values[1])
             self.topic_entry.insert(0, values[2])
             self.date_entry.insert(0, values[3])
             self.time_entry.insert(0, values[4])
+            if parse_occurrence_id(selected_item) is None:
+                # Duration, room and instructor are not in the list; read them in the background
+                self.tasks.submit(get_lecture, int(selected_item), key='selected-lecture',
+                                  on_done=lambda lec: self.fill_resource_fields(selected_item, lec),
+                                  on_error=self.on_task_error)
+
+    def fill_resource_fields(self, item, lec):
+        """Fills duration, room and instructor if the lecture is still the selected one."""
+        if lec is None or self.lecture_tree.focus() != item:
+            return
+        self.duration_entry.insert(0, lec['duration_minutes'] or "")
+        self.room_entry.insert(0, lec['room'] or "")
+        self.instructor_entry.insert(0, lec['instructor'] or "")
+        self.resources_loaded_for = item
 
     def clear_fields(self):
         """Clears all input fields."""
@@ -253,29 +633,38 @@ class UniLectureNotifierApp:
         self.topic_entry.delete(0, tk.END)
         self.date_entry.delete(0, tk.END)
         self.time_entry.delete(0, tk.END)
+        self.repeat_until_entry.delete(0, tk.END)
+        self.duration_entry.delete(0, tk.END)
+        self.room_entry.delete(0, tk.END)
+        self.instructor_entry.delete(0, tk.END)
+        self.resources_loaded_for = None
         self.date_entry.insert(0, datetime.date.today().strftime('%Y-%m-%d'))
         self.time_entry.insert(0, "00:00:00")
 
     def check_for_notifications(self):
         """
-        Periodically checks for upcoming lectures and triggers notifications.
+        Runs the notification scheduler, which sleeps until the next reminder is due.
         Runs in a separate thread.
         """
-        while True:
-            upcoming = get_upcoming_lectures(minutes_ahead=15) # Check for lectures in next 15 minutes
-            for lec in upcoming:
-                # Use master.after to safely update GUI from a different thread
-                self.master.after(0, self.trigger_notification, lec)
-                mark_notification_sent(lec['id']) # Mark as sent immediately after triggering
+        from scheduler import NotificationScheduler # Imported here, off the Tk thread
+        self.scheduler = NotificationScheduler(on_due=self.on_lecture_due) # Windows from REMINDER_CONFIG
+        if self.closing: # The window was closed while the scheduler was being set up
+            return
+        self.scheduler.run()
 
-            time.sleep(60) # Check every 60 seconds (1 minute)
+    def on_lecture_due(self, lecture_data):
+        """Called by the scheduler thread for each lecture it has claimed."""
+        # Hand the notification to the Tk thread; the scheduler thread never touches widgets
+        self.tasks.call_soon(self.trigger_notification, lecture_data)
 
     def trigger_notification(self, lecture_data):
         """Displays a notification for an upcoming lecture."""
+        from lecture_manager import lecture_start
         course = lecture_data['course_name']
         topic = lecture_data['topic']
-        time_str = lecture_data['lecture_time'].strftime('%H:%M')
-        date_str = lecture_data['lecture_date'].strftime('%Y-%m-%d')
+        start = lecture_start(lecture_data) # MySQL returns TIME columns as timedelta
+        time_str = start.strftime('%H:%M')
+        date_str = start.strftime('%Y-%m-%d')
 
         notification_message = (
             f"Upcoming Lecture Alert!\n\n"
@@ -284,9 +673,18 @@ class UniLectureNotifierApp:
             f"Time: {time_str} on {date_str}"
         )
         self.show_message("Lecture Reminder", notification_message)
-        self.load_lectures() # Refresh the list to show notification_sent status update
-
-if __name__ == '__main__':
+        # Only the Notified column changed, so patch that cell instead of reloading the list
+        if lecture_data['notification_sent'] and lecture_data['id'] in self.tree_items:
+            self.lecture_tree.set(str(lecture_data['id']), "Notified", "Yes")
+
+def main():
+    """Runs the desktop app."""
+    from instrumentation import configure_logging
+    configure_logging()
     root = tk.Tk()
     app = UniLectureNotifierApp(root)
     root.mainloop()
+    app.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+asyncio front end for lecture_manager.
+
+Every coroutine runs the matching blocking lecture_manager function on a dedicated
+thread pool sized to the storage backend's connection limit, so database calls never
+block the event loop and never queue for a connection. Results, caching and change
+notifications are exactly those of lecture_manager.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import lecture_manager
+from storage import get_backend
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_backend().max_connections, thread_name_prefix="lecture-db")
+        return _executor
+
+async def _run(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+async def add_lecture(course_name, topic, lecture_date, lecture_time, duration_minutes=None, room=None,
+                      instructor=None):
+    """Adds a lecture. Returns the new ID, or False on failure."""
+    return await _run(lecture_manager.add_lecture, course_name, topic, lecture_date, lecture_time, duration_minutes,
+                      room, instructor)
+
+async def bulk_add_lectures(lectures, batch_size=1000):
+    """Adds many lectures in batches. Returns the number inserted."""
+    return await _run(lecture_manager.bulk_add_lectures, lectures, batch_size)
+
+async def get_all_lectures():
+    """Retrieves all lectures."""
+    return await _run(lecture_manager.get_all_lectures)
+
+async def get_lecture(lecture_id):
+    """Retrieves one lecture, or None."""
+    return await _run(lecture_manager.get_lecture, lecture_id)
+
+async def get_lectures_page(after=None, limit=200, start_date=None, end_date=None, course_name=None):
+    """Retrieves one keyset page of lectures."""
+    return await _run(lecture_manager.get_lectures_page, after, limit, start_date, end_date, course_name)
+
+async def update_lecture(lecture_id, course_name, topic, lecture_date, lecture_time, duration_minutes=None,
+                         room=None, instructor=None):
+    """Updates a lecture. Returns True if a row changed."""
+    return await _run(lecture_manager.update_lecture, lecture_id, course_name, topic, lecture_date, lecture_time,
+                      duration_minutes, room, instructor)
+
+async def delete_lecture(lecture_id):
+    """Deletes a lecture. Returns True if a row was removed."""
+    return await _run(lecture_manager.delete_lecture, lecture_id)
+
+async def mark_notification_sent(lecture_id):
+    """Marks one lecture as notified."""
+    return await _run(lecture_manager.mark_notification_sent, lecture_id)
+
+async def mark_notifications_sent(lecture_ids):
+    """Marks several lectures as notified. Returns the number of rows changed."""
+    return await _run(lecture_manager.mark_notifications_sent, list(lecture_ids))
+
+async def get_upcoming_lectures(minutes_ahead=15):
+    """Retrieves un-notified lectures starting within minutes_ahead."""
+    return await _run(lecture_manager.get_upcoming_lectures, minutes_ahead)
+
+async def get_pending_lectures(until):
+    """Retrieves un-notified lectures starting between now and until."""
+    return await _run(lecture_manager.get_pending_lectures, until)
+
+async def claim_due_lectures(minutes_ahead=15):
+    """Atomically claims and marks lectures starting within minutes_ahead."""
+    return await _run(lecture_manager.claim_due_lectures, minutes_ahead)
+
+async def claim_lectures(lecture_ids):
+    """Atomically claims the given lectures if they are not yet notified."""
+    return await _run(lecture_manager.claim_lectures, list(lecture_ids))
+
+async def get_pending_reminders(until, windows=None):
+    """Retrieves (fire_at, window_minutes, lecture) for unsent reminders due by until."""
+    return await _run(lecture_manager.get_pending_reminders, until, windows)
+
+async def claim_reminders(reminders, windows=None):
+    """Atomically claims (window_minutes, lecture) reminders. Returns the won ones."""
+    return await _run(lecture_manager.claim_reminders, list(reminders), windows)
+
+async def add_series(course_name, topic, weekday, lecture_time, start_date, end_date, interval_weeks=1):
+    """Adds a recurring lecture series. Returns the new series ID, or False on failure."""
+    return await _run(lecture_manager.add_series, course_name, topic, weekday, lecture_time, start_date, end_date,
+                      interval_weeks)
+
+async def get_all_series():
+    """Retrieves every lecture series."""
+    return await _run(lecture_manager.get_all_series)
+
+async def delete_series(series_id):
+    """Deletes a series. Returns True if it existed."""
+    return await _run(lecture_manager.delete_series, series_id)
+
+async def get_occurrence(occ_id):
+    """Retrieves one series occurrence, or None."""
+    return await _run(lecture_manager.get_occurrence, occ_id)
+
+async def cancel_occurrence(occ_id):
+    """Cancels one series occurrence."""
+    return await _run(lecture_manager.cancel_occurrence, occ_id)
+
+async def override_occurrence(occ_id, topic=None, lecture_time=None):
+    """Changes the topic and/or time of one series occurrence."""
+    return await _run(lecture_manager.override_occurrence, occ_id, topic, lecture_time)
+
+async def check_conflicts(lecture_date, lecture_time, duration_minutes=None, room=None, instructor=None,
+                          exclude_id=None):
+    """Retrieves the lectures a lecture at this slot would double-book."""
+    return await _run(lecture_manager.check_conflicts, lecture_date, lecture_time, duration_minutes, room, instructor,
+                      exclude_id)
+
+async def conflict_report(start_date=None, end_date=None):
+    """Retrieves every room/instructor double booking between two dates."""
+    return await _run(lecture_manager.conflict_report, start_date, end_date)
+
+async def run_blocking(fn, *args, **kwargs):
+    """Runs another blocking callable that uses lecture_manager on the same bounded thread pool."""
+    return await _run(fn, *args, **kwargs)
+
+def shutdown():
+    """Stops the worker threads once queued calls have finished."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,254 @@
+"""
+Benchmark suite for lecture_manager, the notifier tick and the Treeview reload.
+
+Runs offline against the embedded SQLite backend (in memory by default) and writes
+the results as JSON, so runs can be compared across commits:
+
+    python benchmark.py --sizes 1000 10000 100000 --output bench_results.json
+    python benchmark.py --sizes 1000000 --ops 100 --sqlite-path /tmp/bench.db
+
+For every timetable size it reports per-operation latency (mean, p50, p95, max in
+milliseconds) and throughput for add/update/delete/get_all_lectures,
+get_upcoming_lectures and one notifier tick, plus the load_lectures render time
+in a hidden Tk window when a display is available. The memory section compares the
+bytes per lecture of dict rows with the column-oriented LectureTable.
+
+The startup section runs fresh interpreters to time importing app.py and cli.py, to
+confirm cli.py does not load tkinter or the database driver, and to time the desktop
+window's first paint (when a display is available).
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import instrumentation
+import lecture_manager
+import storage
+from campus_time import campus_now
+from scheduler import NotificationScheduler
+from timetable_generator import generate_timetable
+
+def summarize(samples):
+    """Turns a list of per-op durations (seconds) into latency/throughput statistics."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'ops': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'ops_per_s': len(ordered) / total if total else None,
+    }
+
+def measure(fn, repeat, before_each=None):
+    """Calls fn() 'repeat' times and returns the per-call durations."""
+    samples = []
+    for i in range(repeat):
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def seed(size, now, batch_size=5000):
+    """Loads a fresh synthetic timetable generated for 'now' and returns (seconds taken, ids)."""
+    started = time.perf_counter()
+    lecture_manager.bulk_add_lectures(generate_timetable(size, now.date(), now=now), batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    ids = [row['id'] for row in lecture_manager.stream_lectures()]
+    return elapsed, ids
+
+def bench_crud(ids, ops, rng):
+    results = {}
+    today = datetime.date.today()
+
+    results['add_lecture'] = summarize(measure(
+        lambda i: lecture_manager.add_lecture(f"Bench {i}", "Benchmark", today + datetime.timedelta(days=i % 90),
+                                              datetime.time(9, i % 60)), ops))
+
+    targets = rng.sample(ids, min(ops, len(ids)))
+    results['update_lecture'] = summarize(measure(
+        lambda i: lecture_manager.update_lecture(targets[i], "Bench Updated", "Benchmark", today,
+                                                 datetime.time(10, i % 60)), len(targets)))
+
+    victims = rng.sample(ids, min(ops, len(ids)))
+    results['delete_lecture'] = summarize(measure(lambda i: lecture_manager.delete_lecture(victims[i]), len(victims)))
+
+    reads = max(3, ops // 50)
+    results['get_all_lectures'] = summarize(measure(lambda i: lecture_manager.get_all_lectures(), reads,
+                                                    before_each=lecture_manager.clear_cache))
+    results['get_all_lectures_cached'] = summarize(measure(lambda i: lecture_manager.get_all_lectures(), reads))
+    results['get_lectures_page'] = summarize(measure(lambda i: lecture_manager.get_lectures_page(limit=200), ops,
+                                                     before_each=lecture_manager.clear_cache))
+    results['get_upcoming_lectures'] = summarize(measure(lambda i: lecture_manager.get_upcoming_lectures(15), ops,
+                                                         before_each=lecture_manager.clear_cache))
+    return results
+
+def bench_notifier_tick(repeat):
+    """One scheduler wakeup: reload the heap, pop what is due, claim it."""
+    scheduler = NotificationScheduler(on_due=lambda lecture: None)
+
+    def tick(_):
+        scheduler.reload()
+        scheduler.claim(scheduler.pop_due(campus_now()))
+
+    return summarize(measure(tick, repeat))
+
+def bench_memory(size):
+    """Bytes per lecture held by a full list load: dict rows versus LectureTable."""
+    results = {}
+    for label, load in (('dict_rows', lambda: lecture_manager._fetch(lecture_manager.ALL_LECTURES_SQL)),
+                        ('lecture_table', lambda: lecture_manager._fetch_table(lecture_manager.ALL_LECTURES_SQL))):
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = load()
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {'bytes_per_lecture': current / max(1, len(rows)), 'peak_bytes': peak,
+                          'load_seconds': elapsed}
+        del rows
+    return results
+
+def bench_ui_reload(repeat):
+    """Time to render the first page into the Treeview, in a withdrawn Tk window."""
+    try:
+        import tkinter as tk
+        from app import PAGE_SIZE, UniLectureNotifierApp
+        root = tk.Tk()
+    except Exception as e: # No display (or no Tk) on this machine
+        return {'skipped': str(e)}
+    root.withdraw()
+    app = UniLectureNotifierApp(root)
+    try:
+        page = lecture_manager.get_lectures_page(limit=PAGE_SIZE)
+        samples = measure(lambda i: (app.on_page_loaded(page, reset=True), root.update_idletasks()), repeat)
+        return summarize(samples)
+    finally:
+        app.shutdown()
+        root.destroy()
+
+# Run in a fresh interpreter each time, so nothing is imported or cached beforehand.
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(elapsed, 'tkinter' in sys.modules, 'mysql' in sys.modules)
+"""
+
+FIRST_PAINT_PROBE = """
+import time
+started = time.perf_counter()
+import tkinter as tk
+from app import UniLectureNotifierApp
+root = tk.Tk()
+app = UniLectureNotifierApp(root)
+root.update()
+painted = time.perf_counter() - started
+print(painted)
+app.shutdown()
+root.destroy()
+"""
+
+def _probe(code):
+    env = dict(os.environ, UNILECTURE_BACKEND='sqlite', UNILECTURE_SQLITE_PATH=':memory:')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr.strip().splitlines() or ['probe failed'])[-1])
+    return result.stdout.split()
+
+def bench_startup(repeat):
+    """Import time of app.py and cli.py and the desktop app's time to first paint, in fresh processes."""
+    results = {}
+    for module in ('app', 'cli'):
+        samples = []
+        for _ in range(repeat):
+            elapsed, tkinter_loaded, driver_loaded = _probe(IMPORT_PROBE.format(module=module))
+            samples.append(float(elapsed))
+        results[f'import_{module}'] = summarize(samples)
+        results[f'import_{module}']['loads_tkinter'] = tkinter_loaded == 'True'
+        results[f'import_{module}']['loads_mysql'] = driver_loaded == 'True'
+    try:
+        results['first_paint'] = summarize([float(_probe(FIRST_PAINT_PROBE)[0]) for _ in range(repeat)])
+    except RuntimeError as e: # No display (or no Tk) on this machine
+        results['first_paint'] = {'skipped': str(e)}
+    return results
+
+def run(sizes, ops, sqlite_path, seed_value, now):
+    rng = random.Random(seed_value)
+    report = {}
+    for size in sizes:
+        if sqlite_path != ':memory:' and os.path.exists(sqlite_path):
+            os.remove(sqlite_path)
+        storage.configure('sqlite', sqlite_path)
+        lecture_manager.clear_cache()
+        instrumentation.reset_metrics()
+        seed_seconds, ids = seed(size, now)
+        results = {'bulk_add_lectures': {'rows': size, 'seconds': seed_seconds,
+                                         'rows_per_s': size / seed_seconds if seed_seconds else None}}
+        results.update(bench_crud(ids, ops, rng))
+        results['notifier_tick'] = bench_notifier_tick(max(3, ops // 20))
+        results['memory'] = bench_memory(size)
+        results['load_lectures_render'] = bench_ui_reload(max(3, ops // 20))
+        # Per-phase breakdown (connect/query/commit/rows) from the data layer's own instrumentation
+        results['instrumentation'] = instrumentation.metrics_snapshot()
+        report[str(size)] = results
+        print(f"size={size}: done", file=sys.stderr)
+    storage.get_backend().close()
+    return report
+
+def metadata(args, now):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': 'sqlite',
+        'sqlite_path': args.sqlite_path,
+        'ops_per_measurement': args.ops,
+        'timetable_now': now.isoformat(), # Pass to timetable_generator --now to rebuild the same rows
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the UniLecture data layer and UI reload.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Timetable sizes to benchmark (up to 1000000)")
+    parser.add_argument('--ops', type=int, default=200, help="Operations per write/read measurement")
+    parser.add_argument('--sqlite-path', default=':memory:', help="SQLite database to use (recreated per size)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--startup-runs', type=int, default=5, help="Fresh interpreters per startup measurement")
+    args = parser.parse_args(argv)
+    # Slow-operation warnings are expected at large sizes; keep them out of the console
+    logging.getLogger('unilecture.timing').setLevel(logging.ERROR)
+
+    # One timetable clock for every size, so the sizes share their rows; it has to be the real
+    # time, or the generated due lectures would not be due for the notifier tick
+    now = campus_now().replace(microsecond=0)
+    report = {'meta': metadata(args, now), 'startup': bench_startup(args.startup_runs),
+              'results': run(args.sizes, args.ops, args.sqlite_path, args.seed, now)}
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
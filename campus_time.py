@@ -0,0 +1,49 @@
+"""
+Campus wall-clock time and UTC conversion.
+
+Lectures are entered and shown in the campus' local time (lecture_date/lecture_time),
+but scheduled on lectures.starts_at, the same instant in UTC. Due-window queries are
+computed here, on the client, so they no longer depend on the database server's clock
+or time zone and keep working across midnight and DST changes.
+
+The campus time zone is an IANA name such as 'Europe/Berlin' taken from
+UNILECTURE_TIMEZONE; without it the machine's local time zone is used.
+"""
+import datetime
+import os
+
+TIME_CONFIG = {
+    'timezone': os.environ.get('UNILECTURE_TIMEZONE') or None,  # IANA zone name, None = system local time
+}
+
+_zone_cache = {}
+
+def campus_zone():
+    """Returns the configured campus tzinfo, or None for the system local time zone."""
+    name = TIME_CONFIG['timezone']
+    if not name:
+        return None
+    zone = _zone_cache.get(name)
+    if zone is None:
+        from zoneinfo import ZoneInfo # Only needed when a zone is configured
+        zone = _zone_cache[name] = ZoneInfo(name)
+    return zone
+
+def campus_now():
+    """Current campus wall-clock time as a naive datetime, comparable with lecture_start()."""
+    zone = campus_zone()
+    if zone is None:
+        return datetime.datetime.now()
+    return datetime.datetime.now(zone).replace(tzinfo=None)
+
+def to_utc(local):
+    """Converts a naive campus wall-clock datetime to a naive UTC datetime (as stored in starts_at)."""
+    zone = campus_zone()
+    aware = local.replace(tzinfo=zone) if zone is not None else local.astimezone()
+    return aware.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+def from_utc(utc):
+    """Converts a naive UTC datetime (from starts_at) back to naive campus wall-clock time."""
+    aware = utc.replace(tzinfo=datetime.timezone.utc)
+    zone = campus_zone()
+    return (aware.astimezone(zone) if zone is not None else aware.astimezone()).replace(tzinfo=None)
@@ -0,0 +1,145 @@
+"""
+Simulated multi-client check for the lecture change feed.
+
+Starts several clients, each in its own process with its own lecture cache, against
+one local SQLite database file. Each client loads a snapshot, then keeps writing
+random adds/updates/deletes while tailing fetch_changes() to patch its own copy of
+the timetable. Observers only tail the feed, like an app window nobody types into, so
+nothing but the feed tells them that cached lectures changed. Once every writer has
+stopped and every client has caught up, each copy must equal the database:
+
+    python change_feed_check.py --clients 4 --observers 2 --writes 200
+
+Exits non-zero if any client's state diverged.
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import lecture_manager
+import storage
+
+FIELDS = ('course_name', 'topic', 'lecture_date', 'lecture_time')
+
+def _snapshot():
+    return {lec['id']: tuple(lec[field] for field in FIELDS) for lec in lecture_manager.stream_lectures()}
+
+class SimulatedClient:
+    """One app instance: a local copy of the lectures kept current from the change feed."""
+
+    def __init__(self, name):
+        self.name = name
+        self.seq = lecture_manager.latest_change_seq(raise_errors=True)
+        self.lectures = _snapshot()
+        self.applied = 0
+        self.reloads = 0
+
+    def poll(self):
+        """Applies every change after self.seq. Returns the number applied."""
+        changes = lecture_manager.fetch_changes(self.seq)
+        for change in changes:
+            lecture_id = change['lecture_id']
+            if lecture_id is None:
+                self.seq = lecture_manager.latest_change_seq(raise_errors=True)
+                self.lectures = _snapshot()
+                self.reloads += 1
+                return len(changes)
+            lec = lecture_manager.get_lecture(lecture_id)
+            if lec is None:
+                self.lectures.pop(lecture_id, None)
+            else:
+                self.lectures[lecture_id] = tuple(lec[field] for field in FIELDS)
+            self.seq = change['seq']
+        self.applied += len(changes)
+        return len(changes)
+
+    def write(self, rng, day):
+        """Makes one random change to the shared database."""
+        action = rng.random()
+        ids = list(self.lectures)
+        when = (day + datetime.timedelta(days=rng.randrange(30)), datetime.time(8 + rng.randrange(10), 15 * rng.randrange(4)))
+        if action < 0.5 or not ids:
+            lecture_manager.add_lecture(f"{self.name} course", f"topic {rng.randrange(100)}", *when)
+        elif action < 0.8:
+            lecture_manager.update_lecture(rng.choice(ids), f"{self.name} edit", f"topic {rng.randrange(100)}", *when)
+        elif action < 0.97:
+            lecture_manager.delete_lecture(rng.choice(ids))
+        else:
+            lecture_manager.bulk_add_lectures([(f"{self.name} import", "bulk", *when)] * 3)
+
+def run_client(name, index, path, writes, seed_value, day, writers_done, stopped, results):
+    """Body of one client process: write (or just watch) and tail, then catch up once every writer has stopped."""
+    storage.configure('sqlite', path)
+    try:
+        client = SimulatedClient(name)
+        rng = random.Random(seed_value + index)
+        if writes:
+            for _ in range(writes):
+                client.write(rng, day)
+                if rng.random() < 0.3:
+                    client.poll()
+            writers_done.wait()
+        else:
+            while not stopped.is_set():
+                client.poll()
+                time.sleep(0.005)
+        while client.poll():
+            pass
+        results.put((client.name, client.lectures, client.applied, client.reloads, client.seq))
+    finally:
+        storage.get_backend().close()
+
+def run_clients(clients, observers, writes, seed_value, path):
+    """Runs every client in its own process and returns their final states, ordered by name."""
+    day = datetime.date.today()
+    writers_done = multiprocessing.Barrier(clients + 1) # The writers and this process
+    stopped = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    members = [(f"client{i}", writes) for i in range(clients)] + [(f"observer{i}", 0) for i in range(observers)]
+    processes = [multiprocessing.Process(target=run_client, args=(name, i, path, client_writes, seed_value, day,
+                                                                  writers_done, stopped, results))
+                 for i, (name, client_writes) in enumerate(members)]
+    for process in processes:
+        process.start()
+    writers_done.wait()
+    stopped.set()
+    # Drain the queue before joining; a child blocks on exit until its result has been read
+    states = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return sorted(states)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that change-feed clients converge on the database state.")
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--observers', type=int, default=2, help="Clients that only tail the feed")
+    parser.add_argument('--writes', type=int, default=200, help="Random writes per client")
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'change_feed.db')
+        storage.configure('sqlite', path)
+        try:
+            lecture_manager.latest_change_seq() # Creates the schema before the clients start
+            clients = run_clients(args.clients, args.observers, args.writes, args.seed, path)
+            expected = _snapshot()
+        finally:
+            storage.get_backend().close()
+
+    failed = False
+    for name, lectures, applied, reloads, _ in clients:
+        ok = lectures == expected
+        failed = failed or not ok
+        print(f"{name}: {'ok' if ok else 'DIVERGED'} ({len(lectures)} lectures, "
+              f"{applied} changes applied, {reloads} reloads)")
+    print(f"Database: {len(expected)} lectures, last change seq {clients[0][4] if clients else 0}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
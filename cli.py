@@ -0,0 +1,192 @@
+"""
+Command-line entry point for UniLecture, for terminals and servers without a display.
+
+    python cli.py list --from 2025-09-01 --course Physics
+    python cli.py upcoming --minutes 60
+    python cli.py add "Physics I" "Optics" 2025-09-03 09:00:00 --repeat-until 2025-12-17
+    python cli.py add "Physics I" "Lab" 2025-09-04 14:00:00 --duration 120 --room B101 --instructor Smith
+    python cli.py conflicts --from 2025-09-01 --to 2026-02-28
+    python cli.py delete 42
+    python cli.py changes --since 100
+    python cli.py prune-changes --days 30   # run daily, e.g. from cron
+    python cli.py notify --sink stdout      # the headless reminder service
+    python cli.py gui                      # the Tk desktop app
+
+Nothing here imports tkinter (except the gui command), and lecture_manager is only
+imported once a command needs it, so '--help' and argument errors return instantly.
+"""
+import argparse
+import datetime
+import sys
+
+def _print_lectures(lectures):
+    from lecture_table import display_values
+    for lecture in lectures:
+        lecture_id, course, topic, date_str, time_str, notified = display_values(lecture)
+        print(f"{lecture_id!s:>16}  {date_str} {time_str}  {course} - {topic or ''}"
+              f"{'  [notified]' if notified == 'Yes' else ''}")
+
+def cmd_list(args):
+    from lecture_manager import get_lectures_page, lecture_key
+    after = None
+    remaining = args.limit
+    while remaining > 0:
+        page = get_lectures_page(after=after, limit=min(remaining, 500), start_date=args.start_date,
+                                 end_date=args.end_date, course_name=args.course)
+        _print_lectures(page)
+        if len(page) < min(remaining, 500):
+            break
+        remaining -= len(page)
+        after = lecture_key(page[-1])
+    return 0
+
+def cmd_upcoming(args):
+    from lecture_manager import get_upcoming_lectures
+    _print_lectures(get_upcoming_lectures(args.minutes))
+    return 0
+
+def _describe(lecture):
+    return f"{lecture['id']} {lecture['course_name']} at {lecture['lecture_date']} {lecture['lecture_time']}"
+
+def cmd_add(args):
+    from lecture_manager import add_lecture, add_series, check_conflicts
+    if args.repeat_until:
+        if args.duration or args.room or args.instructor:
+            print("Series have no duration, room or instructor.", file=sys.stderr)
+            return 1
+        new_id = add_series(args.course, args.topic, args.date.weekday(), args.time, args.date, args.repeat_until)
+    else:
+        try:
+            conflicts = check_conflicts(args.date, args.time, args.duration, args.room, args.instructor)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        for lecture in conflicts:
+            print(f"Conflict ({lecture['conflict']}): {_describe(lecture)}", file=sys.stderr)
+        if conflicts and not args.force:
+            print("Lecture not added; use --force to add it anyway.", file=sys.stderr)
+            return 1
+        new_id = add_lecture(args.course, args.topic, args.date, args.time, args.duration, args.room, args.instructor)
+    if not new_id:
+        print("Failed to add lecture.", file=sys.stderr)
+        return 1
+    print(f"{'Series' if args.repeat_until else 'Lecture'} added with ID {new_id}.")
+    return 0
+
+def cmd_delete(args):
+    from lecture_manager import cancel_occurrence, delete_lecture, parse_occurrence_id
+    try:
+        lecture_id = args.id if parse_occurrence_id(args.id) is not None else int(args.id)
+    except ValueError:
+        print(f"Invalid lecture ID {args.id!r}; use a number or an occurrence ID like S3:2025-09-03.", file=sys.stderr)
+        return 1
+    deleted = cancel_occurrence(lecture_id) if isinstance(lecture_id, str) else delete_lecture(lecture_id)
+    if not deleted:
+        print(f"No lecture deleted for ID {args.id}.", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_changes(args):
+    from lecture_manager import fetch_changes
+    for change in fetch_changes(args.since, args.limit):
+        print(f"{change['seq']:>8}  {change['changed_at']:%Y-%m-%d %H:%M:%S}  {change['action']:<20} "
+              f"{'' if change['lecture_id'] is None else change['lecture_id']}")
+    return 0
+
+def cmd_prune_changes(args):
+    from campus_time import campus_now, to_utc
+    from lecture_manager import prune_changes
+    removed = prune_changes(to_utc(campus_now()) - datetime.timedelta(days=args.days))
+    if removed is None:
+        print("Could not prune the change feed.", file=sys.stderr)
+        return 1
+    print(f"Removed {removed} change feed entries older than {args.days} days.")
+    return 0
+
+def cmd_conflicts(args):
+    from lecture_manager import conflict_report
+    conflicts = conflict_report(args.start_date, args.end_date)
+    for conflict in conflicts:
+        print(f"{conflict['resource']} {conflict['value']}: {_describe(conflict['first'])} overlaps "
+              f"{_describe(conflict['second'])}")
+    return 1 if conflicts else 0
+
+def cmd_notify(args):
+    import notifier_service
+    return notifier_service.main(args.service_args)
+
+def cmd_gui(args):
+    import app # The only command that loads tkinter
+    app.main()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="unilecture", description="UniLecture command-line interface.")
+    parser.add_argument('--log-level', help="Logging level (default from UNILECTURE_LOG_LEVEL or WARNING)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    listing = commands.add_parser('list', help="List lectures in date order")
+    listing.add_argument('--from', dest='start_date', type=datetime.date.fromisoformat)
+    listing.add_argument('--to', dest='end_date', type=datetime.date.fromisoformat)
+    listing.add_argument('--course', help="Substring of the course name")
+    listing.add_argument('--limit', type=int, default=200)
+    listing.set_defaults(handler=cmd_list)
+
+    upcoming = commands.add_parser('upcoming', help="Lectures starting soon that were not notified yet")
+    upcoming.add_argument('--minutes', type=int, default=15)
+    upcoming.set_defaults(handler=cmd_upcoming)
+
+    add = commands.add_parser('add', help="Add a lecture or a weekly series")
+    add.add_argument('course')
+    add.add_argument('topic')
+    add.add_argument('date', type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+    add.add_argument('time', type=datetime.time.fromisoformat, help="HH:MM:SS")
+    add.add_argument('--repeat-until', type=datetime.date.fromisoformat, help="Repeat weekly until this date")
+    add.add_argument('--duration', type=int, help="Length in minutes (default from CONFLICT_CONFIG)")
+    add.add_argument('--room')
+    add.add_argument('--instructor')
+    add.add_argument('--force', action='store_true', help="Add even if the room or instructor is double-booked")
+    add.set_defaults(handler=cmd_add)
+
+    delete = commands.add_parser('delete', help="Delete a lecture (or cancel one series occurrence)")
+    delete.add_argument('id')
+    delete.set_defaults(handler=cmd_delete)
+
+    changes = commands.add_parser('changes', help="Show the change feed")
+    changes.add_argument('--since', type=int, default=0)
+    changes.add_argument('--limit', type=int, default=100)
+    changes.set_defaults(handler=cmd_changes)
+
+    prune = commands.add_parser('prune-changes', help="Delete old change feed entries")
+    prune.add_argument('--days', type=int, default=30,
+                       help="Keep this many days; clients offline for longer must reload (default 30)")
+    prune.set_defaults(handler=cmd_prune_changes)
+
+    conflicts = commands.add_parser('conflicts', help="Report room and instructor double bookings")
+    conflicts.add_argument('--from', dest='start_date', type=datetime.date.fromisoformat)
+    conflicts.add_argument('--to', dest='end_date', type=datetime.date.fromisoformat)
+    conflicts.set_defaults(handler=cmd_conflicts)
+
+    # Every argument after 'notify' is passed on to notifier_service unparsed, see main()
+    notify = commands.add_parser('notify', help="Run the headless reminder service (see notifier_service --help)",
+                                 add_help=False)
+    notify.set_defaults(handler=cmd_notify)
+
+    gui = commands.add_parser('gui', help="Start the desktop app")
+    gui.set_defaults(handler=cmd_gui)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'notify':
+        args.service_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command not in ('notify', 'gui'): # Those configure logging themselves
+        from instrumentation import configure_logging
+        configure_logging(args.log_level)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,16 @@
-import mysql.connector
-from mysql.connector import Error
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from mysql.connector import Error
+except ImportError: # The driver is only needed to connect; the pool also runs on an injected connect()
+    class Error(Exception):
+        """Stands in for mysql.connector.Error when mysql-connector is not installed."""
+
+logger = logging.getLogger(__name__)
 
 # Database configuration
 DB_CONFIG = {
@@ -9,32 +20,276 @@ DB_CONFIG = {
     'password': 'abc123' # !!! IMPORTANT: Replace with your MySQL password
 }
 
+# Connection pool configuration
+POOL_CONFIG = {
+    'max_size': 5,           # Maximum number of open connections
+    'checkout_timeout': 10,  # Seconds to wait for a free connection before giving up
+    'max_idle': 300,         # Seconds a connection may sit unused before it is closed
+    'max_lifetime': 3600,    # Seconds after which a connection is always replaced
+    'ping_after': 30,        # Idle seconds after which a connection is pinged before reuse
+    'evict_interval': 60,    # Seconds between sweeps that close connections idle past max_idle
+}
+
+def _connect():
+    import mysql.connector
+    return mysql.connector.connect(**DB_CONFIG)
+
 def create_connection():
     """Establishes a connection to the MySQL database."""
     connection = None
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = _connect()
         if connection.is_connected():
-            print("Successfully connected to the database")
+            logger.debug("Successfully connected to the database")
     except Error as e:
-        print(f"Error connecting to MySQL database: {e}")
+        logger.error("Error connecting to MySQL database: %s", e)
     return connection
 
 def close_connection(connection):
     """Closes the database connection."""
     if connection and connection.is_connected():
         connection.close()
-        print("MySQL connection closed")
+        logger.debug("MySQL connection closed")
+
+
+class _PooledConnection:
+    """A raw connection plus the bookkeeping the pool needs to evict it."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    A bounded pool of reusable MySQL connections.
+
+    Connections are created lazily up to max_size, health-checked before reuse,
+    and replaced once they exceed max_idle or max_lifetime. Every evict_interval
+    seconds, acquire/release also sweep the idle queue, so connections at the bottom
+    of the LIFO queue are closed after a burst instead of waiting for the server to drop them.
+    """
+
+    def __init__(self, max_size=5, checkout_timeout=10, max_idle=300, max_lifetime=3600, ping_after=30,
+                 evict_interval=60, connect=None):
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.evict_interval = evict_interval
+        self._next_eviction = time.monotonic() + evict_interval
+        self._connect = connect or _connect
+        self._idle = queue.LifoQueue()  # LIFO keeps a small hot set and lets the rest go idle
+        self._lock = threading.Lock()
+        self._open = 0
+        self._closed = False
+        self._metrics = {
+            'checkouts': 0,
+            'checkout_failures': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'health_check_failures': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+        }
+
+    def _new_connection(self):
+        try:
+            connection = self._connect()
+        except Error:
+            with self._lock:
+                self._open -= 1
+            raise
+        with self._lock:
+            self._metrics['connections_created'] += 1
+        return _PooledConnection(connection)
+
+    def _discard(self, pooled):
+        try:
+            pooled.connection.close()
+        except Error:
+            pass
+        with self._lock:
+            self._open -= 1
+            self._metrics['connections_closed'] += 1
+
+    def _is_usable(self, pooled):
+        now = time.monotonic()
+        if now - pooled.created_at > self.max_lifetime or now - pooled.last_used > self.max_idle:
+            return False
+        if now - pooled.last_used > self.ping_after:
+            try:
+                pooled.connection.ping(reconnect=False)
+            except Error:
+                with self._lock:
+                    self._metrics['health_check_failures'] += 1
+                return False
+        return True
+
+    def _maybe_evict(self):
+        """Runs evict_idle if evict_interval has passed since the last sweep."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_eviction:
+                return
+            self._next_eviction = now + self.evict_interval
+        self.evict_idle()
+
+    def acquire(self):
+        """Checks out a connection, waiting up to checkout_timeout for one to free up."""
+        if self._closed:
+            raise Error("Connection pool is closed")
+        self._maybe_evict()
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        pooled = None
+        while pooled is None:
+            try:
+                candidate = self._idle.get_nowait()
+            except queue.Empty:
+                candidate = None
+            if candidate is not None:
+                if self._is_usable(candidate):
+                    pooled = candidate
+                else:
+                    self._discard(candidate)
+                continue
+            with self._lock:
+                can_grow = self._open < self.max_size
+                if can_grow:
+                    self._open += 1
+            if can_grow:
+                pooled = self._new_connection()
+                continue
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                candidate = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                with self._lock:
+                    self._metrics['checkout_failures'] += 1
+                logger.warning("Connection pool exhausted: no connection free after %ss (max_size=%s)",
+                               self.checkout_timeout, self.max_size)
+                raise Error(f"Timed out after {self.checkout_timeout}s waiting for a pooled connection")
+            self._idle.put(candidate)
+        waited = time.monotonic() - started
+        with self._lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['total_wait_time'] += waited
+            self._metrics['max_wait_time'] = max(self._metrics['max_wait_time'], waited)
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Returns a connection to the pool, or closes it if it is broken or the pool is shut down."""
+        if discard or self._closed:
+            self._discard(pooled)
+            return
+        try:
+            # Never hand out a connection with a half-finished transaction.
+            if pooled.connection.in_transaction:
+                pooled.connection.rollback()
+        except Error:
+            self._discard(pooled)
+            return
+        pooled.last_used = time.monotonic()
+        self._idle.put(pooled)
+        self._maybe_evict()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it."""
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.connection
+        except Error:
+            broken = not pooled.connection.is_connected()
+            raise
+        finally:
+            self.release(pooled, discard=broken)
+
+    def evict_idle(self):
+        """Closes every idle connection that is past max_idle or max_lifetime."""
+        keep = []
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            now = time.monotonic()
+            if now - pooled.created_at > self.max_lifetime or now - pooled.last_used > self.max_idle:
+                self._discard(pooled)
+            else:
+                keep.append(pooled)
+        for pooled in reversed(keep):
+            self._idle.put(pooled)
+
+    def close(self):
+        """Closes all idle connections; connections still checked out are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def metrics(self):
+        """Returns a snapshot of the pool counters, useful for sizing max_size."""
+        with self._lock:
+            snapshot = dict(self._metrics)
+            snapshot['open_connections'] = self._open
+        snapshot['idle_connections'] = self._idle.qsize()
+        snapshot['in_use_connections'] = snapshot['open_connections'] - snapshot['idle_connections']
+        checkouts = snapshot['checkouts']
+        snapshot['avg_wait_time'] = snapshot['total_wait_time'] / checkouts if checkouts else 0.0
+        return snapshot
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(**POOL_CONFIG)
+        return _pool
+
+@contextmanager
+def get_connection():
+    """Borrows a connection from the shared pool for the duration of a with-block."""
+    with get_pool().connection() as connection:
+        yield connection
+
+def pool_metrics():
+    """Returns the shared pool's metrics."""
+    return get_pool().metrics()
+
+def close_pool():
+    """Shuts down the shared pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 if __name__ == '__main__':
     # Example usage:
-    conn = create_connection()
-    if conn:
-        # You can perform some test operations here if needed
-        # For example, check server version
-        cursor = conn.cursor()
-        cursor.execute("SELECT VERSION()")
-        db_version = cursor.fetchone()
-        print(f"Database version: {db_version[0]}")
-        cursor.close()
-        close_connection(conn)
+    try:
+        with get_connection() as conn:
+            # You can perform some test operations here if needed
+            # For example, check server version
+            cursor = conn.cursor()
+            cursor.execute("SELECT VERSION()")
+            db_version = cursor.fetchone()
+            print(f"Database version: {db_version[0]}")
+            cursor.close()
+        print(f"Pool metrics: {pool_metrics()}")
+    except Error as e:
+        print(f"Error connecting to MySQL database: {e}")
+    finally:
+        close_pool()
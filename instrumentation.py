@@ -0,0 +1,265 @@
+"""
+Hot-path timing for the data layer.
+
+Decorating a function with @instrumented('name') times each call and, through the
+connection proxies that storage.get_connection hands out, splits it into connect,
+query and commit time plus the number of rows fetched. Every measurement goes into
+an in-process histogram and a one-line log record on the 'unilecture.timing' logger
+(DEBUG normally, WARNING for slow operations).
+
+    metrics_snapshot()   # dict of histograms, e.g. for an admin view
+    dump_metrics(path)   # the same as JSON
+"""
+import bisect
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+
+INSTRUMENTATION_CONFIG = {
+    'log_level': os.environ.get('UNILECTURE_LOG_LEVEL', 'WARNING'),  # Level used by configure_logging()
+    'slow_op_ms': float(os.environ.get('UNILECTURE_SLOW_OP_MS', 200)),  # Operations slower than this log a warning
+}
+
+# Upper bucket bounds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+ROW_BUCKETS = [0, 1, 10, 100, 1000, 10000, 100000, 1000000]
+
+timing_logger = logging.getLogger('unilecture.timing')
+
+def configure_logging(level=None):
+    """Sets up console logging for the application at the configured (or given) level."""
+    level = level or INSTRUMENTATION_CONFIG['log_level']
+    logging.basicConfig(level=getattr(logging, str(level).upper(), logging.WARNING),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': {('+Inf' if i == len(self.bounds) else str(self.bounds[i])): count
+                        for i, count in enumerate(self.counts)},
+        }
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+def observe(name, value, bounds=LATENCY_BUCKETS_MS):
+    """Records one value in the named histogram."""
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram(bounds)
+        histogram.observe(value)
+
+def metrics_snapshot():
+    """Returns {histogram name: statistics} for every recorded metric."""
+    with _histograms_lock:
+        return {name: histogram.snapshot() for name, histogram in sorted(_histograms.items())}
+
+def reset_metrics():
+    """Clears all histograms."""
+    with _histograms_lock:
+        _histograms.clear()
+
+def dump_metrics(path):
+    """Writes metrics_snapshot() to a JSON file."""
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(metrics_snapshot(), handle, indent=2)
+
+
+class Operation:
+    """Timings collected for one call of an instrumented function."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases = {'connect': 0.0, 'query': 0.0, 'commit': 0.0}
+        self.rows = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def finish(self, failed=False):
+        total_ms = (time.perf_counter() - self.started) * 1000
+        observe(f"{self.name}.total_ms", total_ms)
+        for phase, seconds in self.phases.items():
+            if seconds:
+                observe(f"{self.name}.{phase}_ms", seconds * 1000)
+        observe(f"{self.name}.rows", self.rows, ROW_BUCKETS)
+        level = logging.WARNING if total_ms >= INSTRUMENTATION_CONFIG['slow_op_ms'] else logging.DEBUG
+        if timing_logger.isEnabledFor(level):
+            timing_logger.log(level, "%s%s took %.2f ms (connect %.2f, query %.2f, commit %.2f ms, %d rows)",
+                              self.name, " [failed]" if failed else "", total_ms, self.phases['connect'] * 1000,
+                              self.phases['query'] * 1000, self.phases['commit'] * 1000, self.rows)
+
+
+_local = threading.local()
+
+def current_operation():
+    """Returns the operation being timed on this thread, if any."""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+def _push(op):
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    _local.stack.append(op)
+
+def _pop():
+    _local.stack.pop()
+
+def record_phase(phase, seconds):
+    """Adds time to a phase of the current operation (no-op outside instrumented calls)."""
+    op = current_operation()
+    if op is not None:
+        op.add(phase, seconds)
+
+def record_rows(count):
+    op = current_operation()
+    if op is not None:
+        op.rows += count
+
+def instrumented(name):
+    """Decorator that times every call of a function (or every iteration of a generator)."""
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                # Only active while the generator runs, so the caller's own work between
+                # items is neither counted nor mixed up with this operation.
+                op = Operation(name)
+                generator = fn(*args, **kwargs)
+                failed = False
+                try:
+                    while True:
+                        _push(op)
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                        except Exception:
+                            failed = True
+                            raise
+                        finally:
+                            _pop()
+                        yield item
+                finally:
+                    generator.close()
+                    op.finish(failed)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            op = Operation(name)
+            _push(op)
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _pop()
+                op.finish(failed)
+        return wrapper
+    return decorator
+
+
+class InstrumentedCursor:
+    """Cursor proxy that adds execute/fetch time to 'query' and counts fetched rows."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            record_phase('query', time.perf_counter() - started)
+
+    def execute(self, *args):
+        return self._timed(self._cursor.execute, *args)
+
+    def executemany(self, *args):
+        return self._timed(self._cursor.executemany, *args)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            record_rows(1)
+        return row
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        record_rows(len(rows))
+        return rows
+
+    def fetchmany(self, size):
+        rows = self._timed(self._cursor.fetchmany, size)
+        record_rows(len(rows))
+        return rows
+
+
+class InstrumentedConnection:
+    """Connection proxy that times commits and hands out instrumented cursors."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            self._connection.commit()
+        finally:
+            record_phase('commit', time.perf_counter() - started)
@@ -0,0 +1,115 @@
+"""
+Command-line import/export of lectures as CSV or JSON Lines.
+
+    python lecture_io.py import timetable.csv
+    python lecture_io.py export backup.jsonl
+
+Imports go through bulk_add_lectures and exports through stream_lectures, so
+neither side holds the whole timetable in memory.
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+
+from instrumentation import configure_logging
+from lecture_manager import LECTURE_COLUMNS, bulk_add_lectures, stream_lectures
+from storage import Error
+
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+
+def detect_format(path, fmt=None):
+    """Returns 'csv' or 'jsonl' from an explicit format or the file extension."""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return 'csv'
+
+def parse_lecture(record):
+    """Converts a raw CSV/JSON record into a lecture dict with proper date/time types."""
+    sent = record.get('notification_sent', False)
+    if isinstance(sent, str):
+        sent = sent.strip().lower() in TRUE_VALUES
+    duration = record.get('duration_minutes')
+    return {
+        'course_name': record['course_name'],
+        'topic': record.get('topic') or None,
+        'lecture_date': datetime.date.fromisoformat(str(record['lecture_date'])),
+        'lecture_time': datetime.time.fromisoformat(str(record['lecture_time'])),
+        'notification_sent': bool(sent),
+        'duration_minutes': int(duration) if duration not in (None, '') else None,
+        'room': record.get('room') or None,
+        'instructor': record.get('instructor') or None,
+    }
+
+def read_lectures(handle, fmt):
+    """Yields lecture dicts from an open CSV or JSONL file."""
+    if fmt == 'csv':
+        records = csv.DictReader(handle)
+    else:
+        records = (json.loads(line) for line in handle if line.strip())
+    for record in records:
+        yield parse_lecture(record)
+
+def _format_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        # mysql.connector returns TIME columns as timedelta
+        return (datetime.datetime.min + value).time().isoformat()
+    return value
+
+def write_lectures(handle, fmt, lectures):
+    """Writes lecture dicts to an open file and returns how many were written."""
+    columns = ('id',) + LECTURE_COLUMNS
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(handle, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+    for lecture in lectures:
+        row = {column: _format_value(lecture.get(column)) for column in columns}
+        row['notification_sent'] = bool(row['notification_sent'])
+        if fmt == 'csv':
+            writer.writerow(row)
+        else:
+            handle.write(json.dumps(row) + '\n')
+        count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export UniLecture lectures.")
+    parser.add_argument('action', choices=('import', 'export'))
+    parser.add_argument('path', help="File to read from or write to ('-' for stdin/stdout)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Defaults to the file extension")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Rows per INSERT batch / fetch")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    fmt = detect_format(args.path, args.format)
+    if args.action == 'import':
+        handle = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8')
+        try:
+            count = bulk_add_lectures(read_lectures(handle, fmt), batch_size=args.batch_size, raise_errors=True)
+        except (Error, KeyError, TypeError, ValueError) as e:
+            print(f"Import from {args.path} failed: {e}", file=sys.stderr)
+            return 1
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+        print(f"Imported {count} lectures from {args.path}", file=sys.stderr)
+    else:
+        handle = sys.stdout if args.path == '-' else open(args.path, 'w', newline='', encoding='utf-8')
+        try:
+            count = write_lectures(handle, fmt, stream_lectures(fetch_size=args.batch_size))
+        finally:
+            if handle is not sys.stdout:
+                handle.close()
+        print(f"Exported {count} lectures to {args.path}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
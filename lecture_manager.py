@@ -1,150 +1,1202 @@
 import datetime
-from db_connector import create_connection, close_connection
-from mysql.connector import Error
+import heapq
+import itertools
+import logging
+from campus_time import campus_now, to_utc
+from instrumentation import configure_logging, instrumented
+from lecture_table import LectureTable
+from query_cache import QueryCache
+from storage import Error, get_connection
 
-def add_lecture(course_name, topic, lecture_date, lecture_time):
-    """Adds a new lecture record to the database."""
-    conn = create_connection()
-    if conn:
-        cursor = conn.cursor()
+logger = logging.getLogger(__name__)
+
+# Read-through cache for lecture queries, dropped on every write.
+CACHE_CONFIG = {
+    'max_entries': 256,            # LRU bound, mostly filtered/paginated queries
+    'ttl': 30,                     # Seconds a cached result may be served
+    'shared_invalidation': False,  # Also watch the cache_version row (migration 003) for writes by other processes
+    'version_check_interval': 2,   # Seconds between cache_version polls
+}
+
+# Reminders sent before each lecture, in minutes before its start. A course listed in
+# 'course_windows' uses its own windows instead, e.g. {'Thesis Seminar': (2880, 60)}.
+REMINDER_CONFIG = {
+    'windows': (1440, 60, 10),  # A day, an hour and ten minutes before
+    'course_windows': {},       # Course name -> windows
+}
+
+# Room and instructor double-booking checks (migration 008).
+CONFLICT_CONFIG = {
+    'default_duration': 90,  # Minutes assumed for lectures saved without a duration
+    'max_duration': 480,     # Longest allowed duration; bounds how far back a conflict query has to look
+}
+
+# Optional scheduling fields, in addition to the course/topic/date/time every lecture has.
+RESOURCE_COLUMNS = ('duration_minutes', 'room', 'instructor')
+CONFLICT_RESOURCES = ('room', 'instructor')
+
+# Query texts shared with schema_check.py, which EXPLAINs them to make sure they stay indexed.
+ALL_LECTURES_SQL = "SELECT id, course_name, topic, lecture_date, lecture_time, notification_sent FROM lectures ORDER BY lecture_date, lecture_time"
+
+# starts_at is the UTC start (migration 006); the range bounds come from due_window(), so the
+# query is a plain index range scan and works across midnight and in any server time zone.
+UPCOMING_LECTURES_SQL = """
+    SELECT id, course_name, topic, lecture_date, lecture_time
+    FROM lectures
+    WHERE notification_sent = FALSE
+    AND starts_at BETWEEN %s AND %s
+    ORDER BY starts_at ASC
+"""
+
+# Keyset-paginated listing; {where} is filled in by build_page_query.
+LECTURES_PAGE_SQL = """
+    SELECT id, course_name, topic, lecture_date, lecture_time, notification_sent
+    FROM lectures
+    {where}
+    ORDER BY lecture_date, lecture_time, id
+    LIMIT %s
+"""
+
+# Every column of a lecture, for single-row reads and exports (the list views leave out RESOURCE_COLUMNS).
+LECTURE_FIELDS = "id, course_name, topic, lecture_date, lecture_time, notification_sent, duration_minutes, room, instructor"
+
+PENDING_LECTURES_SQL = """
+    SELECT id, course_name, topic, lecture_date, lecture_time
+    FROM lectures
+    WHERE notification_sent = FALSE
+    AND starts_at BETWEEN %s AND %s
+    ORDER BY starts_at
+"""
+
+# Callbacks run after every successful write, e.g. to wake the notification scheduler.
+_change_listeners = []
+
+def add_change_listener(callback):
+    """Registers callback(action, lecture_id) to be called after add/update/delete writes."""
+    _change_listeners.append(callback)
+
+def remove_change_listener(callback):
+    """Unregisters a callback added with add_change_listener."""
+    if callback in _change_listeners:
+        _change_listeners.remove(callback)
+
+def _notify_change(action, lecture_id=None):
+    for callback in list(_change_listeners):
         try:
-            sql = "INSERT INTO lectures (course_name, topic, lecture_date, lecture_time) VALUES (%s, %s, %s, %s)"
-            val = (course_name, topic, lecture_date, lecture_time)
-            cursor.execute(sql, val)
-            conn.commit()
-            print(f"Lecture '{course_name}' on {lecture_date} at {lecture_time} added successfully.")
-            return True
-        except Error as e:
-            print(f"Error adding lecture: {e}")
-            return False
-        finally:
-            cursor.close()
-            close_connection(conn)
-    return False
+            callback(action, lecture_id)
+        except Exception as e:
+            logger.exception("Error in lecture change listener: %s", e)
 
-def get_all_lectures():
-    """Retrieves all lecture records from the database."""
-    conn = create_connection()
-    lectures = []
-    if conn:
-        cursor = conn.cursor(dictionary=True) # Returns rows as dictionaries
+def _fetch(sql, params=(), one=False):
+    """Runs a SELECT on a pooled connection and returns all rows (or the first) as dictionaries."""
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
         try:
-            sql = "SELECT id, course_name, topic, lecture_date, lecture_time, notification_sent FROM lectures ORDER BY lecture_date, lecture_time"
-            cursor.execute(sql)
-            lectures = cursor.fetchall()
-            print("All lectures retrieved successfully.")
-        except Error as e:
-            print(f"Error retrieving lectures: {e}")
+            cursor.execute(sql, params)
+            return cursor.fetchone() if one else cursor.fetchall()
         finally:
             cursor.close()
-            close_connection(conn)
-    return lectures
 
-def update_lecture(lecture_id, course_name, topic, lecture_date, lecture_time):
-    """Updates an existing lecture record in the database."""
-    conn = create_connection()
-    if conn:
+def _fetch_table(sql, params=(), fetch_size=1000):
+    """Runs a SELECT returning lecture_table.COLUMNS-ordered rows through a tuple cursor into a LectureTable."""
+    table = LectureTable()
+    with get_connection() as conn:
         cursor = conn.cursor()
         try:
-            sql = """UPDATE lectures SET course_name = %s, topic = %s, lecture_date = %s, lecture_time = %s
-                     WHERE id = %s"""
-            val = (course_name, topic, lecture_date, lecture_time, lecture_id)
-            cursor.execute(sql, val)
-            conn.commit()
-            if cursor.rowcount > 0:
-                print(f"Lecture with ID {lecture_id} updated successfully.")
-                return True
-            else:
-                print(f"No lecture found with ID {lecture_id} to update.")
-                return False
-        except Error as e:
-            print(f"Error updating lecture: {e}")
-            return False
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                table.extend(rows)
         finally:
             cursor.close()
-            close_connection(conn)
-    return False
+    return table
 
-def delete_lecture(lecture_id):
-    """Deletes a lecture record from the database."""
-    conn = create_connection()
-    if conn:
+def _read_cache_version():
+    # Read on every poll, like _commit_write reads it on every write, so the flag can be flipped at runtime
+    if not CACHE_CONFIG['shared_invalidation']:
+        return 0 # A constant version: never invalidates
+    row = _fetch("SELECT version FROM cache_version WHERE id = 1", one=True)
+    return row['version'] if row else None
+
+_lecture_cache = QueryCache(
+    max_entries=CACHE_CONFIG['max_entries'],
+    ttl=CACHE_CONFIG['ttl'],
+    version_source=_read_cache_version,
+    version_check_interval=CACHE_CONFIG['version_check_interval'],
+)
+
+def _log_changes(cursor, changes):
+    """
+    Appends (action, lecture_id) entries to lecture_changes in the caller's transaction.
+    Sequence numbers come from the single lecture_change_seq row, whose lock is held until
+    commit, so changes become visible in sequence order and a tailing client never skips one.
+    """
+    cursor.execute("UPDATE lecture_change_seq SET seq = seq + %s WHERE id = 1", (len(changes),))
+    cursor.execute("SELECT seq FROM lecture_change_seq WHERE id = 1")
+    first = cursor.fetchone()[0] - len(changes) + 1
+    changed_at = to_utc(campus_now())
+    cursor.executemany("INSERT INTO lecture_changes (seq, action, lecture_ref, changed_at) VALUES (%s, %s, %s, %s)",
+                       [(first + i, action, None if lecture_id is None else str(lecture_id), changed_at)
+                        for i, (action, lecture_id) in enumerate(changes)])
+
+def _commit_write(conn, changes=()):
+    """
+    Commits a write and invalidates cached reads (here and, if enabled, in other processes).
+    changes lists the (action, lecture_id) entries to record in the change feed; a lecture_id
+    of None means clients should reload everything.
+    """
+    changes = list(changes)
+    if changes or CACHE_CONFIG['shared_invalidation']:
+        # Separate cursor, so the caller's rowcount/lastrowid are left untouched
         cursor = conn.cursor()
         try:
-            sql = "DELETE FROM lectures WHERE id = %s"
-            val = (lecture_id,)
-            cursor.execute(sql, val)
-            conn.commit()
-            if cursor.rowcount > 0:
-                print(f"Lecture with ID {lecture_id} deleted successfully.")
-                return True
-            else:
-                print(f"No lecture found with ID {lecture_id} to delete.")
-                return False
-        except Error as e:
-            print(f"Error deleting lecture: {e}")
-            return False
+            if changes:
+                _log_changes(cursor, changes)
+            if CACHE_CONFIG['shared_invalidation']:
+                cursor.execute("UPDATE cache_version SET version = version + 1 WHERE id = 1")
         finally:
             cursor.close()
-            close_connection(conn)
-    return False
+    conn.commit()
+    _lecture_cache.invalidate()
+
+def cache_stats():
+    """Returns the lecture query cache's hit/miss counters."""
+    return _lecture_cache.stats()
+
+def clear_cache():
+    """Drops every cached lecture query result."""
+    _lecture_cache.invalidate()
+
+def lecture_start(lecture):
+    """Returns the start of a lecture row as a datetime (TIME columns may come back as timedelta)."""
+    lecture_time = lecture['lecture_time']
+    if isinstance(lecture_time, datetime.timedelta):
+        return datetime.datetime.combine(lecture['lecture_date'], datetime.time()) + lecture_time
+    return datetime.datetime.combine(lecture['lecture_date'], lecture_time)
 
+def starts_at(lecture_date, lecture_time):
+    """Returns the UTC start stored in lectures.starts_at for a campus-local date and time."""
+    return to_utc(lecture_start({'lecture_date': lecture_date, 'lecture_time': lecture_time}))
+
+def lecture_end(lecture):
+    """Returns the end of a lecture row: its start plus duration_minutes (or the default duration)."""
+    minutes = lecture.get('duration_minutes') or CONFLICT_CONFIG['default_duration']
+    return lecture_start(lecture) + datetime.timedelta(minutes=minutes)
+
+def _resource_fields(duration_minutes, room, instructor):
+    """Normalises the optional scheduling fields: blanks become None and durations are range-checked."""
+    duration = int(duration_minutes) if duration_minutes not in (None, '', 0) else None
+    if duration is not None and not 0 < duration <= CONFLICT_CONFIG['max_duration']:
+        raise ValueError(f"Duration must be between 1 and {CONFLICT_CONFIG['max_duration']} minutes, got {duration}.")
+    return duration, (room or '').strip() or None, (instructor or '').strip() or None
+
+def due_window(minutes_ahead, now=None):
+    """Returns the (from, to) UTC bounds of UPCOMING_LECTURES_SQL for the next minutes_ahead minutes."""
+    now = now or campus_now()
+    return to_utc(now), to_utc(now + datetime.timedelta(minutes=minutes_ahead))
+
+@instrumented('add_lecture')
+def add_lecture(course_name, topic, lecture_date, lecture_time, duration_minutes=None, room=None, instructor=None):
+    """
+    Adds a new lecture record to the database. Returns the new lecture's ID, or False on failure.
+    Room and instructor are not checked for double bookings here; call check_conflicts first.
+    """
+    try:
+        resources = _resource_fields(duration_minutes, room, instructor)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                sql = """INSERT INTO lectures (course_name, topic, lecture_date, lecture_time, starts_at,
+                                              duration_minutes, room, instructor)
+                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
+                val = (course_name, topic, lecture_date, lecture_time, starts_at(lecture_date, lecture_time)) + resources
+                cursor.execute(sql, val)
+                lecture_id = cursor.lastrowid
+                _commit_write(conn, [('add', lecture_id)])
+            finally:
+                cursor.close()
+        logger.debug("Lecture '%s' on %s at %s added successfully.", course_name, lecture_date, lecture_time)
+        _notify_change('add', lecture_id)
+        return lecture_id
+    except (Error, ValueError) as e:
+        logger.error("Error adding lecture: %s", e)
+        return False
+
+@instrumented('get_all_lectures')
+def get_all_lectures():
+    """
+    Retrieves all lecture records from the database (served from the cache when fresh).
+    Returns a compact LectureTable; its rows support the usual lecture['course_name'] access.
+    """
+    lectures = LectureTable()
+    try:
+        lectures = _lecture_cache.get_or_load(('all',), _fetch_table, ALL_LECTURES_SQL)
+        logger.debug("All lectures retrieved successfully.")
+    except Error as e:
+        logger.error("Error retrieving lectures: %s", e)
+    return lectures
+
+@instrumented('get_lecture')
+def get_lecture(lecture_id):
+    """
+    Retrieves a single lecture by ID, or None if it does not exist.
+    Occurrence IDs of a series (see occurrence_id) return the expanded occurrence.
+    """
+    if parse_occurrence_id(lecture_id) is not None:
+        return get_occurrence(lecture_id)
+    lecture = None
+    try:
+        sql = f"SELECT {LECTURE_FIELDS} FROM lectures WHERE id = %s"
+        lecture = _lecture_cache.get_or_load(('lecture', int(lecture_id)), _fetch, sql, (lecture_id,), True)
+    except Error as e:
+        logger.error("Error retrieving lecture: %s", e)
+    return lecture
+
+def lecture_key(lecture):
+    """
+    Returns the keyset pagination key (date, time, kind, id) of a lecture row or series occurrence.
+    kind is 0 for lectures and 1 for occurrences, so at the same date and time lectures sort first
+    and IDs are only ever compared with IDs of the same type.
+    """
+    kind = 1 if 'series_id' in lecture else 0
+    return (lecture['lecture_date'], lecture['lecture_time'], kind, lecture['id'])
+
+def build_page_query(after=None, limit=200, start_date=None, end_date=None, course_name=None):
+    """Builds the SQL and parameters for one page of lectures, with filters pushed into WHERE."""
+    conditions = []
+    params = []
+    if after is not None:
+        after_date, after_time, after_kind, after_id = after
+        if after_kind == 0:
+            conditions.append("(lecture_date, lecture_time, id) > (%s, %s, %s)")
+            params.extend((after_date, after_time, after_id))
+        else:
+            # After an occurrence, only lectures at a later date/time remain
+            conditions.append("(lecture_date, lecture_time) > (%s, %s)")
+            params.extend((after_date, after_time))
+    if start_date is not None:
+        conditions.append("lecture_date >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("lecture_date <= %s")
+        params.append(end_date)
+    if course_name:
+        conditions.append("course_name LIKE %s")
+        params.append(f"%{course_name}%")
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    params.append(limit)
+    return LECTURES_PAGE_SQL.format(where=where), tuple(params)
+
+@instrumented('get_lectures_page')
+def get_lectures_page(after=None, limit=200, start_date=None, end_date=None, course_name=None, raise_errors=False):
+    """
+    Retrieves up to 'limit' lectures ordered by date, time and id, starting after the
+    key returned by lecture_key() for the last row of the previous page (None for the first page).
+    Optional date range and course name filters are applied in SQL.
+    Series occurrences are expanded for the page's date range only and merged in.
+    With raise_errors, a database error is raised instead of returning an empty list.
+    """
+    lectures = []
+    sql, params = build_page_query(after, limit, start_date, end_date, course_name)
+    try:
+        lectures = _lecture_cache.get_or_load(('page', params), _load_page, sql, params, after, limit,
+                                              start_date, end_date, course_name)
+    except Error as e:
+        logger.error("Error retrieving lecture page: %s", e)
+        if raise_errors:
+            raise
+    return lectures
+
+def _load_page(sql, params, after, limit, start_date, end_date, course_name):
+    lectures = _fetch(sql, params)
+    window_start = start_date
+    if after is not None and (window_start is None or after[0] > window_start):
+        window_start = after[0]
+    # A full page of lectures bounds the dates any occurrence on this page can have
+    window_end = lectures[-1]['lecture_date'] if len(lectures) == limit else end_date
+    occurrences = _occurrences_in_window(window_start, window_end, course_name)
+    if after is not None:
+        occurrences = (occ for occ in occurrences if lecture_key(occ) > after)
+    return list(itertools.islice(heapq.merge(lectures, occurrences, key=lecture_key), limit))
+
+@instrumented('update_lecture')
+def update_lecture(lecture_id, course_name, topic, lecture_date, lecture_time, duration_minutes=None, room=None,
+                   instructor=None):
+    """
+    Updates an existing lecture record in the database.
+    duration_minutes, room and instructor are only changed when given; pass '' (or 0) to clear one.
+    Moving the lecture to another time clears its sent reminders, so it is reminded again.
+    """
+    try:
+        given = (duration_minutes, room, instructor)
+        resources = [(column, value) for column, value, raw in
+                     zip(RESOURCE_COLUMNS, _resource_fields(*given), given) if raw is not None]
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                new_start = starts_at(lecture_date, lecture_time)
+                # Both statements compare against the old starts_at: MySQL applies SET assignments left
+                # to right, so notification_sent has to be reset before starts_at is overwritten
+                cursor.execute("DELETE FROM lecture_reminders WHERE lecture_ref = %s AND EXISTS "
+                               "(SELECT 1 FROM lectures WHERE id = %s AND starts_at <> %s)",
+                               (str(lecture_id), lecture_id, new_start))
+                assignments = "".join(f", {column} = %s" for column, _ in resources)
+                sql = f"""UPDATE lectures SET notification_sent = CASE WHEN starts_at = %s THEN notification_sent
+                          ELSE FALSE END, course_name = %s, topic = %s, lecture_date = %s, lecture_time = %s,
+                          starts_at = %s{assignments} WHERE id = %s"""
+                val = ((new_start, course_name, topic, lecture_date, lecture_time, new_start)
+                       + tuple(value for _, value in resources) + (lecture_id,))
+                cursor.execute(sql, val)
+                updated = cursor.rowcount > 0
+                _commit_write(conn, [('update', lecture_id)] if updated else ())
+            finally:
+                cursor.close()
+    except (Error, ValueError) as e:
+        logger.error("Error updating lecture: %s", e)
+        return False
+    if updated:
+        logger.debug("Lecture with ID %s updated successfully.", lecture_id)
+        _notify_change('update', lecture_id)
+    else:
+        logger.info("No lecture found with ID %s to update.", lecture_id)
+    return updated
+
+@instrumented('delete_lecture')
+def delete_lecture(lecture_id):
+    """Deletes a lecture record from the database."""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                sql = "DELETE FROM lectures WHERE id = %s"
+                val = (lecture_id,)
+                cursor.execute(sql, val)
+                deleted = cursor.rowcount > 0
+                _commit_write(conn, [('delete', lecture_id)] if deleted else ())
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error deleting lecture: %s", e)
+        return False
+    if deleted:
+        logger.debug("Lecture with ID %s deleted successfully.", lecture_id)
+        _notify_change('delete', lecture_id)
+    else:
+        logger.info("No lecture found with ID %s to delete.", lecture_id)
+    return deleted
+
+@instrumented('mark_notification_sent')
 def mark_notification_sent(lecture_id):
     """Marks a lecture's notification_sent status as True."""
-    conn = create_connection()
-    if conn:
-        cursor = conn.cursor()
-        try:
-            sql = "UPDATE lectures SET notification_sent = TRUE WHERE id = %s"
-            val = (lecture_id,)
-            cursor.execute(sql, val)
-            conn.commit()
-            if cursor.rowcount > 0:
-                print(f"Notification sent for lecture ID {lecture_id}.")
-                return True
-            else:
-                print(f"Could not mark notification sent for lecture ID {lecture_id}.")
-                return False
-        except Error as e:
-            print(f"Error marking notification sent: {e}")
-            return False
-        finally:
-            cursor.close()
-            close_connection(conn)
-    return False
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                sql = "UPDATE lectures SET notification_sent = TRUE WHERE id = %s"
+                val = (lecture_id,)
+                cursor.execute(sql, val)
+                marked = cursor.rowcount > 0
+                _commit_write(conn, [('notified', lecture_id)] if marked else ())
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error marking notification sent: %s", e)
+        return False
+    if marked:
+        logger.debug("Notification sent for lecture ID %s.", lecture_id)
+    else:
+        logger.info("Could not mark notification sent for lecture ID %s.", lecture_id)
+    return marked
 
+@instrumented('get_upcoming_lectures')
 def get_upcoming_lectures(minutes_ahead=15):
     """
     Retrieves lectures that are scheduled to start within the next 'minutes_ahead' minutes,
     and for which a notification has not yet been sent.
     """
-    conn = create_connection()
     upcoming_lectures = []
-    if conn:
-        cursor = conn.cursor(dictionary=True)
+    try:
+        # The result depends on the clock, so it is cached per minute at most
+        minute = campus_now().replace(second=0, microsecond=0)
+        upcoming_lectures = _lecture_cache.get_or_load(('upcoming', minutes_ahead, minute), _load_upcoming,
+                                                       minutes_ahead)
+    except Error as e:
+        logger.error("Error retrieving upcoming lectures: %s", e)
+    return upcoming_lectures
+
+def _due_occurrences(minutes_ahead):
+    """Un-notified occurrences starting within minutes_ahead, the same window as UPCOMING_LECTURES_SQL."""
+    now = campus_now()
+    until = now + datetime.timedelta(minutes=minutes_ahead)
+    return [occ for occ in _occurrences_in_window(now.date(), until.date())
+            if not occ['notification_sent'] and now <= lecture_start(occ) <= until]
+
+def _load_upcoming(minutes_ahead):
+    lectures = _fetch(UPCOMING_LECTURES_SQL, due_window(minutes_ahead))
+    return list(heapq.merge(lectures, _due_occurrences(minutes_ahead), key=lecture_key))
+
+@instrumented('mark_notifications_sent')
+def mark_notifications_sent(lecture_ids):
+    """Marks several lectures as notified with a single UPDATE. Returns the number of rows changed."""
+    lecture_ids = list(lecture_ids)
+    if not lecture_ids:
+        return 0
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                placeholders = ", ".join(["%s"] * len(lecture_ids))
+                sql = f"UPDATE lectures SET notification_sent = TRUE WHERE id IN ({placeholders})"
+                cursor.execute(sql, tuple(lecture_ids))
+                marked = cursor.rowcount
+                _commit_write(conn, [('notified', lecture_id) for lecture_id in lecture_ids] if marked else ())
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error marking notifications sent: %s", e)
+        return 0
+    return marked
+
+def _claim(select_sql, params):
+    """
+    Runs a locking SELECT and marks every returned lecture as notified in the same transaction.
+    If anything fails, the connection rolls the transaction back when it is returned.
+    """
+    claimed = []
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                conn.start_transaction()
+                cursor.execute(select_sql + "FOR UPDATE SKIP LOCKED", params)
+                claimed = cursor.fetchall()
+                if claimed:
+                    placeholders = ", ".join(["%s"] * len(claimed))
+                    cursor.execute(f"UPDATE lectures SET notification_sent = TRUE WHERE id IN ({placeholders})",
+                                   tuple(lec['id'] for lec in claimed))
+                    _commit_write(conn, [('notified', lec['id']) for lec in claimed])
+                else:
+                    conn.commit()
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error claiming due lectures: %s", e)
+        return []
+    return claimed
+
+@instrumented('claim_due_lectures')
+def claim_due_lectures(minutes_ahead=15):
+    """
+    Atomically claims upcoming lectures and marks them as notified in one transaction.
+    Rows are locked with FOR UPDATE SKIP LOCKED, so several notifier processes can run
+    against the same database without sending the same reminder twice.
+    Returns the claimed lectures (same shape as get_upcoming_lectures), including series occurrences.
+    """
+    claimed = _claim(UPCOMING_LECTURES_SQL, due_window(minutes_ahead))
+    try:
+        due = [occ['id'] for occ in _due_occurrences(minutes_ahead)]
+    except Error as e:
+        logger.error("Error retrieving due series occurrences: %s", e)
+        due = []
+    return claimed + _claim_occurrences(due)
+
+@instrumented('claim_lectures')
+def claim_lectures(lecture_ids):
+    """
+    Claims the given lectures (or series occurrences) if they have not been notified yet.
+    Returns the claimed rows.
+    """
+    lecture_ids = list(lecture_ids)
+    occurrence_ids = [lecture_id for lecture_id in lecture_ids if parse_occurrence_id(lecture_id) is not None]
+    lecture_ids = [lecture_id for lecture_id in lecture_ids if parse_occurrence_id(lecture_id) is None]
+    claimed = _claim_occurrences(occurrence_ids)
+    if not lecture_ids:
+        return claimed
+    placeholders = ", ".join(["%s"] * len(lecture_ids))
+    sql = f"""
+        SELECT id, course_name, topic, lecture_date, lecture_time
+        FROM lectures
+        WHERE id IN ({placeholders}) AND notification_sent = FALSE
+    """
+    return _claim(sql, tuple(lecture_ids)) + claimed
+
+@instrumented('get_pending_lectures')
+def get_pending_lectures(until, raise_errors=False):
+    """
+    Retrieves lectures starting between now and 'until' (a datetime) that have not been
+    notified yet, ordered by start time. Used to fill the notification scheduler.
+    With raise_errors, a database error is raised instead of returning an empty list.
+    """
+    pending = []
+    now = campus_now()
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(PENDING_LECTURES_SQL, (to_utc(now), to_utc(until)))
+                pending = cursor.fetchall()
+            finally:
+                cursor.close()
+        pending += [occ for occ in _occurrences_in_window(now.date(), until.date())
+                    if not occ['notification_sent'] and now <= lecture_start(occ) <= until]
+        pending.sort(key=lecture_start)
+    except Error as e:
+        logger.error("Error retrieving pending lectures: %s", e)
+        if raise_errors:
+            raise
+    return pending
+
+# --- Recurring lecture series ---
+# A series is stored once and its weekly occurrences are expanded lazily for the requested
+# window. series_occurrences only holds occurrences that were notified, cancelled or overridden.
+
+SERIES_SQL = """
+    SELECT id, course_name, topic, weekday, lecture_time, start_date, end_date, interval_weeks
+    FROM lecture_series
+"""
+
+OVERRIDES_SQL = """
+    SELECT series_id, occurrence_date, cancelled, topic, lecture_time, notification_sent
+    FROM series_occurrences
+"""
+
+def occurrence_id(series_id, occurrence_date):
+    """Returns the ID of one occurrence of a series, e.g. 'S12:2025-09-01'."""
+    return f"S{series_id}:{occurrence_date.isoformat()}"
+
+def parse_occurrence_id(value):
+    """Returns (series_id, occurrence_date) for an occurrence ID, or None for a plain lecture ID."""
+    if isinstance(value, str) and value.startswith('S') and ':' in value:
+        series_part, date_part = value[1:].split(':', 1)
+        return int(series_part), datetime.date.fromisoformat(date_part)
+    return None
+
+def _first_occurrence(series):
+    offset = (series['weekday'] - series['start_date'].weekday()) % 7
+    return series['start_date'] + datetime.timedelta(days=offset)
+
+def _is_occurrence_date(series, day):
+    first = _first_occurrence(series)
+    return (first <= day <= series['end_date']
+            and (day - first).days % (7 * series['interval_weeks']) == 0)
+
+def _occurrence(series, day, override=None):
+    topic = series['topic']
+    lecture_time = series['lecture_time']
+    if override:
+        if override['topic'] is not None:
+            topic = override['topic']
+        if override['lecture_time'] is not None:
+            lecture_time = override['lecture_time']
+    return {
+        'id': occurrence_id(series['id'], day),
+        'series_id': series['id'],
+        'course_name': series['course_name'],
+        'topic': topic,
+        'lecture_date': day,
+        'lecture_time': lecture_time,
+        'notification_sent': bool(override and override['notification_sent']),
+        'cancelled': bool(override and override['cancelled']),
+    }
+
+def expand_series(series, start_date=None, end_date=None, overrides=None, include_cancelled=False):
+    """
+    Lazily yields the occurrences of one series row between start_date and end_date (inclusive,
+    None for unbounded). overrides maps (series_id, date) to series_occurrences rows.
+    """
+    overrides = overrides or {}
+    step = datetime.timedelta(weeks=series['interval_weeks'])
+    current = _first_occurrence(series)
+    if start_date is not None and start_date > current:
+        current += step * -(-(start_date - current).days // step.days) # Round up to the next occurrence
+    last = series['end_date'] if end_date is None else min(series['end_date'], end_date)
+    while current <= last:
+        override = overrides.get((series['id'], current))
+        if include_cancelled or not (override and override['cancelled']):
+            yield _occurrence(series, current, override)
+        current += step
+
+def _occurrences_in_window(start_date=None, end_date=None, course_name=None, include_cancelled=False):
+    """
+    Loads the series overlapping the window and their overrides, then yields the expanded
+    occurrences of all of them in lecture_key order. Raises Error if the queries fail.
+    """
+    low = start_date or datetime.date.min
+    high = end_date or datetime.date.max
+    sql = SERIES_SQL + " WHERE start_date <= %s AND end_date >= %s"
+    params = [high, low]
+    if course_name:
+        sql += " AND course_name LIKE %s"
+        params.append(f"%{course_name}%")
+    series_rows = _lecture_cache.get_or_load(('series', tuple(params)), _fetch, sql, tuple(params))
+    if not series_rows:
+        return iter(())
+    override_rows = _lecture_cache.get_or_load(('overrides', low, high), _fetch,
+                                               OVERRIDES_SQL + " WHERE occurrence_date BETWEEN %s AND %s",
+                                               (low, high))
+    overrides = {(row['series_id'], row['occurrence_date']): row for row in override_rows}
+    return heapq.merge(*(expand_series(series, start_date, end_date, overrides, include_cancelled)
+                         for series in series_rows), key=lecture_key)
+
+def iter_occurrences(start_date=None, end_date=None, course_name=None, include_cancelled=False):
+    """
+    Lazily yields the expanded occurrences of every series between start_date and end_date,
+    ordered like the lecture list. Only the requested window is ever expanded.
+    """
+    try:
+        occurrences = _occurrences_in_window(start_date, end_date, course_name, include_cancelled)
+    except Error as e:
+        logger.error("Error retrieving lecture series: %s", e)
+        return
+    yield from occurrences
+
+def _check_series(weekday, start_date, end_date, interval_weeks):
+    """Rejects series rows that expand_series could not step through."""
+    if weekday not in range(7):
+        raise ValueError(f"Weekday must be between 0 (Monday) and 6 (Sunday), got {weekday}.")
+    if interval_weeks < 1:
+        raise ValueError(f"Interval must be at least 1 week, got {interval_weeks}.")
+    if end_date < start_date:
+        raise ValueError(f"Series ends ({end_date}) before it starts ({start_date}).")
+
+@instrumented('add_series')
+def add_series(course_name, topic, weekday, lecture_time, start_date, end_date, interval_weeks=1):
+    """
+    Adds a recurring lecture on 'weekday' (0 = Monday) every 'interval_weeks' weeks between
+    start_date and end_date. Returns the new series ID, or False on failure.
+    """
+    try:
+        _check_series(weekday, start_date, end_date, interval_weeks)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                sql = """INSERT INTO lecture_series (course_name, topic, weekday, lecture_time, start_date, end_date, interval_weeks)
+                         VALUES (%s, %s, %s, %s, %s, %s, %s)"""
+                cursor.execute(sql, (course_name, topic, weekday, lecture_time, start_date, end_date, interval_weeks))
+                series_id = cursor.lastrowid
+                _commit_write(conn, [('series_add', None)])
+            finally:
+                cursor.close()
+    except (Error, ValueError) as e:
+        logger.error("Error adding lecture series: %s", e)
+        return False
+    logger.debug("Lecture series '%s' added with ID %s.", course_name, series_id)
+    _notify_change('series_add', series_id)
+    return series_id
+
+@instrumented('get_all_series')
+def get_all_series():
+    """Retrieves every lecture series (not expanded)."""
+    series = []
+    try:
+        series = _lecture_cache.get_or_load(('all_series',), _fetch, SERIES_SQL + " ORDER BY start_date, id")
+    except Error as e:
+        logger.error("Error retrieving lecture series: %s", e)
+    return series
+
+@instrumented('delete_series')
+def delete_series(series_id):
+    """Deletes a series together with its stored occurrence state."""
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("DELETE FROM series_occurrences WHERE series_id = %s", (series_id,))
+                cursor.execute("DELETE FROM lecture_series WHERE id = %s", (series_id,))
+                deleted = cursor.rowcount > 0
+                _commit_write(conn, [('series_delete', None)] if deleted else ())
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error deleting lecture series: %s", e)
+        return False
+    if deleted:
+        _notify_change('series_delete', series_id)
+    else:
+        logger.info("No lecture series found with ID %s to delete.", series_id)
+    return deleted
+
+def _load_occurrences(occurrence_ids, include_cancelled=False):
+    """Returns {occurrence ID: occurrence} for the valid IDs among occurrence_ids."""
+    keys = [parse_occurrence_id(oid) for oid in occurrence_ids]
+    series_ids = sorted({series_id for series_id, _ in keys})
+    if not series_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(series_ids))
+    series_by_id = {row['id']: row for row in _fetch(SERIES_SQL + f" WHERE id IN ({placeholders})", tuple(series_ids))}
+    override_rows = _fetch(OVERRIDES_SQL + f" WHERE series_id IN ({placeholders})", tuple(series_ids))
+    overrides = {(row['series_id'], row['occurrence_date']): row for row in override_rows}
+    occurrences = {}
+    for series_id, day in keys:
+        series = series_by_id.get(series_id)
+        if series is None or not _is_occurrence_date(series, day):
+            continue
+        occ = _occurrence(series, day, overrides.get((series_id, day)))
+        if include_cancelled or not occ['cancelled']:
+            occurrences[occ['id']] = occ
+    return occurrences
+
+@instrumented('get_occurrence')
+def get_occurrence(occ_id):
+    """Retrieves one expanded occurrence by ID, or None if it does not exist or was cancelled."""
+    try:
+        return _lecture_cache.get_or_load(('occurrence', occ_id),
+                                          lambda: _load_occurrences([occ_id]).get(occ_id))
+    except Error as e:
+        logger.error("Error retrieving series occurrence: %s", e)
+        return None
+
+def _set_occurrence_state(occ_id, action, **fields):
+    series_id, day = parse_occurrence_id(occ_id)
+    columns = list(fields)
+    with get_connection() as conn:
+        cursor = conn.cursor()
         try:
-            now = datetime.datetime.now()
-            # Calculate the time window for upcoming lectures
-            # We need to consider both date and time for comparison
-            # SQL query will check if lecture_date is today and lecture_time is within the window
-            sql = """
-                SELECT id, course_name, topic, lecture_date, lecture_time
-                FROM lectures
-                WHERE lecture_date = CURDATE()
-                AND lecture_time BETWEEN CURTIME() AND ADDTIME(CURTIME(), SEC_TO_TIME(%s * 60))
-                AND notification_sent = FALSE
-                ORDER BY lecture_time ASC
-            """
-            cursor.execute(sql, (minutes_ahead,))
-            upcoming_lectures = cursor.fetchall()
-        except Error as e:
-            print(f"Error retrieving upcoming lectures: {e}")
+            # Create the state row on first use, then set the requested fields
+            cursor.execute("INSERT IGNORE INTO series_occurrences (series_id, occurrence_date) VALUES (%s, %s)",
+                           (series_id, day))
+            assignments = ", ".join(f"{column} = %s" for column in columns)
+            cursor.execute(f"UPDATE series_occurrences SET {assignments} WHERE series_id = %s AND occurrence_date = %s",
+                           tuple(fields[column] for column in columns) + (series_id, day))
+            _commit_write(conn, [(action, occ_id)])
         finally:
             cursor.close()
-            close_connection(conn)
-    return upcoming_lectures
+
+@instrumented('cancel_occurrence')
+def cancel_occurrence(occ_id):
+    """Cancels a single occurrence of a series (an exception date)."""
+    try:
+        _set_occurrence_state(occ_id, 'occurrence_cancel', cancelled=True)
+    except Error as e:
+        logger.error("Error cancelling series occurrence: %s", e)
+        return False
+    _notify_change('occurrence_cancel', occ_id)
+    return True
+
+@instrumented('override_occurrence')
+def override_occurrence(occ_id, topic=None, lecture_time=None):
+    """Changes the topic and/or time of a single occurrence without touching the rest of the series."""
+    fields = {}
+    if topic is not None:
+        fields['topic'] = topic
+    if lecture_time is not None:
+        fields['lecture_time'] = lecture_time
+    if not fields:
+        return True
+    try:
+        _set_occurrence_state(occ_id, 'occurrence_override', **fields)
+    except Error as e:
+        logger.error("Error overriding series occurrence: %s", e)
+        return False
+    _notify_change('occurrence_override', occ_id)
+    return True
+
+def _claim_occurrences(occurrence_ids):
+    """
+    Marks occurrences as notified unless someone else already did, and returns the ones this
+    caller won. Each occurrence is claimed with a conditional UPDATE or an INSERT IGNORE of its
+    state row, so concurrent notifiers never both win the same occurrence.
+    """
+    if not occurrence_ids:
+        return []
+    won = []
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                for occ_id in occurrence_ids:
+                    series_id, day = parse_occurrence_id(occ_id)
+                    cursor.execute("""UPDATE series_occurrences SET notification_sent = TRUE
+                                      WHERE series_id = %s AND occurrence_date = %s
+                                      AND notification_sent = FALSE AND cancelled = FALSE""", (series_id, day))
+                    if cursor.rowcount == 0:
+                        cursor.execute("""INSERT IGNORE INTO series_occurrences (series_id, occurrence_date, notification_sent)
+                                          VALUES (%s, %s, TRUE)""", (series_id, day))
+                    if cursor.rowcount > 0:
+                        won.append(occ_id)
+                _commit_write(conn, [('notified', occ_id) for occ_id in won])
+            finally:
+                cursor.close()
+        occurrences = _load_occurrences(won)
+    except Error as e:
+        logger.error("Error claiming series occurrences: %s", e)
+        return []
+    return [occurrences[occ_id] for occ_id in won if occ_id in occurrences]
+
+# --- Multi-window reminders ---
+# Every (lecture, window) reminder that was sent is recorded in lecture_reminders, keyed by
+# the lecture's ID as text so series occurrences fit too. notification_sent still means
+# "the last reminder went out", which keeps the due index and the Notified column meaningful.
+
+def reminder_windows(course_name, default=None):
+    """Returns the reminder windows (minutes before start) for a course, largest first."""
+    windows = REMINDER_CONFIG['course_windows'].get(course_name)
+    if windows is None:
+        windows = default if default is not None else REMINDER_CONFIG['windows']
+    return tuple(sorted(set(windows), reverse=True))
+
+def _max_window(default=None):
+    windows = list(default if default is not None else REMINDER_CONFIG['windows'])
+    for course_windows in REMINDER_CONFIG['course_windows'].values():
+        windows.extend(course_windows)
+    return datetime.timedelta(minutes=max(windows, default=0))
+
+@instrumented('get_pending_reminders')
+def get_pending_reminders(until, windows=None, raise_errors=False):
+    """
+    Returns (fire_at, window_minutes, lecture) for every reminder not sent yet whose time is at or
+    before 'until', ordered by fire_at. windows replaces REMINDER_CONFIG['windows'] as the default.
+
+    All windows are worked out in one pass over one query for the lectures and one for the
+    reminders already sent. Reminders whose time passed while no notifier was running are caught
+    up as long as the lecture has not started: only the most recent missed window is returned
+    (to fire now) and claiming it retires the older ones.
+
+    With raise_errors, database errors are raised instead of returning an empty list, so the
+    scheduler can tell a failed load from "nothing due" and retry.
+    """
+    now = campus_now()
+    max_window = _max_window(windows)
+    lectures = get_pending_lectures(until + max_window, raise_errors)
+    if not lectures:
+        return []
+    try:
+        # Reminders for lectures that have not started cannot have been sent before now - max_window.
+        # sent_at is UTC like starts_at, so the bound does not shift when DST starts or ends.
+        sent = {(row['lecture_ref'], row['window_minutes'])
+                for row in _fetch("SELECT lecture_ref, window_minutes FROM lecture_reminders WHERE sent_at >= %s",
+                                  (to_utc(now) - max_window,))}
+    except Error as e:
+        logger.error("Error retrieving sent reminders: %s", e)
+        if raise_errors:
+            raise
+        return []
+    reminders = []
+    for lec in lectures:
+        start = lecture_start(lec)
+        ref = str(lec['id'])
+        missed = None
+        for window in reminder_windows(lec['course_name'], windows):
+            if (ref, window) in sent:
+                continue
+            fire_at = start - datetime.timedelta(minutes=window)
+            if fire_at <= now:
+                missed = window # Windows are largest first, so this ends on the latest missed one
+            elif fire_at <= until:
+                reminders.append((fire_at, window, lec))
+        if missed is not None:
+            reminders.append((now, missed, lec))
+    reminders.sort(key=lambda reminder: (reminder[0], lecture_key(reminder[2])))
+    return reminders
+
+@instrumented('claim_reminders')
+def claim_reminders(reminders, windows=None, raise_errors=False):
+    """
+    Claims (window_minutes, lecture) reminders so that each is sent by exactly one notifier.
+    windows must match the default passed to get_pending_reminders.
+    Claiming a window also retires the lecture's larger windows, and claiming its smallest window
+    sets notification_sent. Returns the won reminders as lecture dicts carrying 'reminder_minutes'.
+    With raise_errors, a database error is raised instead of returning an empty list.
+    """
+    if not reminders:
+        return []
+    sent_at = to_utc(campus_now())
+    won = []
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                for window, lec in reminders:
+                    ref = str(lec['id'])
+                    cursor.execute("INSERT IGNORE INTO lecture_reminders (lecture_ref, window_minutes, sent_at) "
+                                   "VALUES (%s, %s, %s)", (ref, window, sent_at))
+                    if cursor.rowcount <= 0:
+                        continue # Another notifier sent it
+                    lecture_windows = reminder_windows(lec['course_name'], windows)
+                    retired = [(ref, larger, sent_at) for larger in lecture_windows if larger > window]
+                    if retired:
+                        cursor.executemany("INSERT IGNORE INTO lecture_reminders (lecture_ref, window_minutes, sent_at) "
+                                           "VALUES (%s, %s, %s)", retired)
+                    final = window <= min(lecture_windows, default=window)
+                    if final:
+                        occurrence = parse_occurrence_id(lec['id'])
+                        if occurrence is None:
+                            cursor.execute("UPDATE lectures SET notification_sent = TRUE WHERE id = %s", (lec['id'],))
+                        else:
+                            cursor.execute("INSERT IGNORE INTO series_occurrences (series_id, occurrence_date) "
+                                           "VALUES (%s, %s)", occurrence)
+                            cursor.execute("UPDATE series_occurrences SET notification_sent = TRUE "
+                                           "WHERE series_id = %s AND occurrence_date = %s", occurrence)
+                    won.append(dict(lec, reminder_minutes=window, notification_sent=final))
+                _commit_write(conn, [('notified', lec['id']) for lec in won if lec['notification_sent']])
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error claiming reminders: %s", e)
+        if raise_errors:
+            raise
+        return []
+    return won
+
+# --- Change feed ---
+# lecture_changes is an append-only log written in the same transaction as every write above.
+# A client remembers the last seq it has seen and tails newer entries with fetch_changes()
+# to patch its own state instead of reloading everything.
+
+CHANGES_SQL = """
+    SELECT seq, action, lecture_ref, changed_at
+    FROM lecture_changes
+    WHERE seq > %s
+    ORDER BY seq
+    LIMIT %s
+"""
+
+def _change_row(row):
+    ref = row['lecture_ref']
+    if ref is not None and parse_occurrence_id(ref) is None:
+        ref = int(ref)
+    return {'seq': row['seq'], 'action': row['action'], 'lecture_id': ref, 'changed_at': row['changed_at']}
+
+@instrumented('fetch_changes')
+def fetch_changes(since_seq=0, limit=1000):
+    """
+    Returns up to 'limit' changes with a sequence number above since_seq, oldest first, as dicts
+    with seq, action, lecture_id and changed_at (UTC). A lecture_id of None means the change
+    touched many rows (bulk imports, series) and the client should reload its list.
+    """
+    try:
+        changes = [_change_row(row) for row in _fetch(CHANGES_SQL, (since_seq, limit))]
+    except Error as e:
+        logger.error("Error fetching lecture changes: %s", e)
+        return []
+    if changes:
+        # Changes made by other processes never cleared this process' cache, and the caller is
+        # about to re-read the lectures they name
+        _lecture_cache.invalidate()
+    return changes
+
+@instrumented('latest_change_seq')
+def latest_change_seq(raise_errors=False):
+    """
+    Returns the sequence number of the newest change (0 for an empty feed). Read it before loading
+    a snapshot and then tail from there, so no change made while loading is missed.
+    Returns None if it cannot be read (or raises, with raise_errors): tailing from 0 instead
+    would replay the whole feed.
+    """
+    try:
+        row = _fetch("SELECT seq FROM lecture_change_seq WHERE id = 1", one=True)
+    except Error as e:
+        logger.error("Error reading the change sequence: %s", e)
+        if raise_errors:
+            raise
+        return None
+    return row['seq'] if row else 0
+
+@instrumented('prune_changes')
+def prune_changes(older_than):
+    """
+    Deletes changes recorded before older_than (a UTC datetime). Returns the number removed,
+    or None on a database error.
+    Nothing prunes automatically; schedule 'cli.py prune-changes' (e.g. daily from cron).
+    Clients that were offline for longer should reload instead of tailing.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("DELETE FROM lecture_changes WHERE changed_at < %s", (older_than,))
+                removed = cursor.rowcount
+                conn.commit()
+            finally:
+                cursor.close()
+    except Error as e:
+        logger.error("Error pruning lecture changes: %s", e)
+        return None
+    return removed
+
+# --- Conflicts ---
+# A lecture occupies its room and instructor from its start until lecture_end(). Two lectures
+# conflict when they share either and their intervals overlap. Lectures without a room or
+# instructor never conflict; series occurrences have neither and are not checked.
+
+# One index range scan on (room|instructor, starts_at) per resource: no lecture can start more
+# than max_duration before the new one and still overlap it, so only that window is read.
+CONFLICT_CANDIDATES_SQL = """
+    SELECT {fields}, starts_at
+    FROM lectures
+    WHERE {resource} = %s
+    AND starts_at > %s AND starts_at < %s
+    ORDER BY starts_at
+"""
+
+CONFLICT_SCAN_SQL = """
+    SELECT {fields}
+    FROM lectures
+    WHERE (room IS NOT NULL OR instructor IS NOT NULL)
+    {where}
+    ORDER BY starts_at
+"""
+
+@instrumented('check_conflicts')
+def check_conflicts(lecture_date, lecture_time, duration_minutes=None, room=None, instructor=None, exclude_id=None):
+    """
+    Returns the lectures that would be double-booked by a lecture at the given slot, as lecture
+    dicts with 'conflict' set to 'room' or 'instructor'. exclude_id skips the lecture being updated.
+    Each check reads O(log n + k) rows, so it is cheap enough to run before every write.
+    """
+    duration, room, instructor = _resource_fields(duration_minutes, room, instructor)
+    start = starts_at(lecture_date, lecture_time)
+    end = start + datetime.timedelta(minutes=duration or CONFLICT_CONFIG['default_duration'])
+    earliest = start - datetime.timedelta(minutes=CONFLICT_CONFIG['max_duration'])
+    conflicts = []
+    try:
+        for resource, value in zip(CONFLICT_RESOURCES, (room, instructor)):
+            if value is None:
+                continue
+            sql = CONFLICT_CANDIDATES_SQL.format(fields=LECTURE_FIELDS, resource=resource)
+            for lec in _fetch(sql, (value, earliest, end)):
+                other_end = lec['starts_at'] + datetime.timedelta(
+                    minutes=lec['duration_minutes'] or CONFLICT_CONFIG['default_duration'])
+                if other_end > start and lec['id'] != exclude_id:
+                    conflicts.append(dict(lec, conflict=resource))
+    except Error as e:
+        logger.error("Error checking lecture conflicts: %s", e)
+        return []
+    return conflicts
+
+def find_conflicts(lectures, resources=CONFLICT_RESOURCES):
+    """
+    Returns every pair of overlapping lectures sharing a room or instructor, as dicts with
+    resource, value, first and second (first starts no later than second).
+    A sweep over the lectures sorted by start per room/instructor, keeping a heap of the
+    intervals still open: O(n log n) plus the number of conflicts reported.
+    """
+    groups = {}
+    for lec in lectures:
+        for resource in resources:
+            value = lec.get(resource)
+            if value:
+                groups.setdefault((resource, value), []).append((lecture_start(lec), lecture_end(lec), lec))
+    conflicts = []
+    for (resource, value), intervals in groups.items():
+        intervals.sort(key=lambda interval: interval[0])
+        active = [] # (end, seq, lecture) of intervals that started earlier and may still be open
+        for seq, (start, end, lec) in enumerate(intervals):
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, _, other in active:
+                conflicts.append({'resource': resource, 'value': value, 'first': other, 'second': lec})
+            heapq.heappush(active, (end, seq, lec))
+    conflicts.sort(key=lambda conflict: (lecture_start(conflict['second']), conflict['resource']))
+    return conflicts
+
+@instrumented('conflict_report')
+def conflict_report(start_date=None, end_date=None):
+    """
+    Scans the lectures between start_date and end_date (e.g. one semester) and returns every
+    room or instructor double booking, as find_conflicts() does.
+    """
+    conditions = []
+    params = []
+    if start_date is not None:
+        conditions.append("AND lecture_date >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("AND lecture_date <= %s")
+        params.append(end_date)
+    sql = CONFLICT_SCAN_SQL.format(fields=LECTURE_FIELDS, where=" ".join(conditions))
+    try:
+        return find_conflicts(_fetch(sql, tuple(params)))
+    except Error as e:
+        logger.error("Error building the conflict report: %s", e)
+        return []
+
+LECTURE_COLUMNS = ('course_name', 'topic', 'lecture_date', 'lecture_time', 'notification_sent') + RESOURCE_COLUMNS
+
+def _lecture_row(lecture):
+    """Normalises a dict or tuple into an INSERT parameter tuple (LECTURE_COLUMNS plus starts_at)."""
+    if isinstance(lecture, dict):
+        course_name, topic = lecture['course_name'], lecture.get('topic')
+        lecture_date, lecture_time = lecture['lecture_date'], lecture['lecture_time']
+        notification_sent = bool(lecture.get('notification_sent', False))
+        resources = _resource_fields(*(lecture.get(column) for column in RESOURCE_COLUMNS))
+    else:
+        course_name, topic, lecture_date, lecture_time, *rest = lecture
+        notification_sent = bool(rest[0]) if rest else False
+        resources = _resource_fields(*(rest[1:] + [None] * 3)[:3])
+    return ((course_name, topic, lecture_date, lecture_time, notification_sent) + resources
+            + (starts_at(lecture_date, lecture_time),))
+
+@instrumented('bulk_add_lectures')
+def bulk_add_lectures(lectures, batch_size=1000, raise_errors=False):
+    """
+    Adds many lectures using batched multi-row INSERTs, one transaction per batch.
+    Accepts any iterable of dicts or (course_name, topic, date, time[, notification_sent, duration_minutes,
+    room, instructor]) tuples and returns the number of rows inserted. Stops at the first failing batch.
+    With raise_errors, that failure is raised after logging (earlier batches stay committed).
+    Imported rows are not checked for double bookings; run conflict_report afterwards.
+    """
+    sql = ("INSERT INTO lectures (course_name, topic, lecture_date, lecture_time, notification_sent, duration_minutes, "
+           "room, instructor, starts_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)")
+    inserted = 0
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                batch = []
+                for lecture in lectures:
+                    batch.append(_lecture_row(lecture))
+                    if len(batch) >= batch_size:
+                        cursor.executemany(sql, batch)
+                        _commit_write(conn, [('bulk_add', None)])
+                        inserted += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(sql, batch)
+                    _commit_write(conn, [('bulk_add', None)])
+                    inserted += len(batch)
+            finally:
+                cursor.close()
+        logger.debug("%s lectures added successfully.", inserted)
+    except (Error, KeyError, TypeError, ValueError) as e:
+        logger.error("Error adding lectures in bulk after %s rows: %s", inserted, e)
+        if raise_errors:
+            raise
+    finally:
+        if inserted:
+            _notify_change('bulk_add')
+    return inserted
+
+@instrumented('stream_lectures')
+def stream_lectures(fetch_size=1000):
+    """
+    Yields every lecture as a dictionary, ordered like get_all_lectures, without loading
+    the whole table into memory. Uses an unbuffered (server-side) cursor read in chunks.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            try:
+                cursor.execute(f"SELECT {LECTURE_FIELDS} FROM lectures ORDER BY lecture_date, lecture_time")
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                # An unbuffered cursor must be drained before the connection can be reused.
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
+    except Error as e:
+        logger.error("Error streaming lectures: %s", e)
 
 if __name__ == '__main__':
+    configure_logging('DEBUG') # Show every operation and its timings
     # --- Example Usage of CRUD operations ---
     # Add a lecture
     add_lecture("Physics I", "Newton's Laws", datetime.date(2025, 7, 26), datetime.time(9, 0, 0))
@@ -0,0 +1,155 @@
+"""
+Compact, column-oriented storage for large lecture lists.
+
+A list of dict rows costs one dict, one date and one time object per lecture. LectureTable
+keeps the same data in a few flat arrays instead:
+
+* ids and start times (seconds since 1970-01-01, local wall-clock time) in array('q'),
+* course names and topics as indexes into one interned string list (array('I')),
+* notification flags in a bytearray.
+
+Rows are read through LectureRow, a lightweight read-only Mapping, so existing code that does
+lecture['course_name'] keeps working. Dates, times and display strings are only built for the
+rows that are actually looked at.
+"""
+import datetime
+from array import array
+from collections.abc import Mapping, Sequence
+
+COLUMNS = ('id', 'course_name', 'topic', 'lecture_date', 'lecture_time', 'notification_sent')
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86400
+
+def to_seconds(lecture_date, lecture_time):
+    """Packs a date and a time (or the timedelta MySQL returns for TIME) into epoch seconds."""
+    if isinstance(lecture_time, datetime.timedelta):
+        seconds = int(lecture_time.total_seconds())
+    else:
+        seconds = lecture_time.hour * 3600 + lecture_time.minute * 60 + lecture_time.second
+    return (lecture_date.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY + seconds
+
+def from_seconds(value):
+    """Returns the (date, time) pair packed by to_seconds."""
+    days, seconds = divmod(value, SECONDS_PER_DAY)
+    return (datetime.date.fromordinal(EPOCH_ORDINAL + days),
+            datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60))
+
+def display_values(lecture):
+    """Formats any lecture mapping as the (ID, course, topic, date, time, notified) Treeview values."""
+    lecture_date = lecture['lecture_date']
+    lecture_time = lecture['lecture_time']
+    date_str = lecture_date.isoformat() if isinstance(lecture_date, datetime.date) else str(lecture_date)
+    time_str = lecture_time.strftime('%H:%M:%S') if isinstance(lecture_time, datetime.time) else str(lecture_time)
+    return (lecture['id'], lecture['course_name'], lecture['topic'], date_str, time_str,
+            "Yes" if lecture['notification_sent'] else "No")
+
+
+class LectureRow(Mapping):
+    """Read-only dict-style view of one row of a LectureTable."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column):
+        return self._table.value(self._index, column)
+
+    def __iter__(self):
+        return iter(COLUMNS)
+
+    def __len__(self):
+        return len(COLUMNS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def display_values(self):
+        return self._table.display_values(self._index)
+
+
+class LectureTable(Sequence):
+    """
+    Lecture rows stored column by column. Indexing and iteration yield LectureRow views;
+    rows are appended from tuple cursors in COLUMNS order.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.starts = array('q')
+        self.course_refs = array('I')
+        self.topic_refs = array('I')
+        self.notified = bytearray()
+        self.strings = [] # Interned course names and topics, referenced by index
+        self._string_index = {}
+
+    def _intern(self, text):
+        ref = self._string_index.get(text)
+        if ref is None:
+            ref = self._string_index[text] = len(self.strings)
+            self.strings.append(text)
+        return ref
+
+    def append(self, row):
+        """Appends one (id, course_name, topic, lecture_date, lecture_time, notification_sent) tuple."""
+        lecture_id, course_name, topic, lecture_date, lecture_time, notification_sent = row
+        self.ids.append(lecture_id)
+        self.starts.append(to_seconds(lecture_date, lecture_time))
+        self.course_refs.append(self._intern(course_name))
+        self.topic_refs.append(self._intern(topic))
+        self.notified.append(1 if notification_sent else 0)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    @classmethod
+    def from_rows(cls, rows):
+        table = cls()
+        table.extend(rows)
+        return table
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [LectureRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("lecture index out of range")
+        return LectureRow(self, index)
+
+    def value(self, index, column):
+        """Returns one field of one row, decoded on demand."""
+        if column == 'id':
+            return self.ids[index]
+        if column == 'course_name':
+            return self.strings[self.course_refs[index]]
+        if column == 'topic':
+            return self.strings[self.topic_refs[index]]
+        if column == 'lecture_date':
+            return from_seconds(self.starts[index])[0]
+        if column == 'lecture_time':
+            return from_seconds(self.starts[index])[1]
+        if column == 'notification_sent':
+            return bool(self.notified[index])
+        raise KeyError(column)
+
+    def index_of(self, lecture_id):
+        """Returns the row index of a lecture ID, or -1."""
+        try:
+            return self.ids.index(lecture_id)
+        except ValueError:
+            return -1
+
+    def display_values(self, index):
+        """Treeview values for one row, formatted only when asked for."""
+        days, seconds = divmod(self.starts[index], SECONDS_PER_DAY)
+        date_str = datetime.date.fromordinal(EPOCH_ORDINAL + days).isoformat()
+        time_str = f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+        return (self.ids[index], self.strings[self.course_refs[index]], self.strings[self.topic_refs[index]],
+                date_str, time_str, "Yes" if self.notified[index] else "No")
@@ -0,0 +1,185 @@
+"""
+Applies the versioned SQL files in migrations/ in order.
+
+Each file is named <version>_<description>.sql. Applied versions are recorded in
+the schema_migrations table, so running this script again only applies new files.
+
+    python migrate.py            # apply pending migrations
+    python migrate.py --status   # list applied and pending migrations
+    python migrate.py --check    # check that every file splits into complete statements (no database needed)
+
+MySQL commits every DDL statement on its own, so a file that fails halfway is left partly
+applied and unrecorded. Running it again would repeat the statements that already succeeded;
+revert those (or finish the file by hand and record its version) before retrying.
+"""
+import argparse
+import os
+import re
+import sys
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# First keyword of every statement a migration may contain; anything else means a bad split.
+STATEMENT_KEYWORDS = ('ALTER', 'CREATE', 'DELETE', 'DROP', 'INSERT', 'SET', 'UPDATE')
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    """Returns (version, name, path) for every migration file, ordered by version."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return sorted(migrations)
+
+def _tokenize(sql_text):
+    """Returns (statements ended by ';', text after the last ';') with comments removed."""
+    statements = []
+    current = []
+    i = 0
+    while i < len(sql_text):
+        char = sql_text[i]
+        if char in ("'", '"', '`'):
+            end = i + 1
+            while end < len(sql_text) and sql_text[end] != char:
+                end += 2 if sql_text[end] == '\\' else 1
+            current.append(sql_text[i:end + 1])
+            i = end + 1
+        elif sql_text.startswith('--', i) or char == '#':
+            end = sql_text.find('\n', i)
+            i = len(sql_text) if end == -1 else end
+        elif char == ';':
+            statements.append(''.join(current).strip())
+            current = []
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+    return [statement for statement in statements if statement], ''.join(current).strip()
+
+def split_statements(sql_text):
+    """
+    Splits a migration file into statements on ';', dropping '--' and '#' comments (whole-line
+    and trailing). Semicolons inside quoted strings or comments do not end a statement.
+    """
+    statements, rest = _tokenize(sql_text)
+    return statements + [rest] if rest else statements
+
+def check_statements(sql_text):
+    """Returns a list of problems with how a migration file splits (empty if every statement is complete)."""
+    problems = []
+    statements, rest = _tokenize(sql_text)
+    for statement in statements:
+        keyword = statement.split(None, 1)[0].upper()
+        if keyword not in STATEMENT_KEYWORDS:
+            problems.append(f"statement starts with {keyword!r}: {statement[:40]!r}")
+    if rest:
+        problems.append(f"unterminated statement (missing ';' or unclosed quote): {rest[:40]!r}")
+    return problems
+
+def check_migrations(directory=MIGRATIONS_DIR):
+    """Runs check_statements on every migration file. Returns {filename: [problems]} for the bad ones."""
+    failures = {}
+    for version, name, path in list_migrations(directory):
+        with open(path, encoding='utf-8') as handle:
+            problems = check_statements(handle.read())
+        if problems:
+            failures[os.path.basename(path)] = problems
+    return failures
+
+def _ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_versions(cursor):
+    """Returns the set of migration versions already applied."""
+    _ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+def migrate(directory=MIGRATIONS_DIR, raise_errors=False):
+    """
+    Applies all pending migrations. Returns the list of versions applied.
+    Stops at the first failing statement; with raise_errors, the error is raised after it is reported.
+    """
+    from db_connector import get_connection
+    from mysql.connector import Error
+    applied = []
+    current = None
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                done = applied_versions(cursor)
+                for version, name, path in list_migrations(directory):
+                    if version in done:
+                        continue
+                    with open(path, encoding='utf-8') as handle:
+                        statements = split_statements(handle.read())
+                    # MySQL commits DDL implicitly, so a migration is only recorded once every statement succeeded.
+                    for index, statement in enumerate(statements):
+                        current = (version, name, index, len(statements))
+                        cursor.execute(statement)
+                    cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                    conn.commit()
+                    applied.append(version)
+                    current = None
+                    print(f"Applied migration {version:03d}_{name}")
+            finally:
+                cursor.close()
+    except Error as e:
+        print(f"Error applying migrations: {e}")
+        if current is not None:
+            version, name, index, total = current
+            print(f"Migration {version:03d}_{name} stopped at statement {index + 1} of {total}; the {index} before it "
+                  f"are already committed. Revert them before running migrate.py again.")
+        if raise_errors:
+            raise
+    return applied
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply UniLecture schema migrations.")
+    parser.add_argument('--status', action='store_true', help="Show migration status without applying anything")
+    parser.add_argument('--check', action='store_true', help="Check the migration files without a database")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failures = check_migrations()
+        for filename, problems in failures.items():
+            print(f"{filename}: {'; '.join(problems)}")
+        return 1 if failures else 0
+
+    if args.status:
+        from db_connector import get_connection
+        from mysql.connector import Error
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    done = applied_versions(cursor)
+                    conn.commit()
+                finally:
+                    cursor.close()
+        except Error as e:
+            print(f"Error reading migration status: {e}")
+            return 1
+        for version, name, _ in list_migrations():
+            state = "applied" if version in done else "pending"
+            print(f"{version:03d}_{name}: {state}")
+        return 0
+
+    from mysql.connector import Error
+    try:
+        migrate(raise_errors=True)
+    except Error:
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+-- Base schema, identical to the table created by unilecture_db.sql.
+CREATE TABLE IF NOT EXISTS lectures (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    course_name VARCHAR(255) NOT NULL,
+    topic VARCHAR(255),
+    lecture_date DATE NOT NULL,
+    lecture_time TIME NOT NULL,
+    notification_sent BOOLEAN DEFAULT FALSE
+);
@@ -0,0 +1,8 @@
+-- Composite indexes matching the two hot queries in lecture_manager.
+-- get_upcoming_lectures / claim_due_lectures:
+--   WHERE notification_sent = FALSE AND lecture_date = CURDATE() AND lecture_time BETWEEN ... ORDER BY lecture_time
+CREATE INDEX idx_lectures_due ON lectures (notification_sent, lecture_date, lecture_time);
+-- get_all_lectures / stream_lectures: ORDER BY lecture_date, lecture_time.
+-- Covers every selected column (InnoDB appends the primary key), so the listing is
+-- read in index order without a filesort or a lookup back into the table.
+CREATE INDEX idx_lectures_schedule ON lectures (lecture_date, lecture_time, notification_sent, course_name, topic);
@@ -0,0 +1,7 @@
+-- Single-row counter bumped by every lecture_manager write when
+-- CACHE_CONFIG['shared_invalidation'] is on, so other processes can drop their caches.
+CREATE TABLE IF NOT EXISTS cache_version (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT IGNORE INTO cache_version (id, version) VALUES (1, 0);
@@ -0,0 +1,24 @@
+-- Recurring lectures: one row per weekly series instead of one row per week.
+-- Occurrences are expanded in lecture_manager for the requested window only.
+CREATE TABLE IF NOT EXISTS lecture_series (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    course_name VARCHAR(255) NOT NULL,
+    topic VARCHAR(255),
+    weekday TINYINT NOT NULL,                  -- 0 = Monday ... 6 = Sunday, as Python's date.weekday()
+    lecture_time TIME NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    interval_weeks TINYINT NOT NULL DEFAULT 1,
+    INDEX idx_series_range (start_date, end_date)
+);
+-- Per-occurrence state, stored only for occurrences that were notified, cancelled or overridden.
+CREATE TABLE IF NOT EXISTS series_occurrences (
+    series_id INT NOT NULL,
+    occurrence_date DATE NOT NULL,
+    cancelled BOOLEAN NOT NULL DEFAULT FALSE,
+    topic VARCHAR(255),                        -- NULL = the series topic
+    lecture_time TIME,                         -- NULL = the series time
+    notification_sent BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (series_id, occurrence_date),
+    FOREIGN KEY (series_id) REFERENCES lecture_series(id) ON DELETE CASCADE
+);
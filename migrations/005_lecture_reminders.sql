@@ -0,0 +1,10 @@
+-- One row per reminder sent: several reminders per lecture (e.g. a day, an hour and ten
+-- minutes before). lecture_ref is the lecture ID as text, or a series occurrence ID
+-- such as 'S12:2025-09-01'.
+CREATE TABLE IF NOT EXISTS lecture_reminders (
+    lecture_ref VARCHAR(32) NOT NULL,
+    window_minutes INT NOT NULL,               -- Minutes before the lecture start
+    sent_at DATETIME NOT NULL,
+    PRIMARY KEY (lecture_ref, window_minutes),
+    INDEX idx_reminders_sent (sent_at)
+);
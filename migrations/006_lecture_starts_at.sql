@@ -0,0 +1,11 @@
+-- Single UTC start timestamp per lecture. lecture_date/lecture_time stay as the campus
+-- wall-clock time for display; lecture_manager writes both and schedules on starts_at
+-- with client-computed ranges, so no per-row CURDATE()/CURTIME() functions are needed.
+ALTER TABLE lectures ADD COLUMN starts_at DATETIME NULL;
+-- Existing rows: their date/time is read in this session's time zone. Run
+-- "SET time_zone = '<campus offset>'" first if that differs from the campus time zone.
+UPDATE lectures SET starts_at = CONVERT_TZ(TIMESTAMP(lecture_date, lecture_time), @@session.time_zone, '+00:00');
+ALTER TABLE lectures MODIFY starts_at DATETIME NOT NULL;
+-- The due queries are now a range on starts_at: WHERE notification_sent = FALSE AND starts_at BETWEEN %s AND %s
+DROP INDEX idx_lectures_due ON lectures;
+CREATE INDEX idx_lectures_due ON lectures (notification_sent, starts_at);
@@ -0,0 +1,15 @@
+-- Append-only change feed. lecture_manager writes one row per changed lecture in the same
+-- transaction as the change itself; clients tail it with fetch_changes(since_seq).
+CREATE TABLE IF NOT EXISTS lecture_changes (
+    seq BIGINT PRIMARY KEY,                    -- Assigned from lecture_change_seq, gap-free and in commit order
+    action VARCHAR(32) NOT NULL,               -- add, update, delete, notified, bulk_add, series_add, ...
+    lecture_ref VARCHAR(32),                   -- Lecture or occurrence ID, NULL = reload everything
+    changed_at DATETIME NOT NULL,              -- UTC
+    INDEX idx_changes_time (changed_at)
+);
+-- Single-row counter; its row lock serialises writers so sequence order matches commit order.
+CREATE TABLE IF NOT EXISTS lecture_change_seq (
+    id TINYINT PRIMARY KEY,
+    seq BIGINT NOT NULL DEFAULT 0
+);
+INSERT IGNORE INTO lecture_change_seq (id, seq) VALUES (1, 0);
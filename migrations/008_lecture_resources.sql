@@ -0,0 +1,8 @@
+-- Optional scheduling details for conflict detection. A lecture without a duration is assumed
+-- to last CONFLICT_CONFIG['default_duration'] minutes; without a room or instructor it never conflicts.
+ALTER TABLE lectures ADD COLUMN duration_minutes SMALLINT NULL;  -- 1 .. CONFLICT_CONFIG['max_duration']
+ALTER TABLE lectures ADD COLUMN room VARCHAR(64) NULL;
+ALTER TABLE lectures ADD COLUMN instructor VARCHAR(128) NULL;
+-- check_conflicts reads one starts_at range per room/instructor: WHERE room = %s AND starts_at > %s AND starts_at < %s
+CREATE INDEX idx_lectures_room ON lectures (room, starts_at);
+CREATE INDEX idx_lectures_instructor ON lectures (instructor, starts_at);
@@ -0,0 +1,4 @@
+-- get_lectures_page: WHERE (lecture_date, lecture_time, id) > (...) ORDER BY lecture_date, lecture_time, id.
+-- idx_lectures_schedule orders ties by notification_sent/course_name/topic before id, so it cannot
+-- serve that sort. InnoDB appends the primary key, making this index (lecture_date, lecture_time, id).
+CREATE INDEX idx_lectures_page ON lectures (lecture_date, lecture_time);
@@ -0,0 +1,203 @@
+"""
+Headless lecture notifier.
+
+Runs the heap-based notification scheduler on an asyncio event loop and delivers
+reminders through pluggable async sinks, without Tkinter:
+
+    python -m notifier_service --sink stdout
+    python -m notifier_service --sink logfile --log-file reminders.log
+    python -m notifier_service --sink smtp --smtp-port 1025 --smtp-to students@example.com
+
+Several instances can run against the same database; claims are atomic, so each
+reminder is sent once.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import smtplib
+import sys
+import time
+from email.message import EmailMessage
+
+import async_lecture_manager
+from campus_time import campus_now
+from instrumentation import configure_logging
+from lecture_manager import add_change_listener, lecture_start, remove_change_listener
+from scheduler import NotificationScheduler
+
+logger = logging.getLogger(__name__)
+
+def format_reminder(lecture):
+    """Returns the reminder text for a lecture, matching the desktop notification."""
+    start = lecture_start(lecture)
+    return (
+        f"Upcoming Lecture Alert!\n\n"
+        f"Course: {lecture['course_name']}\n"
+        f"Topic: {lecture['topic']}\n"
+        f"Time: {start.strftime('%H:%M')} on {start.strftime('%Y-%m-%d')}"
+    )
+
+class StdoutSink:
+    """Prints reminders to standard output."""
+
+    async def send(self, lecture):
+        print(format_reminder(lecture), flush=True)
+
+class LogFileSink:
+    """Appends one line per reminder to a log file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _write(self, line):
+        with open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(line)
+
+    async def send(self, lecture):
+        start = lecture_start(lecture)
+        line = (f"{datetime.datetime.now().isoformat(timespec='seconds')} lecture={lecture['id']} "
+                f"course={lecture['course_name']!r} topic={lecture['topic']!r} start={start.isoformat()}\n")
+        await asyncio.to_thread(self._write, line)
+
+class SmtpSink:
+    """Sends reminders by e-mail, e.g. to a local debugging SMTP server on port 1025."""
+
+    def __init__(self, host='localhost', port=1025, sender='unilecture@localhost', recipient='students@localhost'):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipient = recipient
+
+    def _deliver(self, message):
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+    async def send(self, lecture):
+        message = EmailMessage()
+        message['Subject'] = f"Lecture reminder: {lecture['course_name']}"
+        message['From'] = self.sender
+        message['To'] = self.recipient
+        message.set_content(format_reminder(lecture))
+        await asyncio.to_thread(self._deliver, message)
+
+class AsyncNotificationScheduler(NotificationScheduler):
+    """
+    NotificationScheduler driven by an asyncio loop instead of a dedicated thread.
+    on_due must be a coroutine function. Waiting costs no thread; the database calls in
+    reload() and claim() (with their retry handling) run on async_lecture_manager's thread pool.
+    """
+
+    def __init__(self, on_due, **kwargs):
+        super().__init__(on_due, **kwargs)
+        self._loop = None
+        self._wakeup = None
+
+    def _signal(self):
+        # Change listeners run on whatever thread made the write
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def wake(self):
+        super().wake()
+        self._signal()
+
+    def stop(self):
+        super().stop()
+        self._signal()
+
+    async def run_async(self):
+        """Runs until stop() is called."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        add_change_listener(self._on_change)
+        try:
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        return
+                    needs_reload = self._dirty or time.monotonic() >= self._next_reconcile
+                    self._dirty = False
+                if needs_reload:
+                    await async_lecture_manager.run_blocking(self.reload)
+
+                due = self.pop_due(campus_now())
+                if due:
+                    claimed = await async_lecture_manager.run_blocking(self.claim, due)
+                    await asyncio.gather(*(self.on_due(lec) for lec in claimed))
+                    continue
+
+                self._wakeup.clear()
+                with self._condition:
+                    if self._stopped or self._dirty:
+                        continue
+                timeout = self.seconds_until_next(campus_now())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            remove_change_listener(self._on_change)
+
+class ReminderDispatcher:
+    """Fans each reminder out to every sink concurrently; one failing sink does not block the others."""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+        self.sent = 0
+
+    async def __call__(self, lecture):
+        results = await asyncio.gather(*(sink.send(lecture) for sink in self.sinks), return_exceptions=True)
+        for sink, result in zip(self.sinks, results):
+            if isinstance(result, Exception):
+                logger.error("Error sending reminder for lecture ID %s via %s: %s", lecture['id'],
+                             type(sink).__name__, result, exc_info=result)
+        self.sent += 1
+
+def build_sinks(args):
+    """Creates the sinks selected on the command line."""
+    sinks = []
+    for name in args.sink or ['stdout']:
+        if name == 'stdout':
+            sinks.append(StdoutSink())
+        elif name == 'logfile':
+            sinks.append(LogFileSink(args.log_file))
+        elif name == 'smtp':
+            sinks.append(SmtpSink(args.smtp_host, args.smtp_port, args.smtp_from, args.smtp_to))
+    return sinks
+
+async def run_service(sinks, windows=None, reconcile_seconds=900):
+    """Runs the notifier until cancelled."""
+    scheduler = AsyncNotificationScheduler(ReminderDispatcher(sinks), windows=windows,
+                                           reconcile_seconds=reconcile_seconds)
+    try:
+        await scheduler.run_async()
+    finally:
+        scheduler.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless UniLecture reminder service.")
+    parser.add_argument('--sink', action='append', choices=('stdout', 'logfile', 'smtp'),
+                        help="Where to send reminders (repeatable, default stdout)")
+    parser.add_argument('--windows', type=int, nargs='+',
+                        help="Minutes before a lecture to send reminders (default from REMINDER_CONFIG: 1440 60 10)")
+    parser.add_argument('--reconcile-seconds', type=int, default=900, help="Safety-net reload interval")
+    parser.add_argument('--log-file', default='reminders.log')
+    parser.add_argument('--smtp-host', default='localhost')
+    parser.add_argument('--smtp-port', type=int, default=1025)
+    parser.add_argument('--smtp-from', default='unilecture@localhost')
+    parser.add_argument('--smtp-to', default='students@localhost')
+    parser.add_argument('--log-level', help="Logging level (default from UNILECTURE_LOG_LEVEL or WARNING)")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level)
+
+    try:
+        asyncio.run(run_service(build_sinks(args), args.windows, args.reconcile_seconds))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        async_lecture_manager.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
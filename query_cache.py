@@ -0,0 +1,85 @@
+"""
+In-process read-through cache for lecture queries.
+
+Entries expire after a TTL and the whole cache is dropped whenever lecture_manager
+commits a write. Least recently used entries are evicted once max_entries is reached,
+which keeps filtered and paginated queries bounded. Optionally, a version counter
+stored in the database lets writes made by other processes invalidate this cache too.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class QueryCache:
+    def __init__(self, max_entries=256, ttl=30, version_source=None, version_check_interval=2):
+        """
+        version_source is an optional callable returning the shared version counter. It is
+        polled at most every version_check_interval seconds; a change clears the cache.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_source = version_source
+        self.version_check_interval = version_check_interval
+        self._entries = OrderedDict() # key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+        self._generation = 0 # Bumped on every invalidation
+        self._shared_version = None
+        self._next_version_check = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _check_shared_version(self):
+        if self.version_source is None or time.monotonic() < self._next_version_check:
+            return
+        self._next_version_check = time.monotonic() + self.version_check_interval
+        try:
+            version = self.version_source()
+        except Exception:
+            version = None # Can't tell whether other processes wrote; don't trust the cache
+        if version is None or version != self._shared_version:
+            self._shared_version = version
+            self.invalidate()
+
+    def get_or_load(self, key, loader, *args, ttl=None):
+        """
+        Returns the cached value for key, or calls loader(*args), caches and returns its result.
+        Exceptions from the loader propagate and nothing is cached. Cached values are shared
+        between callers and must be treated as read-only.
+        """
+        self._check_shared_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[1]
+            self._stats['misses'] += 1
+            generation = self._generation
+
+        value = loader(*args)
+
+        with self._lock:
+            # A write committed while we were loading; the value may already be stale.
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return value
+
+    def invalidate(self):
+        """Drops every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        """Returns hit/miss/eviction/invalidation counters plus the current size and hit rate."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = len(self._entries)
+        lookups = snapshot['hits'] + snapshot['misses']
+        snapshot['hit_rate'] = snapshot['hits'] / lookups if lookups else 0.0
+        return snapshot
@@ -0,0 +1,153 @@
+"""
+Event-driven notification scheduler.
+
+Pending reminders are kept in a min-heap keyed on their fire time (start time minus
+the reminder window); a lecture has one entry per window in REMINDER_CONFIG. The
+scheduler thread sleeps exactly until the next reminder is due, and is woken early
+whenever lecture_manager writes change the schedule. A low-frequency reconciliation
+reload catches changes made by other processes, and each reload catches up reminders
+missed while no scheduler was running.
+
+A failed reload or claim is retried after a short, growing delay (retry_seconds up to
+max_retry_seconds) instead of waiting for the next reconciliation; reminders whose claim
+failed go back on the heap for the retry.
+"""
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from campus_time import campus_now
+from lecture_manager import (add_change_listener, claim_reminders, get_pending_reminders, lecture_start,
+                             remove_change_listener)
+from storage import Error
+
+logger = logging.getLogger(__name__)
+
+class NotificationScheduler:
+    def __init__(self, on_due, windows=None, horizon_hours=24, reconcile_seconds=900, retry_seconds=5,
+                 max_retry_seconds=60):
+        """
+        on_due(lecture) is called from the scheduler thread for every claimed reminder; the
+        lecture dict carries 'reminder_minutes'. windows (minutes before start) replaces
+        REMINDER_CONFIG['windows'] as the default. Only reminders due within horizon_hours are
+        held in memory; the heap is reloaded from the database at least every reconcile_seconds.
+        """
+        self.on_due = on_due
+        self.windows = tuple(windows) if windows else None
+        self.horizon = datetime.timedelta(hours=horizon_hours)
+        self.reconcile_seconds = reconcile_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._heap = []
+        # The sequence number breaks ties; lecture and series occurrence IDs don't compare
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._dirty = True
+        self._stopped = False
+        self._next_reconcile = 0.0
+        self._failures = 0 # Consecutive database failures, for the retry backoff
+
+    def _on_change(self, action, lecture_id):
+        self.wake()
+
+    def wake(self):
+        """Forces a reload of the schedule and wakes the scheduler thread."""
+        with self._condition:
+            self._dirty = True
+            self._condition.notify()
+
+    def stop(self):
+        """Stops the run loop."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _retry_delay(self):
+        """Counts a database failure and returns the seconds to wait before retrying."""
+        self._failures += 1
+        return min(self.max_retry_seconds, self.retry_seconds * 2 ** (self._failures - 1))
+
+    def reload(self):
+        """
+        Rebuilds the heap from the reminders due within the horizon. If the database cannot be
+        read, the current heap is kept and the reload is retried after a short delay.
+        """
+        now = campus_now()
+        try:
+            reminders = get_pending_reminders(now + self.horizon, self.windows, raise_errors=True)
+        except Error as e:
+            delay = self._retry_delay()
+            logger.warning("Could not load pending reminders, retrying in %ss: %s", delay, e)
+            self._next_reconcile = time.monotonic() + delay
+            return
+        self._failures = 0
+        heap = [(fire_at, next(self._sequence), window, lec) for fire_at, window, lec in reminders]
+        heapq.heapify(heap)
+        self._heap = heap
+        self._next_reconcile = time.monotonic() + self.reconcile_seconds
+
+    def pop_due(self, now):
+        """
+        Removes and returns (window_minutes, lecture) for every reminder that is due and whose
+        lecture has not started yet.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, window, lec = heapq.heappop(self._heap)
+            if lecture_start(lec) >= now:
+                due.append((window, lec))
+        return due
+
+    def claim(self, due):
+        """
+        Claims reminders returned by pop_due; returns the won ones as lecture dicts. If the claim
+        fails, the reminders go back on the heap to be claimed again after a short delay.
+        """
+        try:
+            won = claim_reminders(due, self.windows, raise_errors=True)
+        except Error as e:
+            delay = self._retry_delay()
+            logger.warning("Could not claim %s reminders, retrying in %ss: %s", len(due), delay, e)
+            retry_at = campus_now() + datetime.timedelta(seconds=delay)
+            for window, lec in due:
+                heapq.heappush(self._heap, (retry_at, next(self._sequence), window, lec))
+            return []
+        self._failures = 0
+        return won
+
+    def seconds_until_next(self, now):
+        """Seconds until the next reminder or reconciliation, whichever comes first."""
+        timeout = max(0.0, self._next_reconcile - time.monotonic())
+        if self._heap:
+            timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+        return timeout
+
+    def run(self):
+        """Runs the scheduler until stop() is called. Meant to run in its own thread."""
+        add_change_listener(self._on_change)
+        try:
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        return
+                    needs_reload = self._dirty or time.monotonic() >= self._next_reconcile
+                    self._dirty = False
+                if needs_reload:
+                    self.reload()
+
+                due = self.pop_due(campus_now())
+                if due:
+                    # Another process may have claimed some of these already; only notify what we won.
+                    for lec in self.claim(due):
+                        self.on_due(lec)
+                    continue
+
+                with self._condition:
+                    if self._stopped or self._dirty:
+                        continue
+                    self._condition.wait(timeout=self.seconds_until_next(campus_now()))
+        finally:
+            remove_change_listener(self._on_change)
@@ -0,0 +1,76 @@
+"""
+EXPLAIN-based check that the hot lecture queries use their indexes.
+
+Run after migrate.py (and in CI against a scratch database):
+
+    python schema_check.py
+
+Exits non-zero if a query falls back to a full table scan or a filesort, so a
+change to the query text in lecture_manager cannot silently undo the indexes.
+"""
+import datetime
+import sys
+
+from db_connector import get_connection
+from lecture_manager import (ALL_LECTURES_SQL, CONFLICT_CANDIDATES_SQL, LECTURE_FIELDS, UPCOMING_LECTURES_SQL,
+                             build_page_query, due_window)
+from mysql.connector import Error
+
+# (label, sql, params, index the plan must use)
+CHECKED_QUERIES = [
+    ("get_all_lectures", ALL_LECTURES_SQL, (), 'idx_lectures_schedule'),
+    ("get_upcoming_lectures", UPCOMING_LECTURES_SQL, due_window(15), 'idx_lectures_due'),
+    ("get_lectures_page", *build_page_query(after=(datetime.date.today(), datetime.time(), 0, 0),
+                                            end_date=datetime.date.today() + datetime.timedelta(days=30)),
+     'idx_lectures_page'),
+    ("check_conflicts (room)", CONFLICT_CANDIDATES_SQL.format(fields=LECTURE_FIELDS, resource='room'),
+     ('Room 1', *due_window(480)), 'idx_lectures_room'),
+    ("check_conflicts (instructor)", CONFLICT_CANDIDATES_SQL.format(fields=LECTURE_FIELDS, resource='instructor'),
+     ('Instructor', *due_window(480)), 'idx_lectures_instructor'),
+]
+
+def explain(cursor, sql, params=()):
+    """Returns the EXPLAIN rows for a query as dictionaries."""
+    cursor.execute("EXPLAIN " + sql, params)
+    return cursor.fetchall()
+
+def plan_problems(plan, expected_index):
+    """Returns a list of human-readable problems with a query plan (empty if it is fine)."""
+    problems = []
+    for row in plan:
+        if row.get('table') != 'lectures':
+            continue
+        extra = row.get('Extra') or ''
+        if row.get('type') == 'ALL':
+            problems.append("full table scan")
+        if row.get('key') != expected_index:
+            problems.append(f"uses index {row.get('key')!r}, expected {expected_index!r}")
+        if 'Using filesort' in extra:
+            problems.append("filesort")
+    return problems
+
+def check_query_plans():
+    """EXPLAINs every checked query and returns {label: [problems]} for the ones that regressed."""
+    failures = {}
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for label, sql, params, expected_index in CHECKED_QUERIES:
+                problems = plan_problems(explain(cursor, sql, params), expected_index)
+                if problems:
+                    failures[label] = problems
+        finally:
+            cursor.close()
+    return failures
+
+if __name__ == '__main__':
+    try:
+        failures = check_query_plans()
+    except Error as e:
+        print(f"Error checking query plans: {e}")
+        sys.exit(2)
+    for label, problems in failures.items():
+        print(f"{label}: {', '.join(problems)}")
+    if failures:
+        sys.exit(1)
+    print("All checked queries use their indexes.")
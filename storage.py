@@ -0,0 +1,372 @@
+"""
+Storage backends for lecture_manager.
+
+lecture_manager talks to a DB-API style connection obtained from get_connection().
+Two backends are available:
+
+* 'mysql'  - the pooled MySQL server connection from db_connector (default).
+* 'sqlite' - an embedded SQLite database, either a file (WAL mode) or ':memory:'.
+             It creates the same tables and indexes itself and translates the
+             MySQL-flavoured SQL used in lecture_manager.
+
+The backend is chosen by STORAGE_CONFIG, which reads UNILECTURE_BACKEND and
+UNILECTURE_SQLITE_PATH from the environment, or explicitly with configure().
+Driver errors are re-raised as storage.Error so callers need not know the backend.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from campus_time import to_utc
+from instrumentation import InstrumentedConnection, record_phase
+
+STORAGE_CONFIG = {
+    'backend': os.environ.get('UNILECTURE_BACKEND', 'mysql'),  # 'mysql' or 'sqlite'
+    'sqlite_path': os.environ.get('UNILECTURE_SQLITE_PATH', 'unilecture.db'),  # file path or ':memory:'
+}
+
+class Error(Exception):
+    """Raised for any database error, whichever backend is in use."""
+
+
+class MySQLBackend:
+    """Pooled MySQL connections from db_connector."""
+
+    name = 'mysql'
+
+    def __init__(self):
+        # Imported here so the SQLite backend works without mysql-connector installed.
+        import db_connector
+        import mysql.connector
+        self._db_connector = db_connector
+        self._driver_error = mysql.connector.Error
+        self.max_connections = db_connector.POOL_CONFIG['max_size']
+
+    @contextmanager
+    def connection(self):
+        try:
+            with self._db_connector.get_connection() as conn:
+                yield conn
+        except self._driver_error as e:
+            raise Error(str(e)) from e
+
+    def close(self):
+        self._db_connector.close_pool()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lectures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_name TEXT NOT NULL,
+    topic TEXT,
+    lecture_date DATE NOT NULL,
+    lecture_time TIME NOT NULL,
+    notification_sent BOOLEAN DEFAULT FALSE,
+    starts_at TIMESTAMP NOT NULL,
+    duration_minutes INTEGER,
+    room TEXT,
+    instructor TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_lectures_due ON lectures (notification_sent, starts_at);
+CREATE INDEX IF NOT EXISTS idx_lectures_room ON lectures (room, starts_at);
+CREATE INDEX IF NOT EXISTS idx_lectures_instructor ON lectures (instructor, starts_at);
+CREATE INDEX IF NOT EXISTS idx_lectures_schedule ON lectures (lecture_date, lecture_time, notification_sent, course_name, topic);
+CREATE INDEX IF NOT EXISTS idx_lectures_page ON lectures (lecture_date, lecture_time, id);
+CREATE TABLE IF NOT EXISTS cache_version (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO cache_version (id, version) VALUES (1, 0);
+CREATE TABLE IF NOT EXISTS lecture_series (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_name TEXT NOT NULL,
+    topic TEXT,
+    weekday INTEGER NOT NULL,
+    lecture_time TIME NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    interval_weeks INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_series_range ON lecture_series (start_date, end_date);
+CREATE TABLE IF NOT EXISTS series_occurrences (
+    series_id INTEGER NOT NULL REFERENCES lecture_series(id) ON DELETE CASCADE,
+    occurrence_date DATE NOT NULL,
+    cancelled BOOLEAN NOT NULL DEFAULT FALSE,
+    topic TEXT,
+    lecture_time TIME,
+    notification_sent BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (series_id, occurrence_date)
+);
+CREATE TABLE IF NOT EXISTS lecture_reminders (
+    lecture_ref TEXT NOT NULL,
+    window_minutes INTEGER NOT NULL,
+    sent_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (lecture_ref, window_minutes)
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_sent ON lecture_reminders (sent_at);
+CREATE TABLE IF NOT EXISTS lecture_changes (
+    seq INTEGER PRIMARY KEY,
+    action TEXT NOT NULL,
+    lecture_ref TEXT,
+    changed_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_time ON lecture_changes (changed_at);
+CREATE TABLE IF NOT EXISTS lecture_change_seq (
+    id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO lecture_change_seq (id, seq) VALUES (1, 0);
+"""
+
+# MySQL constructs used by lecture_manager and their SQLite equivalents, applied in order.
+SQLITE_TRANSLATIONS = [
+    # BEGIN IMMEDIATE already gives the claiming transaction the write lock
+    ("FOR UPDATE SKIP LOCKED", ""),
+    ("INSERT IGNORE", "INSERT OR IGNORE"),
+    ("%s", "?"),
+]
+
+# Nullable lecture columns added after the first release (migration 008), with their SQLite types.
+ADDED_LECTURE_COLUMNS = (('duration_minutes', 'INTEGER'), ('room', 'TEXT'), ('instructor', 'TEXT'))
+
+def _upgrade_schema(connection):
+    """Brings a database file created by an older version up to date (like migrations 006 and 008)."""
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(lectures)")]
+    if not columns:
+        return
+    if 'starts_at' not in columns:
+        connection.execute("ALTER TABLE lectures ADD COLUMN starts_at TIMESTAMP")
+        rows = connection.execute("SELECT id, lecture_date, lecture_time FROM lectures").fetchall()
+        connection.executemany("UPDATE lectures SET starts_at = ? WHERE id = ?",
+                               [(to_utc(datetime.datetime.combine(lecture_date, lecture_time)), lecture_id)
+                                for lecture_id, lecture_date, lecture_time in rows])
+        connection.execute("DROP INDEX IF EXISTS idx_lectures_due")
+    for column, column_type in ADDED_LECTURE_COLUMNS:
+        if column not in columns:
+            connection.execute(f"ALTER TABLE lectures ADD COLUMN {column} {column_type}")
+    connection.commit()
+
+def translate_sql(sql):
+    """Rewrites a MySQL-flavoured statement from lecture_manager for SQLite."""
+    for mysql_text, sqlite_text in SQLITE_TRANSLATIONS:
+        sql = sql.replace(mysql_text, sqlite_text)
+    return sql
+
+def _adapt_time(value):
+    return value.isoformat()
+
+def _convert_date(raw):
+    return datetime.date.fromisoformat(raw.decode())
+
+def _convert_time(raw):
+    return datetime.time.fromisoformat(raw.decode())
+
+def _convert_datetime(raw):
+    return datetime.datetime.fromisoformat(raw.decode())
+
+def _convert_bool(raw):
+    return raw not in (b'0', b'')
+
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(datetime.time, _adapt_time)
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('TIME', _convert_time)
+sqlite3.register_converter('TIMESTAMP', _convert_datetime)
+sqlite3.register_converter('BOOLEAN', _convert_bool)
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """Cursor wrapper that accepts lecture_manager's SQL and can return rows as dictionaries."""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        if dictionary:
+            self._cursor.row_factory = _dict_row
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate_sql(sql), params)
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate_sql(sql), seq_of_params)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Connection wrapper exposing the parts of the mysql.connector API lecture_manager uses."""
+
+    unread_result = False # SQLite cursors never hold the connection the way unbuffered MySQL cursors do
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, dictionary=False, buffered=True):
+        return SQLiteCursor(self._connection.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        if self._connection.in_transaction:
+            self._connection.commit()
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    @property
+    def in_transaction(self):
+        return self._connection.in_transaction
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self._connection.close()
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite storage. A file database gets one connection per thread in WAL mode,
+    so readers never block on the writer. ':memory:' uses one shared connection guarded by
+    a lock, since every in-memory connection would otherwise be a separate database.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=':memory:', busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.in_memory = path == ':memory:'
+        self.max_connections = 1 if self.in_memory else 4
+        self._local = threading.local()
+        self._shared = None
+        self._lock = threading.RLock()
+        self._connections = []
+        self._schema_ready = False
+
+    def _open(self):
+        # Per-thread file connections are only used by their own thread, but close() may run on another
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys=ON")
+        if not self.in_memory:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            if not self._schema_ready:
+                _upgrade_schema(connection)
+                connection.executescript(SQLITE_SCHEMA)
+                self._schema_ready = True
+            self._connections.append(connection)
+        return SQLiteConnection(connection)
+
+    def _get(self):
+        if self.in_memory:
+            if self._shared is None:
+                self._shared = self._open()
+            return self._shared
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = self._local.connection = self._open()
+        return conn
+
+    @contextmanager
+    def connection(self):
+        lock = self._lock if self.in_memory else None
+        if lock:
+            lock.acquire()
+        try:
+            conn = self._get()
+            try:
+                yield conn
+            finally:
+                # Never leave a half-finished transaction behind, like the MySQL pool on release
+                if conn.in_transaction:
+                    conn.rollback()
+        except sqlite3.Error as e:
+            raise Error(str(e)) from e
+        finally:
+            if lock:
+                lock.release()
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+            self._shared = None
+            self._local = threading.local()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def create_backend(name, sqlite_path=':memory:'):
+    """Creates a backend by name ('mysql' or 'sqlite')."""
+    if name == 'mysql':
+        return MySQLBackend()
+    if name == 'sqlite':
+        return SQLiteBackend(sqlite_path)
+    raise ValueError(f"Unknown storage backend: {name!r}")
+
+def get_backend():
+    """Returns the configured backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(STORAGE_CONFIG['backend'], STORAGE_CONFIG['sqlite_path'])
+        return _backend
+
+def configure(backend=None, sqlite_path=None):
+    """
+    Switches the storage backend, e.g. configure('sqlite', ':memory:') in tests and tools.
+    Closes the previous backend's connections. Returns the new backend.
+    """
+    global _backend
+    with _backend_lock:
+        if backend is not None:
+            STORAGE_CONFIG['backend'] = backend
+        if sqlite_path is not None:
+            STORAGE_CONFIG['sqlite_path'] = sqlite_path
+        if _backend is not None:
+            _backend.close()
+        _backend = create_backend(STORAGE_CONFIG['backend'], STORAGE_CONFIG['sqlite_path'])
+        return _backend
+
+@contextmanager
+def get_connection():
+    """
+    Borrows a connection from the configured backend for the duration of a with-block.
+    The time spent getting it and the queries/commits run on it count towards the
+    current instrumented operation.
+    """
+    started = time.perf_counter()
+    with get_backend().connection() as conn:
+        record_phase('connect', time.perf_counter() - started)
+        yield InstrumentedConnection(conn)
@@ -0,0 +1,115 @@
+"""
+Runs blocking work (database calls) on a thread pool and hands results back to the
+Tk main thread.
+
+Workers never touch Tk: finished tasks are put on a queue that the main thread
+drains from an after() loop. Tasks submitted with a key are coalesced, so only
+the newest task for a key delivers its result and queued older ones are cancelled.
+"""
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_MS = 15 # How often the Tk loop checks for finished tasks (about one frame at 60 fps)
+
+class TkTaskRunner:
+    def __init__(self, master, max_workers=4, on_busy_changed=None):
+        """on_busy_changed(busy) is called on the main thread when the runner starts or stops having work."""
+        self.master = master
+        self.on_busy_changed = on_busy_changed
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._generations = {} # key -> generation of the newest task submitted for it
+        self._queued = {} # key -> future of the newest task, so it can be cancelled
+        self._pending = 0 # Only touched on the main thread
+        self._closed = False
+        self.master.after(POLL_INTERVAL_MS, self._poll)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on a worker thread. on_done(result) or on_error(exception)
+        is then called on the Tk main thread. Submitting again with the same key cancels the
+        previous task if it has not started and drops its result if it has.
+        Must be called from the main thread.
+        """
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._queued.get(key)
+            if previous is not None and previous.cancel():
+                self._task_finished()
+
+        def work():
+            try:
+                outcome = (True, fn(*args, **kwargs))
+            except Exception as e:
+                outcome = (False, e)
+            self._results.put(('task', key, generation, outcome, on_done, on_error))
+
+        future = self._executor.submit(work)
+        if key is not None:
+            self._queued[key] = future
+        self._pending += 1
+        if self._pending == 1:
+            self._notify_busy()
+        return future
+
+    def call_soon(self, callback, *args):
+        """Schedules callback(*args) on the main thread. Safe to call from any thread."""
+        self._results.put(('call', callback, args))
+
+    def shutdown(self):
+        """Stops accepting results and shuts down the worker threads."""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _task_finished(self):
+        self._pending -= 1
+        if self._pending == 0:
+            self._notify_busy()
+
+    def _notify_busy(self):
+        if self.on_busy_changed:
+            self.on_busy_changed(self.busy)
+
+    def _poll(self):
+        if self._closed:
+            return
+        try:
+            while True:
+                try:
+                    item = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._handle(item)
+                except Exception:
+                    logger.exception("Error in background task callback")
+        finally:
+            self.master.after(POLL_INTERVAL_MS, self._poll)
+
+    def _handle(self, item):
+        if item[0] == 'call':
+            _, callback, args = item
+            callback(*args)
+            return
+        _, key, generation, (ok, value), on_done, on_error = item
+        self._task_finished()
+        if key is not None:
+            if self._generations.get(key) != generation:
+                return # Superseded by a newer task with the same key
+            self._queued.pop(key, None)
+        if ok:
+            if on_done:
+                on_done(value)
+        elif on_error:
+            on_error(value)
+        else:
+            logger.error("Background task failed: %s", value, exc_info=value)
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lecture_manager
+import storage
+
+@pytest.fixture(autouse=True)
+def sqlite_db():
+    """Every test runs against a fresh in-memory SQLite database with an empty lecture cache."""
+    backend = storage.configure('sqlite', ':memory:')
+    lecture_manager.clear_cache()
+    yield backend
+    backend.close()
+    lecture_manager.clear_cache()
@@ -0,0 +1,61 @@
+import datetime
+import types
+
+import pytest
+
+import app
+import lecture_manager
+import storage
+
+def test_first_page_comes_with_the_feed_position():
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(9))
+    change_seq, lectures = app.load_first_page(after=None, limit=10)
+    assert change_seq == lecture_manager.latest_change_seq()
+    assert [lec['id'] for lec in lectures] == [lecture_id]
+
+def test_first_page_errors_reach_the_error_handler():
+    with storage.get_connection() as conn:
+        conn.cursor().execute("DROP TABLE lectures")
+        conn.commit()
+    with pytest.raises(storage.Error):
+        app.load_first_page(after=None, limit=10)
+
+class Entry:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def insert(self, index, text):
+        self.value = str(text) + self.value
+
+def _form(lecture_id, **fields):
+    """A stand-in for the app with its input fields, running background tasks inline."""
+    Window = app.UniLectureNotifierApp
+    form = types.SimpleNamespace(messages=[], resources_loaded_for=None)
+    form.lecture_tree = types.SimpleNamespace(focus=lambda: str(lecture_id))
+    form.tasks = types.SimpleNamespace(submit=lambda fn, *args, on_done, on_error, key=None: on_done(fn(*args)))
+    for name in ('course_name', 'topic', 'date', 'time', 'duration', 'room', 'instructor'):
+        setattr(form, f'{name}_entry', Entry(fields.get(name, "")))
+    form.show_message = lambda title, text: form.messages.append(title)
+    for method in ('selected_lecture_id', 'validate_input', 'check_conflicts', 'fill_resource_fields'):
+        setattr(form, method, getattr(Window, method).__get__(form))
+    form.clear_fields = form.refresh_lecture = form.on_task_error = lambda *args: None
+    return form
+
+def test_update_before_the_resource_fields_load_keeps_them():
+    day = datetime.date(2030, 9, 2)
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", day, datetime.time(9), 90, "B101", "Smith")
+    form = _form(lecture_id, course_name="Physics", topic="Waves", date="2030-09-02", time="10:00:00")
+    app.UniLectureNotifierApp.update_lecture(form)
+    lecture = lecture_manager.get_lecture(lecture_id)
+    assert (lecture['topic'], lecture['duration_minutes'], lecture['room'], lecture['instructor']) == (
+        "Waves", 90, "B101", "Smith")
+
+    form.fill_resource_fields(str(lecture_id), lecture)
+    assert form.room_entry.get() == "B101"
+    form.room_entry.value = "" # The user clears the room once it is shown
+    app.UniLectureNotifierApp.update_lecture(form)
+    assert lecture_manager.get_lecture(lecture_id)['room'] is None
+    assert form.messages == ["Success", "Success"]
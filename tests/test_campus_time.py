@@ -0,0 +1,36 @@
+import datetime
+
+import pytest
+
+import campus_time
+import lecture_manager
+from campus_time import from_utc, to_utc
+
+@pytest.fixture(autouse=True)
+def berlin(monkeypatch):
+    monkeypatch.setitem(campus_time.TIME_CONFIG, 'timezone', 'Europe/Berlin')
+
+def test_wall_clock_times_convert_to_utc_and_back():
+    summer, winter = datetime.datetime(2030, 7, 1, 9), datetime.datetime(2030, 12, 1, 9)
+    assert to_utc(summer) == datetime.datetime(2030, 7, 1, 7)
+    assert to_utc(winter) == datetime.datetime(2030, 12, 1, 8)
+    assert from_utc(to_utc(summer)) == summer and from_utc(to_utc(winter)) == winter
+
+def test_due_window_spans_midnight():
+    start, end = lecture_manager.due_window(15, now=datetime.datetime(2030, 9, 2, 23, 55))
+    assert (start, end) == (datetime.datetime(2030, 9, 2, 21, 55), datetime.datetime(2030, 9, 2, 22, 10))
+
+def test_due_window_is_never_inverted_by_the_autumn_dst_change():
+    # Clocks go back from 03:00 to 02:00 on 2030-10-27, so 02:50 happens twice
+    for minute in range(0, 120, 5):
+        now = datetime.datetime(2030, 10, 27, 2) + datetime.timedelta(minutes=minute)
+        start, end = lecture_manager.due_window(15, now)
+        assert start < end
+
+def test_upcoming_query_finds_lectures_after_midnight():
+    now = datetime.datetime(2030, 9, 2, 23, 55)
+    after_midnight = lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 3), datetime.time(0, 5))
+    lecture_manager.add_lecture("Physics", "Later", datetime.date(2030, 9, 3), datetime.time(0, 15))
+    lecture_manager.add_lecture("Physics", "Earlier", datetime.date(2030, 9, 2), datetime.time(23, 50))
+    rows = lecture_manager._fetch(lecture_manager.UPCOMING_LECTURES_SQL, lecture_manager.due_window(15, now))
+    assert [row['id'] for row in rows] == [after_midnight]
@@ -0,0 +1,63 @@
+import datetime
+import sqlite3
+
+import pytest
+
+import lecture_manager
+import storage
+
+DAY = datetime.date(2030, 9, 2)
+
+def test_writes_are_recorded_in_order():
+    since = lecture_manager.latest_change_seq()
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", DAY, datetime.time(9))
+    lecture_manager.update_lecture(lecture_id, "Physics", "Waves", DAY, datetime.time(9))
+    lecture_manager.delete_lecture(lecture_id)
+    changes = lecture_manager.fetch_changes(since)
+    assert [(change['action'], change['lecture_id']) for change in changes] == [
+        ('add', lecture_id), ('update', lecture_id), ('delete', lecture_id)]
+    assert [change['seq'] for change in changes] == list(range(since + 1, since + 4))
+    assert lecture_manager.fetch_changes(changes[-1]['seq']) == []
+
+def test_changes_by_another_process_are_not_served_from_the_cache(tmp_path):
+    path = str(tmp_path / 'feed.db')
+    storage.configure('sqlite', path)
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", DAY, datetime.time(9))
+    seq = lecture_manager.latest_change_seq()
+    assert lecture_manager.get_lecture(lecture_id)['topic'] == "Optics" # Now cached
+
+    # Another process updates the row and appends its feed entry; this process' cache is not told
+    other = sqlite3.connect(path)
+    other.execute("UPDATE lectures SET topic = 'Waves' WHERE id = ?", (lecture_id,))
+    other.execute("UPDATE lecture_change_seq SET seq = seq + 1 WHERE id = 1")
+    other.execute("INSERT INTO lecture_changes (seq, action, lecture_ref, changed_at) VALUES (?, 'update', ?, ?)",
+                  (seq + 1, str(lecture_id), datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None).isoformat(' ')))
+    other.commit()
+    other.close()
+
+    changes = lecture_manager.fetch_changes(seq)
+    assert [change['lecture_id'] for change in changes] == [lecture_id]
+    assert lecture_manager.get_lecture(lecture_id)['topic'] == "Waves"
+
+def _drop(table):
+    with storage.get_connection() as conn:
+        conn.cursor().execute(f"DROP TABLE {table}")
+        conn.commit()
+
+def test_an_unreadable_feed_position_is_not_reported_as_empty():
+    lecture_manager.add_lecture("Physics", "Optics", DAY, datetime.time(9))
+    _drop('lecture_change_seq')
+    assert lecture_manager.latest_change_seq() is None
+    with pytest.raises(storage.Error):
+        lecture_manager.latest_change_seq(raise_errors=True)
+
+def test_prune_removes_only_older_changes():
+    lecture_manager.add_lecture("Physics", "Optics", DAY, datetime.time(9))
+    with storage.get_connection() as conn:
+        conn.cursor().execute("UPDATE lecture_changes SET changed_at = %s", (datetime.datetime(2020, 1, 1),))
+        conn.commit()
+    lecture_manager.add_lecture("Physics", "Waves", DAY, datetime.time(11))
+    assert lecture_manager.prune_changes(datetime.datetime(2021, 1, 1)) == 1
+    assert [change['action'] for change in lecture_manager.fetch_changes()] == ['add']
+    _drop('lecture_changes')
+    assert lecture_manager.prune_changes(datetime.datetime(2021, 1, 1)) is None
@@ -0,0 +1,29 @@
+import datetime
+
+import lecture_manager
+import storage
+from campus_time import campus_now
+
+def _in_minutes(minutes):
+    start = (campus_now() + datetime.timedelta(minutes=minutes)).replace(microsecond=0)
+    return start.date(), start.time()
+
+def test_claim_due_lectures_claims_each_lecture_once():
+    due = lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(5))
+    lecture_manager.add_lecture("Physics", "Later", *_in_minutes(120))
+    assert [lec['id'] for lec in lecture_manager.claim_due_lectures(15)] == [due]
+    assert lecture_manager.claim_due_lectures(15) == []
+    assert lecture_manager.get_lecture(due)['notification_sent']
+
+def test_a_failed_claim_is_rolled_back(monkeypatch):
+    due = lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(5))
+
+    def fail(conn, changes):
+        raise storage.Error("commit failed")
+
+    monkeypatch.setattr(lecture_manager, '_commit_write', fail)
+    assert lecture_manager.claim_due_lectures(15) == []
+    monkeypatch.undo()
+    lecture_manager.clear_cache()
+    assert not lecture_manager.get_lecture(due)['notification_sent']
+    assert [lec['id'] for lec in lecture_manager.claim_due_lectures(15)] == [due]
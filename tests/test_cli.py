@@ -0,0 +1,47 @@
+import pytest
+
+import cli
+import notifier_service
+
+@pytest.mark.parametrize('argv, passed', [
+    (['notify'], []),
+    (['notify', '--sink', 'stdout'], ['--sink', 'stdout']),
+    (['notify', '--windows', '10', '60'], ['--windows', '10', '60']),
+    (['--log-level', 'INFO', 'notify', '--help'], ['--help']),
+])
+def test_notify_passes_its_arguments_to_the_service(monkeypatch, argv, passed):
+    received = []
+    monkeypatch.setattr(notifier_service, 'main', lambda service_args: received.append(service_args) or 0)
+    assert cli.main(argv) == 0
+    assert received == [passed]
+
+def test_unknown_arguments_are_still_rejected_for_other_commands():
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['list', '--bogus'])
+    assert exit_info.value.code == 2
+
+def test_add_list_and_delete(capsys):
+    assert cli.main(['add', 'Physics', 'Optics', '2030-09-02', '09:00:00']) == 0
+    assert "Lecture added with ID 1." in capsys.readouterr().out
+    assert cli.main(['list']) == 0
+    assert "2030-09-02 09:00:00  Physics - Optics" in capsys.readouterr().out
+    assert cli.main(['delete', '1']) == 0
+    assert cli.main(['delete', '1']) == 1
+
+@pytest.mark.parametrize('lecture_id', ['abc', 'S1:bad', 'Sx:2030-09-02'])
+def test_delete_rejects_malformed_ids(capsys, lecture_id):
+    assert cli.main(['delete', lecture_id]) == 1
+    assert "Invalid lecture ID" in capsys.readouterr().err
+
+def test_add_refuses_a_double_booking_unless_forced(capsys):
+    assert cli.main(['add', 'Physics', 'Optics', '2030-09-02', '09:00:00', '--room', 'B101']) == 0
+    assert cli.main(['add', 'Chemistry', 'Acids', '2030-09-02', '10:00:00', '--room', 'B101']) == 1
+    assert "Conflict (room)" in capsys.readouterr().err
+    assert cli.main(['add', 'Chemistry', 'Acids', '2030-09-02', '10:00:00', '--room', 'B101', '--force']) == 0
+    assert cli.main(['conflicts']) == 1
+    assert "room B101" in capsys.readouterr().out
+
+def test_prune_changes_reports_what_it_removed(capsys):
+    assert cli.main(['add', 'Physics', 'Optics', '2030-09-02', '09:00:00']) == 0
+    assert cli.main(['prune-changes', '--days', '1']) == 0
+    assert "Removed 0 change feed entries" in capsys.readouterr().out
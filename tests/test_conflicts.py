@@ -0,0 +1,55 @@
+import datetime
+
+import pytest
+
+import lecture_manager
+
+DAY = datetime.date(2030, 9, 2)
+
+def _add(course, hour, minute=0, duration=90, room=None, instructor=None):
+    return lecture_manager.add_lecture(course, "topic", DAY, datetime.time(hour, minute), duration, room, instructor)
+
+def test_write_check_finds_overlapping_room_and_instructor():
+    physics = _add("Physics", 10, duration=90, room="B101", instructor="Smith")
+    _add("Chemistry", 13, room="B101")
+    conflicts = lecture_manager.check_conflicts(DAY, datetime.time(11), 60, room="B101", instructor="Smith")
+    assert sorted((lec['id'], lec['conflict']) for lec in conflicts) == [(physics, 'instructor'), (physics, 'room')]
+
+def test_back_to_back_lectures_and_the_updated_lecture_do_not_conflict():
+    physics = _add("Physics", 10, duration=90, room="B101")
+    assert lecture_manager.check_conflicts(DAY, datetime.time(11, 30), 60, room="B101") == []
+    assert lecture_manager.check_conflicts(DAY, datetime.time(10), 90, room="B101", exclude_id=physics) == []
+    assert lecture_manager.check_conflicts(DAY, datetime.time(10), 90, room="C2") == []
+
+def test_default_duration_applies_to_lectures_without_one():
+    _add("Physics", 10, duration=None, room="B101")
+    default = lecture_manager.CONFLICT_CONFIG['default_duration']
+    inside = (datetime.datetime.combine(DAY, datetime.time(10)) + datetime.timedelta(minutes=default - 1)).time()
+    assert lecture_manager.check_conflicts(DAY, inside, 30, room="B101")
+
+def test_durations_above_the_maximum_are_rejected():
+    too_long = lecture_manager.CONFLICT_CONFIG['max_duration'] + 1
+    assert lecture_manager.add_lecture("Physics", "topic", DAY, datetime.time(9), too_long) is False
+    with pytest.raises(ValueError):
+        lecture_manager.check_conflicts(DAY, datetime.time(9), too_long, room="B101")
+
+def test_sweep_reports_every_overlapping_pair():
+    lectures = [
+        {'id': 1, 'lecture_date': DAY, 'lecture_time': datetime.time(9), 'duration_minutes': 180, 'room': 'A'},
+        {'id': 2, 'lecture_date': DAY, 'lecture_time': datetime.time(10), 'duration_minutes': 30, 'room': 'A'},
+        {'id': 3, 'lecture_date': DAY, 'lecture_time': datetime.time(11), 'duration_minutes': 30, 'room': 'A'},
+        {'id': 4, 'lecture_date': DAY, 'lecture_time': datetime.time(12), 'duration_minutes': 30, 'room': 'A'},
+        {'id': 5, 'lecture_date': DAY, 'lecture_time': datetime.time(10), 'duration_minutes': 30, 'room': 'B'},
+    ]
+    pairs = [(c['first']['id'], c['second']['id']) for c in lecture_manager.find_conflicts(lectures)]
+    assert pairs == [(1, 2), (1, 3)]
+
+def test_conflict_report_scans_a_date_range():
+    _add("Physics", 10, room="B101")
+    _add("Chemistry", 11, room="B101")
+    lecture_manager.add_lecture("Biology", "topic", DAY + datetime.timedelta(days=30), datetime.time(10), 90, "B101")
+    lecture_manager.add_lecture("Maths", "topic", DAY + datetime.timedelta(days=30), datetime.time(10), 90, "B101")
+    report = lecture_manager.conflict_report(DAY, DAY + datetime.timedelta(days=7))
+    assert [(c['resource'], c['value'], c['first']['course_name'], c['second']['course_name']) for c in report] == [
+        ('room', 'B101', 'Physics', 'Chemistry')]
+    assert len(lecture_manager.conflict_report()) == 2
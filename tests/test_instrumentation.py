@@ -0,0 +1,63 @@
+import datetime
+import logging
+
+import pytest
+
+import instrumentation
+import lecture_manager
+from instrumentation import Histogram, instrumented, metrics_snapshot
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    instrumentation.reset_metrics()
+    yield
+    instrumentation.reset_metrics()
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram([1, 10, 100])
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {'1': 1, '10': 2, '100': 1, '+Inf': 1}
+    assert (snapshot['count'], snapshot['min'], snapshot['max'], snapshot['mean']) == (5, 0.5, 500, 112.1)
+    assert snapshot['p50'] == 10
+    assert snapshot['p99'] == 500 # The open bucket reports the largest value seen
+    assert Histogram([1]).percentile(0.5) is None
+
+def test_calls_are_timed_and_failures_logged(caplog, monkeypatch):
+    monkeypatch.setitem(instrumentation.INSTRUMENTATION_CONFIG, 'slow_op_ms', 0)
+
+    @instrumented('probe')
+    def probe(fail):
+        if fail:
+            raise ValueError("boom")
+        return 42
+
+    assert probe(False) == 42
+    with caplog.at_level(logging.WARNING, logger='unilecture.timing'), pytest.raises(ValueError):
+        probe(True)
+    assert metrics_snapshot()['probe.total_ms']['count'] == 2
+    assert "probe [failed] took" in caplog.text
+
+def test_generators_are_timed_only_while_they_run():
+    @instrumented('rows')
+    def rows():
+        for value in range(3):
+            instrumentation.record_rows(1)
+            yield value
+
+    assert instrumentation.current_operation() is None
+    for _ in rows():
+        assert instrumentation.current_operation() is None # Not while the caller holds an item
+    assert metrics_snapshot()['rows.rows']['sum'] == 3
+
+def test_data_layer_calls_record_query_time_and_rows():
+    for hour in (9, 10, 11):
+        lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(hour))
+    lecture_manager.clear_cache()
+    assert len(lecture_manager.get_lectures_page(limit=10)) == 3
+    metrics = metrics_snapshot()
+    assert metrics['add_lecture.total_ms']['count'] == 3
+    assert metrics['add_lecture.commit_ms']['count'] == 3
+    assert metrics['get_lectures_page.query_ms']['count'] >= 1
+    assert metrics['get_lectures_page.rows']['sum'] == 3
@@ -0,0 +1,44 @@
+import csv
+import datetime
+
+import lecture_io
+import lecture_manager
+
+ROWS = [
+    {'course_name': "Physics", 'topic': "Optics", 'lecture_date': '2030-09-02', 'lecture_time': '09:00:00',
+     'notification_sent': 'no', 'duration_minutes': '90', 'room': 'B101', 'instructor': ''},
+    {'course_name': "Chemistry", 'topic': "", 'lecture_date': '2030-09-03', 'lecture_time': '11:30:00',
+     'notification_sent': 'yes', 'duration_minutes': '', 'room': '', 'instructor': 'Smith'},
+]
+
+def _write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def test_parse_lecture_converts_types():
+    lecture = lecture_io.parse_lecture(ROWS[1])
+    assert lecture['lecture_date'] == datetime.date(2030, 9, 3)
+    assert lecture['lecture_time'] == datetime.time(11, 30)
+    assert lecture['notification_sent'] is True
+    assert lecture['duration_minutes'] is None
+    assert lecture['topic'] is None and lecture['room'] is None
+
+def test_csv_import_and_jsonl_export_round_trip(tmp_path):
+    source, backup = tmp_path / 'timetable.csv', tmp_path / 'backup.jsonl'
+    _write_csv(source, ROWS)
+    assert lecture_io.main(['import', str(source)]) == 0
+    assert lecture_io.main(['export', str(backup)]) == 0
+    with open(backup, encoding='utf-8') as handle:
+        exported = list(lecture_io.read_lectures(handle, 'jsonl'))
+    assert [(lec['course_name'], lec['duration_minutes'], lec['room'], lec['instructor']) for lec in exported] == [
+        ("Physics", 90, 'B101', None), ("Chemistry", None, None, 'Smith')]
+
+def test_a_failed_import_exits_non_zero(tmp_path, capsys):
+    source = tmp_path / 'timetable.csv'
+    _write_csv(source, ROWS + [dict(ROWS[0], lecture_date='2030-13-01')])
+    assert lecture_io.main(['import', str(source), '--batch-size', '2']) == 1
+    assert "Import from" in capsys.readouterr().err
+    # The first batch was committed before the bad row was read
+    assert len(lecture_manager.get_all_lectures()) == 2
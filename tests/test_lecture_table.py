@@ -0,0 +1,44 @@
+import datetime
+
+import pytest
+
+import lecture_manager
+from lecture_table import LectureTable, display_values, from_seconds, to_seconds
+
+ROWS = [
+    (1, "Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(9, 15), 0),
+    (2, "Physics", None, datetime.date(1969, 12, 31), datetime.time(23, 59, 59), 1),
+    (3, "Chemistry", "Optics", datetime.date(2030, 9, 3), datetime.timedelta(hours=14, minutes=30), 0),
+]
+
+def test_rows_read_back_like_dicts():
+    table = LectureTable.from_rows(ROWS)
+    assert len(table) == 3
+    assert dict(table[0]) == {'id': 1, 'course_name': "Physics", 'topic': "Optics",
+                              'lecture_date': datetime.date(2030, 9, 2), 'lecture_time': datetime.time(9, 15),
+                              'notification_sent': False}
+    assert table[-2]['lecture_date'] == datetime.date(1969, 12, 31) # Before the epoch
+    assert table[2]['lecture_time'] == datetime.time(14, 30) # MySQL TIME as timedelta
+    assert [row['id'] for row in table[1:]] == [2, 3]
+    assert table.strings.count("Physics") == 1 # Interned
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(KeyError):
+        table[0]['room']
+
+def test_display_values_match_the_dict_formatting():
+    table = LectureTable.from_rows(ROWS)
+    for row in table:
+        assert row.display_values() == display_values(dict(row))
+    assert table.index_of(3) == 2 and table.index_of(4) == -1
+
+def test_seconds_round_trip():
+    for day, time in ((datetime.date(2030, 9, 2), datetime.time(0, 0, 1)), (datetime.date(1900, 1, 1), datetime.time(12))):
+        assert from_seconds(to_seconds(day, time)) == (day, time)
+
+def test_all_lectures_are_returned_as_a_table():
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(9))
+    lectures = lecture_manager.get_all_lectures()
+    assert isinstance(lectures, LectureTable)
+    assert [(lec['id'], lec['course_name'], lec['lecture_time']) for lec in lectures] == [
+        (lecture_id, "Physics", datetime.time(9))]
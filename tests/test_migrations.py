@@ -0,0 +1,29 @@
+import pytest
+
+import migrate
+
+@pytest.mark.parametrize('version, name, path', migrate.list_migrations())
+def test_migration_splits_into_complete_statements(version, name, path):
+    with open(path, encoding='utf-8') as handle:
+        assert migrate.check_statements(handle.read()) == []
+
+def test_semicolons_in_comments_and_strings_do_not_split():
+    sql = ("CREATE TABLE t (\n"
+           "    ref VARCHAR(32), -- an ID; NULL = all\n"
+           "    note VARCHAR(8) DEFAULT 'a;b'\n"
+           ");\n"
+           "-- trailing; comment\n"
+           "INSERT INTO t (ref) VALUES ('x');\n")
+    statements = migrate.split_statements(sql)
+    assert len(statements) == 2
+    assert statements[0].startswith("CREATE TABLE t") and "'a;b'" in statements[0]
+    assert "NULL = all" not in statements[0]
+
+def test_unterminated_statement_is_reported():
+    assert migrate.check_statements("CREATE TABLE t (a INT)")
+    assert migrate.check_statements("INSERT INTO t VALUES ('a);")
+
+def test_check_reports_bad_files_by_name(tmp_path):
+    (tmp_path / '001_good.sql').write_text("CREATE TABLE t (a INT);\n", encoding='utf-8')
+    (tmp_path / '002_bad.sql').write_text("ALTER TABLE t ADD COLUMN b INT\n", encoding='utf-8')
+    assert list(migrate.check_migrations(str(tmp_path))) == ['002_bad.sql']
@@ -0,0 +1,44 @@
+import asyncio
+import datetime
+import threading
+
+import async_lecture_manager
+import lecture_manager
+import notifier_service
+from campus_time import campus_now
+
+class CollectingSink:
+    def __init__(self):
+        self.sent = []
+        self.on_send = None
+
+    async def send(self, lecture):
+        self.sent.append((lecture['id'], lecture['reminder_minutes']))
+        self.on_send()
+
+class FailingSink:
+    async def send(self, lecture):
+        raise OSError("mail server down")
+
+def test_due_reminders_reach_every_sink_from_the_db_pool(monkeypatch, caplog):
+    start = (campus_now() + datetime.timedelta(minutes=5)).replace(microsecond=0)
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", start.date(), start.time())
+    threads = []
+    claim = notifier_service.AsyncNotificationScheduler.claim
+
+    def recording_claim(self, due):
+        threads.append(threading.current_thread().name)
+        return claim(self, due)
+
+    monkeypatch.setattr(notifier_service.AsyncNotificationScheduler, 'claim', recording_claim)
+    sink = CollectingSink()
+    sched = notifier_service.AsyncNotificationScheduler(notifier_service.ReminderDispatcher([sink, FailingSink()]),
+                                                        windows=(10,))
+    sink.on_send = sched.stop
+    try:
+        asyncio.run(asyncio.wait_for(sched.run_async(), timeout=5))
+    finally:
+        async_lecture_manager.shutdown()
+    assert sink.sent == [(lecture_id, 10)]
+    assert threads and all(name.startswith('lecture-db') for name in threads)
+    assert "via FailingSink" in caplog.text
@@ -0,0 +1,71 @@
+import types
+
+import pytest
+
+import db_connector
+from db_connector import ConnectionPool, Error
+
+class FakeConnection:
+    in_transaction = False
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def ping(self, reconnect=False):
+        pass
+
+    def is_connected(self):
+        return not self.closed
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the pool's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(db_connector, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_pool_is_bounded_and_times_out():
+    pool = ConnectionPool(max_size=2, checkout_timeout=0, connect=FakeConnection)
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(Error):
+        pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.metrics()['checkout_failures'] == 1
+    pool.release(second)
+
+def test_idle_connections_are_evicted_after_a_burst(clock):
+    pool = ConnectionPool(max_size=5, max_idle=300, evict_interval=60, connect=FakeConnection)
+    burst = [pool.acquire() for _ in range(5)]
+    for pooled in burst:
+        pool.release(pooled)
+    # Steady traffic only ever reuses the top of the LIFO queue
+    for _ in range(6):
+        clock[0] += 60
+        pool.release(pool.acquire())
+    assert pool.metrics()['open_connections'] == 1
+    assert sum(pooled.connection.closed for pooled in burst) == 4
+
+def test_connections_past_their_lifetime_are_replaced(clock):
+    pool = ConnectionPool(max_size=1, max_lifetime=3600, connect=FakeConnection)
+    first = pool.acquire()
+    pool.release(first)
+    clock[0] += 3601
+    second = pool.acquire()
+    assert second is not first and first.connection.closed
+
+def test_connections_in_a_transaction_are_rolled_back_on_release():
+    rolled_back = []
+
+    class Open(FakeConnection):
+        in_transaction = True
+
+        def rollback(self):
+            rolled_back.append(self)
+
+    pool = ConnectionPool(max_size=1, connect=Open)
+    pool.release(pool.acquire())
+    assert len(rolled_back) == 1
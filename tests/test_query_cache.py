@@ -0,0 +1,72 @@
+import datetime
+import types
+
+import pytest
+
+import lecture_manager
+import query_cache
+import storage
+from query_cache import QueryCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(query_cache, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = QueryCache(ttl=30)
+    loads = []
+    load = lambda: loads.append(1) or len(loads)
+    assert cache.get_or_load('key', load) == 1
+    clock[0] += 29
+    assert cache.get_or_load('key', load) == 1
+    clock[0] += 2
+    assert cache.get_or_load('key', load) == 2
+    assert cache.get_or_load('short', load, ttl=0) == 3
+    assert cache.get_or_load('short', load, ttl=0) == 4
+
+def test_least_recently_used_entries_are_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.get_or_load('a', lambda: 'a')
+    cache.get_or_load('b', lambda: 'b')
+    cache.get_or_load('a', lambda: 'stale') # 'a' is now the most recently used
+    cache.get_or_load('c', lambda: 'c')
+    assert cache.get_or_load('a', lambda: 'reloaded') == 'a'
+    assert cache.get_or_load('b', lambda: 'reloaded') == 'reloaded'
+    assert cache.stats()['evictions'] == 2
+
+def test_a_value_loaded_across_an_invalidation_is_not_cached():
+    cache = QueryCache()
+
+    def load_while_a_write_commits():
+        cache.invalidate()
+        return 'old'
+
+    assert cache.get_or_load('key', load_while_a_write_commits) == 'old'
+    assert cache.get_or_load('key', lambda: 'new') == 'new'
+    assert cache.get_or_load('key', lambda: 'newer') == 'new'
+
+def test_a_changed_or_unreadable_shared_version_clears_the_cache(clock):
+    versions = iter([1, 1, 2, None])
+    cache = QueryCache(version_source=lambda: next(versions), version_check_interval=2)
+    cache.get_or_load('key', lambda: 'first')
+    for expected in ('first', 'first', 'second', 'third'):
+        clock[0] += 2
+        assert cache.get_or_load('key', lambda: expected) == expected
+
+def test_shared_invalidation_can_be_switched_on_at_runtime(monkeypatch):
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(9))
+    monkeypatch.setattr(lecture_manager._lecture_cache, 'version_check_interval', 0)
+    monkeypatch.setattr(lecture_manager._lecture_cache, '_next_version_check', 0.0)
+    monkeypatch.setitem(lecture_manager.CACHE_CONFIG, 'shared_invalidation', True)
+    assert lecture_manager.get_lecture(lecture_id)['topic'] == "Optics" # Now cached
+
+    # Another process updates the row and bumps cache_version, without a change feed entry
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE lectures SET topic = 'Waves' WHERE id = %s", (lecture_id,))
+        cursor.execute("UPDATE cache_version SET version = version + 1 WHERE id = 1")
+        conn.commit()
+    assert lecture_manager.get_lecture(lecture_id)['topic'] == "Waves"
@@ -0,0 +1,47 @@
+import datetime
+
+import lecture_manager
+from campus_time import campus_now
+
+WINDOWS = (60, 10)
+
+def _in_minutes(minutes):
+    start = (campus_now() + datetime.timedelta(minutes=minutes)).replace(microsecond=0)
+    return start.date(), start.time()
+
+def _pending_windows(lecture_id):
+    horizon = campus_now() + datetime.timedelta(hours=3)
+    return [window for _, window, lec in lecture_manager.get_pending_reminders(horizon, windows=WINDOWS)
+            if lec['id'] == lecture_id]
+
+def _claim_due():
+    horizon = campus_now() + datetime.timedelta(hours=3)
+    due = [(window, lec) for fire_at, window, lec in lecture_manager.get_pending_reminders(horizon, windows=WINDOWS)
+           if fire_at <= campus_now()]
+    return lecture_manager.claim_reminders(due, windows=WINDOWS)
+
+def test_reminders_fire_once_per_window():
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(30))
+    assert _pending_windows(lecture_id) == [60, 10]
+    # The 60-minute reminder was missed, so it fires now
+    assert [(lec['id'], lec['reminder_minutes']) for lec in _claim_due()] == [(lecture_id, 60)]
+    assert _claim_due() == []
+    assert _pending_windows(lecture_id) == [10]
+
+def test_a_rescheduled_lecture_is_reminded_again():
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(5))
+    assert [lec['reminder_minutes'] for lec in _claim_due()] == [10]
+    assert lecture_manager.get_lecture(lecture_id)['notification_sent']
+
+    assert lecture_manager.update_lecture(lecture_id, "Physics", "Optics", *_in_minutes(30))
+    assert not lecture_manager.get_lecture(lecture_id)['notification_sent']
+    assert _pending_windows(lecture_id) == [60, 10]
+    assert [lec['reminder_minutes'] for lec in _claim_due()] == [60]
+
+def test_editing_other_fields_keeps_sent_reminders():
+    date, time = _in_minutes(5)
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", date, time)
+    _claim_due()
+    assert lecture_manager.update_lecture(lecture_id, "Physics", "Waves", date, time, room="B101")
+    assert lecture_manager.get_lecture(lecture_id)['notification_sent']
+    assert _pending_windows(lecture_id) == []
@@ -0,0 +1,46 @@
+import datetime
+
+import lecture_manager
+import scheduler
+import storage
+from campus_time import campus_now
+
+def _in_minutes(minutes):
+    start = (campus_now() + datetime.timedelta(minutes=minutes)).replace(microsecond=0)
+    return start.date(), start.time()
+
+def fail(*args, **kwargs):
+    raise storage.Error("database unavailable")
+
+def test_scheduler_retries_a_failed_claim(monkeypatch):
+    lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(5))
+    sched = scheduler.NotificationScheduler(on_due=lambda lec: None, windows=(10,), retry_seconds=5)
+    sched.reload()
+    due = sched.pop_due(campus_now())
+    assert len(due) == 1
+
+    monkeypatch.setattr(scheduler, 'claim_reminders', fail)
+    assert sched.claim(due) == []
+    assert len(sched._heap) == 1 # Back on the heap for the retry
+    monkeypatch.undo()
+    retry = sched.pop_due(campus_now() + datetime.timedelta(seconds=6))
+    assert [lec['reminder_minutes'] for lec in sched.claim(retry)] == [10]
+
+def test_scheduler_keeps_its_heap_when_a_reload_fails(monkeypatch):
+    lecture_manager.add_lecture("Physics", "Optics", *_in_minutes(30))
+    sched = scheduler.NotificationScheduler(on_due=lambda lec: None, windows=(10,), reconcile_seconds=900)
+    sched.reload()
+
+    monkeypatch.setattr(scheduler, 'get_pending_reminders', fail)
+    sched.reload()
+    assert len(sched._heap) == 1
+    assert sched.seconds_until_next(campus_now()) <= 5
+
+def test_retry_delay_backs_off_up_to_the_maximum(monkeypatch):
+    sched = scheduler.NotificationScheduler(on_due=lambda lec: None, retry_seconds=5, max_retry_seconds=60)
+    monkeypatch.setattr(scheduler, 'get_pending_reminders', fail)
+    delays = []
+    for _ in range(6):
+        sched.reload()
+        delays.append(round(sched.seconds_until_next(campus_now())))
+    assert delays == [5, 10, 20, 40, 60, 60]
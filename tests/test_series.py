@@ -0,0 +1,33 @@
+import datetime
+
+import pytest
+
+import lecture_manager
+from campus_time import campus_now
+
+MONDAY = datetime.date(2030, 9, 2)
+
+def test_series_expand_on_their_weekday():
+    series_id = lecture_manager.add_series("Physics", "Optics", 0, datetime.time(9), MONDAY,
+                                           MONDAY + datetime.timedelta(weeks=4), interval_weeks=2)
+    occurrences = list(lecture_manager.iter_occurrences())
+    assert [occ['lecture_date'] for occ in occurrences] == [MONDAY + datetime.timedelta(weeks=weeks)
+                                                            for weeks in (0, 2, 4)]
+    assert all(occ['series_id'] == series_id for occ in occurrences)
+
+@pytest.mark.parametrize('weekday, end_date, interval_weeks', [
+    (7, MONDAY, 1),
+    (-1, MONDAY, 1),
+    (0, MONDAY, 0),
+    (0, MONDAY - datetime.timedelta(days=1), 1),
+])
+def test_invalid_series_are_rejected(weekday, end_date, interval_weeks):
+    assert lecture_manager.add_series("Physics", "Optics", weekday, datetime.time(9), MONDAY, end_date,
+                                      interval_weeks) is False
+    assert lecture_manager.get_all_series() == []
+
+def test_claim_lectures_accepts_a_generator():
+    start = (campus_now() + datetime.timedelta(minutes=5)).replace(microsecond=0)
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", start.date(), start.time())
+    claimed = lecture_manager.claim_lectures(lid for lid in [lecture_id])
+    assert [lec['id'] for lec in claimed] == [lecture_id]
@@ -0,0 +1,42 @@
+import datetime
+import sqlite3
+
+import lecture_manager
+import storage
+
+def test_mysql_constructs_are_translated_for_sqlite():
+    sql = "INSERT IGNORE INTO t (a) VALUES (%s)"
+    assert storage.translate_sql(sql) == "INSERT OR IGNORE INTO t (a) VALUES (?)"
+    assert "SKIP LOCKED" not in storage.translate_sql("SELECT id FROM t FOR UPDATE SKIP LOCKED")
+
+def test_in_memory_backend_round_trips_dates_and_times():
+    lecture_id = lecture_manager.add_lecture("Physics", "Optics", datetime.date(2030, 9, 2), datetime.time(9, 30))
+    lecture = lecture_manager.get_lecture(lecture_id)
+    assert lecture['lecture_date'] == datetime.date(2030, 9, 2)
+    assert lecture['lecture_time'] == datetime.time(9, 30)
+    assert lecture['notification_sent'] is False
+
+def test_driver_errors_are_raised_as_storage_errors():
+    try:
+        with storage.get_connection() as conn:
+            conn.cursor().execute("SELECT * FROM no_such_table")
+    except storage.Error:
+        pass
+    else:
+        raise AssertionError("expected storage.Error")
+
+def test_database_files_from_older_versions_are_upgraded(tmp_path):
+    path = str(tmp_path / 'old.db')
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE lectures (id INTEGER PRIMARY KEY AUTOINCREMENT, course_name TEXT NOT NULL, topic TEXT, "
+                "lecture_date DATE NOT NULL, lecture_time TIME NOT NULL, notification_sent BOOLEAN DEFAULT FALSE)")
+    old.execute("INSERT INTO lectures (course_name, topic, lecture_date, lecture_time) "
+                "VALUES ('Physics', 'Optics', '2030-09-02', '09:00:00')")
+    old.commit()
+    old.close()
+
+    storage.configure('sqlite', path)
+    lecture = lecture_manager.get_lecture(1)
+    assert lecture['course_name'] == "Physics"
+    assert lecture['room'] is None
+    assert lecture_manager.get_lectures_page() # starts_at was backfilled, so paging and scheduling work
@@ -0,0 +1,24 @@
+import datetime
+
+import timetable_generator
+
+NOW = datetime.datetime(2030, 9, 2, 10, 0)
+
+def test_rows_depend_only_on_seed_start_date_and_now():
+    first = list(timetable_generator.generate_timetable(2000, NOW.date(), seed=7, now=NOW))
+    assert first == list(timetable_generator.generate_timetable(2000, NOW.date(), seed=7, now=NOW))
+    assert first != list(timetable_generator.generate_timetable(2000, NOW.date(), seed=8, now=NOW))
+
+def test_due_lectures_follow_now():
+    rows = list(timetable_generator.generate_timetable(500, NOW.date(), due_share=0.5, now=NOW))
+    due = [datetime.datetime.combine(row['lecture_date'], row['lecture_time']) for row in rows
+           if row['lecture_time'].minute % 15 or row['lecture_time'].second]
+    assert due and all(NOW < start <= NOW + datetime.timedelta(minutes=15) for start in due)
+
+def test_command_line_output_is_reproducible(capsys):
+    argv = ['50', '--start-date', '2030-09-02', '--now', '2030-09-02 10:00:00']
+    assert timetable_generator.main(argv) == 0
+    first = capsys.readouterr().out
+    assert timetable_generator.main(argv) == 0
+    assert capsys.readouterr().out == first
+    assert first.splitlines()[0] == "course_name,topic,lecture_date,lecture_time,notification_sent"
@@ -0,0 +1,74 @@
+"""
+Synthetic timetable generator for benchmarks and local testing.
+
+    python timetable_generator.py 10000 > timetable.csv
+    python timetable_generator.py 10000 --start-date 2025-09-01 --now "2025-09-01 10:00:00" > timetable.csv
+
+Produces lectures spread over a semester, with a small share scheduled just after 'now'
+so notification queries have work to do. The rows depend only on the seed, start date and
+'now', which default to today and the current campus time; pin both to reproduce a file.
+"""
+import argparse
+import csv
+import datetime
+import random
+import sys
+
+from campus_time import campus_now
+
+SUBJECTS = ['Calculus', 'Linear Algebra', 'Physics', 'Chemistry', 'Data Structures', 'Algorithms',
+            'Operating Systems', 'Databases', 'Networks', 'Statistics', 'Economics', 'Philosophy',
+            'Biology', 'Software Engineering', 'Machine Learning', 'Compilers', 'Graphics', 'Security']
+TOPICS = ['Introduction', 'Review', 'Lab Session', 'Problem Class', 'Case Study', 'Guest Lecture',
+          'Midterm Preparation', 'Project Kickoff', 'Seminar', 'Tutorial']
+
+def course_names(count=200):
+    """Returns 'count' distinct course names such as 'Calculus 101'."""
+    return [f"{SUBJECTS[i % len(SUBJECTS)]} {101 + i // len(SUBJECTS)}" for i in range(count)]
+
+def generate_timetable(count, start_date=None, courses=200, lectures_per_day=200, due_share=0.001, seed=42,
+                       now=None):
+    """
+    Yields 'count' lecture dicts. Lectures fill 08:00-18:45 in 15-minute slots on consecutive
+    days from start_date (default: today), about lectures_per_day per day. A 'due_share' of the
+    rows are placed in the 15 minutes after 'now' (a campus datetime, default campus_now())
+    so get_upcoming_lectures finds something.
+    """
+    rng = random.Random(seed)
+    names = course_names(courses)
+    start_date = start_date or datetime.date.today()
+    now = now or campus_now()
+    for index in range(count):
+        if rng.random() < due_share:
+            start = now + datetime.timedelta(seconds=rng.randint(60, 14 * 60))
+            lecture_date, lecture_time = start.date(), start.time().replace(microsecond=0)
+        else:
+            lecture_date = start_date + datetime.timedelta(days=index // lectures_per_day)
+            slot = rng.randrange(44) # 08:00 .. 18:45
+            lecture_time = datetime.time(8 + slot // 4, (slot % 4) * 15)
+        yield {
+            'course_name': rng.choice(names),
+            'topic': rng.choice(TOPICS),
+            'lecture_date': lecture_date,
+            'lecture_time': lecture_time,
+            'notification_sent': False,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic timetable as CSV to stdout.")
+    parser.add_argument('count', type=int, nargs='?', default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-date', type=datetime.date.fromisoformat, help="First lecture day (default today)")
+    parser.add_argument('--now', type=datetime.datetime.fromisoformat,
+                        help="Campus time the due lectures follow (default the current time)")
+    args = parser.parse_args(argv)
+    writer = csv.DictWriter(sys.stdout, fieldnames=['course_name', 'topic', 'lecture_date', 'lecture_time',
+                                                    'notification_sent'])
+    writer.writeheader()
+    for row in generate_timetable(args.count, args.start_date, seed=args.seed, now=args.now):
+        writer.writerow({**row, 'lecture_date': row['lecture_date'].isoformat(),
+                         'lecture_time': row['lecture_time'].isoformat(), 'notification_sent': 'false'})
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
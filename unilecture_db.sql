@@ -9,6 +9,8 @@ CREATE TABLE lectures (
     lecture_time TIME NOT NULL,
     notification_sent BOOLEAN DEFAULT FALSE
 );
+-- Indexes and later schema changes live in migrations/ and are applied with:
+--  python migrate.py
 USE unilecture_db;
 
 -- Clear existing data (optional, but good for fresh start)
@@ -16,6 +18,8 @@ USE unilecture_db;
 -- ALTER TABLE lectures AUTO_INCREMENT = 1;
 
 -- Insert sample lecture data
+-- (The same rows are in sample_lectures.csv and can be loaded with:
+--  python lecture_io.py import sample_lectures.csv)
 INSERT INTO lectures (course_name, topic, lecture_date, lecture_time, notification_sent) VALUES
 ('Introduction to Programming', 'Variables and Data Types', '2025-07-24', '10:00:00', FALSE),
 ('Calculus I', 'Limits and Continuity', '2025-07-24', '14:30:00', FALSE),